@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Candidate, CandidateNote
+from .models import Candidate, CandidateNote, CVBatch
 
 @admin.register(Candidate)
 class CandidateAdmin(admin.ModelAdmin):
@@ -7,7 +7,7 @@ class CandidateAdmin(admin.ModelAdmin):
                    'parsing_status', 'created_at')
     list_filter = ('parsing_status', 'created_at')
     search_fields = ('full_name', 'email', 'phone', 'technical_skills', 'location')
-    readonly_fields = ('_id', 'created_at', 'updated_at', 'parsing_status', 'parsing_error')
+    readonly_fields = ('_id', 'created_at', 'updated_at', 'parsing_status', 'parsing_error', 'cv_sha256')
     
     fieldsets = (
         ('Personal Information', {
@@ -24,7 +24,7 @@ class CandidateAdmin(admin.ModelAdmin):
             'fields': ('work_experience', 'education', 'projects')
         }),
         ('CV Information', {
-            'fields': ('cv_file', 'cv_parsed_data', 'parsing_status', 'parsing_error')
+            'fields': ('cv_file', 'cv_sha256', 'batch', 'cv_parsed_data', 'parsing_status', 'parsing_error')
         }),
         ('Metadata', {
             'fields': ('_id', 'uploaded_by', 'created_at', 'updated_at')
@@ -41,3 +41,9 @@ class CandidateNoteAdmin(admin.ModelAdmin):
     def author_name(self, obj):
         return obj.author.username if obj.author else 'N/A'
     author_name.short_description = 'Author'
+
+@admin.register(CVBatch)
+class CVBatchAdmin(admin.ModelAdmin):
+    list_display = ('_id', 'source', 'status', 'total_files', 'uploaded_by', 'created_at')
+    list_filter = ('status', 'source', 'created_at')
+    readonly_fields = ('_id', 'created_at', 'updated_at', 'skipped_files')
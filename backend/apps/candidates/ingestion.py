@@ -0,0 +1,182 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from .models import Candidate, CVBatch
+
+ALLOWED_CV_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+
+def cv_extension(file_name):
+    return os.path.splitext(file_name)[1].lower()
+
+
+def store_cv_file(content, file_name):
+    """
+    Hash a CV while streaming it to a temporary file, then store it under its
+    content hash; a CV that is already in storage is not written again
+
+    Args:
+        content: File object (uploaded file or zip entry)
+        file_name: Original file name (for the extension)
+
+    Returns:
+        tuple: (stored name, sha256 hex digest)
+    """
+    digest = hashlib.sha256()
+    chunks = content.chunks() if hasattr(content, 'chunks') else iter(lambda: content.read(64 * 1024), b'')
+
+    with tempfile.TemporaryFile() as buffer:
+        for chunk in chunks:
+            digest.update(chunk)
+            buffer.write(chunk)
+
+        content_hash = digest.hexdigest()
+        stored_name = f'cvs/{content_hash}{cv_extension(file_name)}'
+        if not default_storage.exists(stored_name):
+            buffer.seek(0)
+            stored_name = default_storage.save(stored_name, File(buffer, name=os.path.basename(file_name)))
+
+    return stored_name, content_hash
+
+
+def find_existing_candidate(content_hash):
+    """
+    A candidate already created from the same CV (and not failed), or None
+    """
+    if not settings.CV_DEDUPLICATE_CANDIDATES:
+        return None
+    return Candidate.objects.filter(
+        cv_sha256=content_hash,
+        parsing_status__in=['pending', 'processing', 'completed']
+    ).order_by('created_at').first()
+
+
+def iter_uploaded_files(files):
+    """
+    (file_name, size, file) for each uploaded file
+    """
+    for cv_file in files:
+        yield cv_file.name, cv_file.size, cv_file
+
+
+def iter_archive_entries(archive):
+    """
+    (file_name, size, file) for each file in a zip archive
+    Entries are decompressed as they are read, so the archive is never held in memory
+    """
+    with zipfile.ZipFile(archive) as zip_file:
+        for info in zip_file.infolist():
+            base_name = os.path.basename(info.filename)
+            if info.is_dir() or not base_name or base_name.startswith('.') or info.filename.startswith('__MACOSX/'):
+                continue
+            with zip_file.open(info) as entry:
+                yield info.filename, info.file_size, entry
+
+
+def ingest_cvs(entries, user, source):
+    """
+    Store CV files and create their candidates in one bulk insert
+
+    Args:
+        entries: Iterable of (file_name, size, file object)
+        user: Uploading user
+        source: 'files' or 'archive'
+
+    Returns:
+        CVBatch: The new batch; candidates start with parsing_status 'pending'.
+        Files that duplicate an existing candidate are listed in skipped_files
+    """
+    batch = CVBatch.objects.create(source=source, uploaded_by=user)
+    candidates = []
+    skipped = []
+    seen_hashes = {}
+
+    for file_name, size, content in entries:
+        base_name = os.path.basename(file_name)
+        if cv_extension(base_name) not in ALLOWED_CV_EXTENSIONS:
+            skipped.append({'file_name': file_name, 'reason': 'unsupported file type'})
+            continue
+        if size > settings.MAX_UPLOAD_SIZE:
+            skipped.append({'file_name': file_name, 'reason': 'file too large'})
+            continue
+        if len(candidates) >= settings.CV_BULK_MAX_FILES:
+            skipped.append({'file_name': file_name, 'reason': 'batch file limit reached'})
+            continue
+
+        stored_name, content_hash = store_cv_file(content, base_name)
+
+        # Repeat uploads link to the existing candidate instead of a new one
+        if settings.CV_DEDUPLICATE_CANDIDATES and content_hash in seen_hashes:
+            skipped.append({'file_name': file_name, 'reason': 'duplicate', 'candidate_id': seen_hashes[content_hash]})
+            continue
+        existing = find_existing_candidate(content_hash)
+        if existing is not None:
+            seen_hashes[content_hash] = str(existing._id)
+            skipped.append({'file_name': file_name, 'reason': 'duplicate', 'candidate_id': str(existing._id)})
+            continue
+
+        candidate = Candidate(
+            full_name='Pending',
+            email='pending@parse.com',
+            cv_file=stored_name,
+            cv_file_name=base_name,
+            cv_sha256=content_hash,
+            uploaded_by=user,
+            batch=batch,
+            parsing_status='pending'
+        )
+        seen_hashes[content_hash] = str(candidate._id)
+        candidates.append(candidate)
+
+    Candidate.objects.bulk_create(candidates, batch_size=settings.CV_BULK_INSERT_SIZE)
+
+    batch.total_files = len(candidates)
+    batch.skipped_files = skipped
+    if candidates:
+        batch.status = 'processing'
+    else:
+        # Nothing new to parse: done if every file was a duplicate, failed otherwise
+        duplicates = any(entry['reason'] == 'duplicate' for entry in skipped)
+        batch.status = 'completed' if duplicates else 'failed'
+    batch.save()
+    return batch
+
+
+def batch_progress(batch):
+    """
+    Per-file parsing progress for a batch
+
+    Returns:
+        dict: Batch status, counts by parsing_status and one entry per file
+    """
+    files = [
+        {
+            'candidate_id': str(row['_id']),
+            'file_name': row['cv_file_name'],
+            'parsing_status': row['parsing_status'],
+            'parsing_error': row['parsing_error']
+        }
+        for row in Candidate.objects.filter(batch=batch).values(
+            '_id', 'cv_file_name', 'parsing_status', 'parsing_error'
+        )
+    ]
+
+    counts = {'pending': 0, 'processing': 0, 'completed': 0, 'failed': 0}
+    for entry in files:
+        counts[entry['parsing_status']] = counts.get(entry['parsing_status'], 0) + 1
+
+    return {
+        'batch_id': str(batch._id),
+        'status': batch.status,
+        'source': batch.source,
+        'total_files': batch.total_files,
+        'counts': counts,
+        'skipped_files': batch.skipped_files,
+        'files': files,
+        'created_at': batch.created_at,
+        'updated_at': batch.updated_at
+    }
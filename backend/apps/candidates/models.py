@@ -2,6 +2,42 @@ from djongo import models
 from django.contrib.auth.models import User
 import uuid
 
+class CVBatch(models.Model):
+    """
+    A bulk CV upload; per-file progress is tracked on the batch's candidates
+    """
+    _id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    source = models.CharField(
+        max_length=20,
+        choices=[
+            ('files', 'Files'),
+            ('archive', 'Zip Archive')
+        ],
+        default='files'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('processing', 'Processing'),
+            ('completed', 'Completed'),
+            ('failed', 'Failed')
+        ],
+        default='processing'
+    )
+    total_files = models.IntegerField(default=0)
+    skipped_files = models.JSONField(default=list)  # [{file_name, reason}] entries that were not ingested
+    uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='cv_batches')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'cv_batches'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"CV batch {self._id} ({self.total_files} files)"
+
+
 class Candidate(models.Model):
     """
     Candidate model - stores candidate profiles parsed from CVs
@@ -42,7 +78,9 @@ class Candidate(models.Model):
     # CV File
     cv_file = models.FileField(upload_to='cvs/', null=True, blank=True)
     cv_file_name = models.CharField(max_length=255, blank=True, null=True)
+    cv_sha256 = models.CharField(max_length=64, blank=True, null=True, db_index=True)  # Content hash, for deduplication
     cv_parsed_data = models.JSONField(default=dict, blank=True, null=True)  # Raw parsed data
+    batch = models.ForeignKey(CVBatch, on_delete=models.SET_NULL, null=True, blank=True, related_name='candidates')
     
     # Metadata
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='candidates')
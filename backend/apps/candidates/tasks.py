@@ -0,0 +1,83 @@
+from celery import shared_task
+from apps.integrations.services.cv_parser_pool import get_cv_parser_pool
+from .models import Candidate, CVBatch
+
+
+def apply_parsed_cv(candidate, parsed_data):
+    """
+    Copy parsed CV fields onto a candidate and mark parsing completed (not saved)
+    """
+    candidate.full_name = parsed_data.get('full_name', 'Unknown')
+    candidate.email = parsed_data.get('email', f'candidate_{candidate._id}@temp.com')
+    candidate.phone = parsed_data.get('phone')
+    candidate.location = parsed_data.get('location')
+    candidate.linkedin_url = parsed_data.get('linkedin_url')
+    candidate.summary = parsed_data.get('summary')
+    candidate.current_title = parsed_data.get('current_title')
+    candidate.total_experience_years = parsed_data.get('total_experience_years', 0)
+    candidate.technical_skills = parsed_data.get('technical_skills', [])
+    candidate.soft_skills = parsed_data.get('soft_skills', [])
+    candidate.languages = parsed_data.get('languages', [])
+    candidate.certifications = parsed_data.get('certifications', [])
+    candidate.work_experience = parsed_data.get('work_experience', [])
+    candidate.education = parsed_data.get('education', [])
+    candidate.projects = parsed_data.get('projects', [])
+    candidate.cv_parsed_data = parsed_data
+    candidate.parsing_status = 'completed'
+    candidate.parsing_error = None
+    return candidate
+
+
+@shared_task(ignore_result=True)
+def parse_candidate_cv(candidate_id):
+    """
+    Parse a candidate's stored CV and fill in their profile
+    Runs on the cv_parsing queue (see CELERY_TASK_ROUTES)
+    """
+    candidate = Candidate.objects.filter(_id=candidate_id).first()
+    if candidate is None or not candidate.cv_file:
+        return
+
+    try:
+        apply_parsed_cv(candidate, get_cv_parser_pool().parse(candidate.cv_file.path, candidate.cv_sha256))
+    except Exception as e:
+        candidate.parsing_status = 'failed'
+        candidate.parsing_error = str(e)
+
+    candidate.save()
+
+
+@shared_task(ignore_result=True)
+def parse_cv_batch(batch_id):
+    """
+    Parse every unfinished CV in a bulk upload across the CV parser process pool
+    Each candidate is saved as soon as its CV finishes, so batch progress is live.
+    Candidates left 'processing' by a worker that died are picked up again when
+    the task is redelivered
+    """
+    unfinished = Candidate.objects.filter(batch_id=batch_id, parsing_status__in=['pending', 'processing'])
+    candidates = {str(candidate._id): candidate for candidate in unfinished}
+    unfinished.update(parsing_status='processing')
+
+    try:
+        results = get_cv_parser_pool().parse_many(
+            (candidate_id, candidate.cv_file.path, candidate.cv_sha256)
+            for candidate_id, candidate in candidates.items()
+        )
+        for candidate_id, parsed_data, error in results:
+            candidate = candidates.pop(candidate_id)
+            if error is None:
+                apply_parsed_cv(candidate, parsed_data)
+            else:
+                candidate.parsing_status = 'failed'
+                candidate.parsing_error = str(error)
+            candidate.save()
+    except Exception as e:
+        # Nothing would pick the rest up again; fail them with the error
+        Candidate.objects.filter(_id__in=list(candidates)).update(
+            parsing_status='failed',
+            parsing_error=str(e)
+        )
+
+    if not Candidate.objects.filter(batch_id=batch_id, parsing_status__in=['pending', 'processing']).exists():
+        CVBatch.objects.filter(_id=batch_id).update(status='completed')
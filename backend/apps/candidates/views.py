@@ -3,10 +3,16 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
+import zipfile
+from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
-from .models import Candidate, CandidateNote
+from .models import Candidate, CandidateNote, CVBatch
 from .serializers import CandidateSerializer, CandidateCreateSerializer, CandidateNoteSerializer
-from apps.integrations.services.cv_parser_service import CVParserService
+from .ingestion import (
+    ingest_cvs, iter_archive_entries, iter_uploaded_files, batch_progress,
+    store_cv_file, find_existing_candidate
+)
+from .tasks import parse_candidate_cv, parse_cv_batch
 
 class CandidateViewSet(viewsets.ModelViewSet):
     """
@@ -28,9 +34,11 @@ class CandidateViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def upload_cv(self, request):
         """
-        Upload and parse a CV file
+        Upload a CV file and queue it for parsing
         POST /api/candidates/upload_cv/
         Body: multipart/form-data with 'cv_file' field
+        Returns 202; poll parsing_status for the result. A CV identical to an
+        existing candidate's returns 200 with that candidate instead
         """
         if 'cv_file' not in request.FILES:
             return Response(
@@ -51,63 +59,162 @@ class CandidateViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            # Create candidate record
+            # Hash while storing; identical CVs share one stored file
+            stored_name, content_hash = store_cv_file(cv_file, cv_file.name)
+            
+            # A repeat upload links to the existing candidate instead of a new one
+            existing = find_existing_candidate(content_hash)
+            if existing is not None:
+                return Response(
+                    {
+                        'candidate_id': str(existing._id),
+                        'parsing_status': existing.parsing_status,
+                        'duplicate': True
+                    },
+                    status=status.HTTP_200_OK
+                )
+            
+            # Create candidate record; the CV is parsed by a worker
             candidate = Candidate.objects.create(
                 full_name='Pending',
                 email='pending@parse.com',
-                cv_file=cv_file,
+                cv_file=stored_name,
                 cv_file_name=cv_file.name,
+                cv_sha256=content_hash,
                 uploaded_by=request.user,
                 parsing_status='processing'
             )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        try:
+            parse_candidate_cv.delay(str(candidate._id))
+        except Exception as e:
+            candidate.parsing_status = 'failed'
+            candidate.parsing_error = f'Could not queue CV parsing: {str(e)}'
+            candidate.save(update_fields=['parsing_status', 'parsing_error', 'updated_at'])
             
-            # Parse CV asynchronously (in production, use Celery)
-            try:
-                cv_parser = CVParserService()
-                parsed_data = cv_parser.parse_cv(cv_file)
-                
-                # Update candidate with parsed data
-                candidate.full_name = parsed_data.get('full_name', 'Unknown')
-                candidate.email = parsed_data.get('email', f'candidate_{candidate._id}@temp.com')
-                candidate.phone = parsed_data.get('phone')
-                candidate.location = parsed_data.get('location')
-                candidate.linkedin_url = parsed_data.get('linkedin_url')
-                candidate.summary = parsed_data.get('summary')
-                candidate.current_title = parsed_data.get('current_title')
-                candidate.total_experience_years = parsed_data.get('total_experience_years', 0)
-                candidate.technical_skills = parsed_data.get('technical_skills', [])
-                candidate.soft_skills = parsed_data.get('soft_skills', [])
-                candidate.languages = parsed_data.get('languages', [])
-                candidate.certifications = parsed_data.get('certifications', [])
-                candidate.work_experience = parsed_data.get('work_experience', [])
-                candidate.education = parsed_data.get('education', [])
-                candidate.projects = parsed_data.get('projects', [])
-                candidate.cv_parsed_data = parsed_data
-                candidate.parsing_status = 'completed'
-                candidate.save()
-                
-                serializer = CandidateSerializer(candidate)
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-                
-            except Exception as parse_error:
-                candidate.parsing_status = 'failed'
-                candidate.parsing_error = str(parse_error)
-                candidate.save()
-                
-                return Response(
-                    {
-                        'error': 'CV parsing failed',
-                        'details': str(parse_error),
-                        'candidate_id': str(candidate._id)
-                    },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+            return Response(
+                {
+                    'error': 'CV parsing could not be started',
+                    'details': str(e),
+                    'candidate_id': str(candidate._id)
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
+        return Response(
+            {
+                'candidate_id': str(candidate._id),
+                'parsing_status': candidate.parsing_status,
+                'duplicate': False
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(detail=False, methods=['post'])
+    def bulk_upload_cv(self, request):
+        """
+        Upload many CVs at once and parse them in parallel
+        POST /api/candidates/bulk_upload_cv/
+        Body: multipart/form-data with repeated 'cv_files' fields, or one 'archive' zip
+        Returns 202 with a batch id; poll batches/{batch_id}/ for per-file progress
+        """
+        archive = request.FILES.get('archive')
+        cv_files = request.FILES.getlist('cv_files')
+        
+        if archive is None and not cv_files:
+            return Response(
+                {'error': 'Either cv_files or a zip archive is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
+        try:
+            if archive is not None:
+                batch = ingest_cvs(iter_archive_entries(archive), request.user, 'archive')
+            else:
+                batch = ingest_cvs(iter_uploaded_files(cv_files), request.user, 'files')
+        except zipfile.BadZipFile:
+            return Response(
+                {'error': 'Archive is not a valid zip file'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        
+        if batch.total_files == 0 and batch.status == 'completed':
+            # Every file matched an existing candidate; nothing to parse
+            return Response(batch_progress(batch), status=status.HTTP_200_OK)
+        
+        if batch.total_files == 0:
+            return Response(
+                {
+                    'error': 'No supported CV files found',
+                    'batch_id': str(batch._id),
+                    'skipped_files': batch.skipped_files
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            parse_cv_batch.delay(str(batch._id))
+        except Exception as e:
+            Candidate.objects.filter(batch=batch).update(
+                parsing_status='failed',
+                parsing_error=f'Could not queue CV parsing: {str(e)}'
+            )
+            batch.status = 'failed'
+            batch.save(update_fields=['status', 'updated_at'])
+            
+            return Response(
+                {
+                    'error': 'CV parsing could not be started',
+                    'details': str(e),
+                    'batch_id': str(batch._id)
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
+        return Response(batch_progress(batch), status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['get'], url_path=r'batches/(?P<batch_id>[^/.]+)')
+    def batch_status(self, request, batch_id=None):
+        """
+        Per-file progress of a bulk CV upload
+        GET /api/candidates/batches/{batch_id}/
+        """
+        try:
+            batch = CVBatch.objects.filter(_id=batch_id).first()
+        except ValidationError:
+            batch = None
+        if batch is None:
+            return Response(
+                {'error': 'Batch not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(batch_progress(batch))
+    
+    @action(detail=True, methods=['get'])
+    def parsing_status(self, request, pk=None):
+        """
+        Poll CV parsing progress
+        GET /api/candidates/{id}/parsing_status/
+        """
+        candidate = self.get_object()
+        data = {
+            'candidate_id': str(candidate._id),
+            'parsing_status': candidate.parsing_status,
+            'parsing_error': candidate.parsing_error
+        }
+        if candidate.parsing_status == 'completed':
+            data['candidate'] = CandidateSerializer(candidate).data
+        return Response(data)
     
     @action(detail=True, methods=['get'])
     def notes(self, request, pk=None):
@@ -0,0 +1,90 @@
+import hashlib
+import re
+from django.core.cache import caches
+
+# Seniority and role-word variants that should share a cache entry
+TITLE_SYNONYMS = {
+    'sr': 'senior',
+    'snr': 'senior',
+    'jr': 'junior',
+    'jnr': 'junior',
+    'mid-level': 'mid',
+    'midlevel': 'mid',
+    'intermediate': 'mid',
+    'entry-level': 'entry',
+    'principle': 'principal',
+    'dev': 'developer',
+    'engr': 'engineer',
+    'eng': 'engineer',
+    'mgr': 'manager',
+    'swe': 'software engineer',
+    'sde': 'software engineer',
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#/-]+")
+
+
+def normalize_text(value):
+    """
+    Lowercase and collapse punctuation/whitespace
+    """
+    return ' '.join(_TOKEN_PATTERN.findall((value or '').lower()))
+
+
+def normalize_job_title(title):
+    """
+    Normalize a job title for cache keys
+    e.g. "Sr. Java  Dev" and "senior java developer" normalize identically
+    """
+    words = [TITLE_SYNONYMS.get(word, word) for word in normalize_text(title).split()]
+    return ' '.join(words)
+
+
+def make_key(namespace, *parts):
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'{namespace}:{digest}'
+
+
+class TwoTierCache:
+    """
+    In-process LRU ('local' cache) in front of the shared Redis tier ('shared' cache)
+    A shared-tier outage degrades to local-only caching instead of failing requests
+    """
+
+    def __init__(self, namespace, timeout, local_timeout=None):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.local_timeout = local_timeout or timeout
+        self.local = caches['local']
+        self.shared = caches['shared']
+
+    def key(self, *parts):
+        return make_key(self.namespace, *parts)
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        try:
+            value = self.shared.get(key)
+        except Exception:
+            return None
+
+        if value is not None:
+            self.local.set(key, value, self.local_timeout)
+        return value
+
+    def set(self, key, value):
+        self.local.set(key, value, self.local_timeout)
+        try:
+            self.shared.set(key, value, self.timeout)
+        except Exception:
+            pass
+
+    def delete(self, key):
+        self.local.delete(key)
+        try:
+            self.shared.delete(key)
+        except Exception:
+            pass
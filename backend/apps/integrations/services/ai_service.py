@@ -1,6 +1,147 @@
+import asyncio
+import logging
+import weakref
+import zlib
 import openai
 from django.conf import settings
+from django.core.cache import caches
 import json
+from .ai_cache import TwoTierCache, make_key, normalize_job_title, normalize_text
+from .answer_cache import get_answer_cache
+from .llm_backends import get_llm_backend
+from .resilience import get_resilience
+from .prompts import (
+    BANK_QUESTIONS_PROMPT,
+    BATCH_EVALUATION_ITEM,
+    BATCH_EVALUATION_PROMPT,
+    EVALUATION_PROMPT,
+    FOLLOW_UP_PROMPT,
+    INTERVIEW_QUESTIONS_PROMPT,
+    PERSONALIZED_QUESTIONS_PROMPT,
+    count_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the JD prompt changes so cached generations are not reused
+JD_PROMPT_VERSION = 'v1'
+
+# Placeholder responses until the API key is configured
+PLACEHOLDER_EVALUATION = {
+    "score": 7.5,
+    "feedback": "Good answer with relevant experience mentioned.",
+    "strengths": ["Clear communication", "Relevant examples"],
+    "improvements": ["Could provide more technical depth"],
+    "covered_points": ["Experience", "Technologies used"]
+}
+PLACEHOLDER_FOLLOW_UP = "That's interesting. Can you elaborate more on the technical challenges you faced?"
+FALLBACK_FOLLOW_UP = "Can you tell me more about that?"
+
+# Used while the LLM provider is failing and no cached follow-up fits
+CANNED_FOLLOW_UPS = [
+    FALLBACK_FOLLOW_UP,
+    "What was the hardest part of that, and how did you handle it?",
+    "What would you do differently if you did it again?",
+    "How did you measure whether it worked?",
+    "What trade-offs did you consider along the way?",
+]
+
+
+def resolve_difficulty(candidate_profile, difficulty='auto'):
+    """
+    Resolve 'auto' difficulty from the candidate's experience
+    """
+    if difficulty != 'auto':
+        return difficulty
+    
+    years_exp = candidate_profile.total_experience_years
+    if years_exp < 2:
+        return 'easy'
+    elif years_exp < 5:
+        return 'medium'
+    return 'hard'
+
+
+def remember_follow_up(question, follow_up):
+    """
+    Keep a generated follow-up for reuse while the provider is degraded
+    """
+    caches['local'].set(make_key('follow_up', normalize_text(question)), follow_up, settings.AI_FOLLOW_UP_CACHE_TIMEOUT)
+
+
+def fallback_follow_up(question, answer):
+    """
+    A follow-up that needs no LLM call: one previously generated for the same
+    question if there is one, otherwise a canned question chosen by the answer
+    """
+    cached = caches['local'].get(make_key('follow_up', normalize_text(question)))
+    if cached:
+        return cached
+    return CANNED_FOLLOW_UPS[zlib.crc32(normalize_text(answer).encode()) % len(CANNED_FOLLOW_UPS)]
+
+
+def build_evaluation_prompt(question, answer):
+    return EVALUATION_PROMPT.render(
+        question=question.question_text,
+        question_type=question.question_type,
+        expected_points=question.expected_answer_points,
+        answer=answer
+    )
+
+
+def build_batch_evaluation_prompt(pairs):
+    """
+    Build one prompt that evaluates several (question, answer) pairs
+    Each evaluation is returned under the index of its pair
+    """
+    answers = '\n\n'.join(
+        BATCH_EVALUATION_ITEM.render(
+            index=index,
+            question=question.question_text,
+            question_type=question.question_type,
+            expected_points=question.expected_answer_points,
+            answer=answer
+        )
+        for index, (question, answer) in enumerate(pairs)
+    )
+    return BATCH_EVALUATION_PROMPT.render(answers=answers)
+
+
+def pack_evaluation_batches(pairs, token_budget, max_pairs):
+    """
+    Greedily pack (question, answer) pairs into batches under a prompt token budget
+    A pair too large for the budget on its own gets a batch of its own
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    
+    for pair in pairs:
+        tokens = count_tokens(build_batch_evaluation_prompt([pair]))
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_pairs):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(pair)
+        current_tokens += tokens
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_follow_up_prompt(question, answer, transcript=None):
+    """
+    Build the follow-up prompt; the transcript is trimmed oldest-first to its budget
+    so the prompt stays the same size however long the interview runs
+    """
+    return FOLLOW_UP_PROMPT.render(
+        budgets={'transcript': settings.AI_TRANSCRIPT_TOKEN_BUDGET},
+        transcript=transcript,
+        question=question,
+        answer=answer
+    )
+
 
 class AIService:
     """
@@ -13,17 +154,37 @@ class AIService:
         openai.api_key = settings.OPENAI_API_KEY
         self.model = settings.OPENAI_MODEL
     
-    def generate_job_description(self, job_title, company=''):
+    def generate_job_description(self, job_title, company='', use_cache=True):
         """
         Generate a complete job description from a job title
+        Results are cached on the normalized title and company
         
         Args:
             job_title: The job title (e.g., "Senior Java Developer")
             company: Optional company name
+            use_cache: Set False to force a fresh generation
             
         Returns:
             dict: Complete JD data structure
         """
+        cache = TwoTierCache('jd', settings.JD_CACHE_TIMEOUT, settings.JD_LOCAL_CACHE_TIMEOUT)
+        key = cache.key(JD_PROMPT_VERSION, normalize_job_title(job_title), normalize_text(company))
+        
+        jd_data = cache.get(key) if use_cache else None
+        if jd_data is None:
+            jd_data = self._generate_job_description(job_title, company)
+            cache.set(key, jd_data)
+        
+        # Equivalent titles share an entry; keep the caller's own wording
+        jd_data['title'] = job_title
+        if company:
+            jd_data['company'] = company
+        return jd_data
+    
+    def _generate_job_description(self, job_title, company=''):
+        """
+        Generate a job description with the LLM (uncached)
+        """
         prompt = f"""
         Generate a comprehensive job description for the position: {job_title}
         {f"at {company}" if company else ""}
@@ -100,54 +261,23 @@ class AIService:
         Returns:
             list: List of question dictionaries
         """
-        if difficulty == 'auto':
-            # Calculate difficulty based on candidate experience
-            years_exp = candidate_profile.total_experience_years
-            if years_exp < 2:
-                difficulty = 'easy'
-            elif years_exp < 5:
-                difficulty = 'medium'
-            else:
-                difficulty = 'hard'
+        difficulty = resolve_difficulty(candidate_profile, difficulty)
         
-        prompt = f"""
-        Generate 12 interview questions for the following:
-        
-        Job: {job_description.title}
-        Required Skills: {', '.join(job_description.required_skills)}
-        
-        Candidate:
-        - Experience: {candidate_profile.total_experience_years} years
-        - Skills: {', '.join(candidate_profile.technical_skills[:10])}
-        - Current Role: {candidate_profile.current_title or 'N/A'}
-        
-        Difficulty: {difficulty}
-        
-        Create exactly 12 questions:
-        - 5 technical questions
-        - 4 behavioral questions
-        - 3 scenario-based questions
-        
-        Return as JSON array with structure:
-        [
-            {{
-                "question_text": "Question here?",
-                "question_type": "technical|behavioral|scenario",
-                "difficulty": "easy|medium|hard",
-                "skills_tested": ["skill1", "skill2"],
-                "expected_answer_points": ["point1", "point2"],
-                "max_score": 10.0
-            }},
-            ...
-        ]
-        """
+        prompt = INTERVIEW_QUESTIONS_PROMPT.render(
+            job_title=job_description.title,
+            required_skills=job_description.required_skills,
+            experience_years=candidate_profile.total_experience_years,
+            candidate_skills=candidate_profile.technical_skills,
+            current_title=candidate_profile.current_title,
+            difficulty=difficulty
+        )
         
         try:
             # TODO: Uncomment when API key is configured
             # response = openai.ChatCompletion.create(
             #     model=self.model,
             #     messages=[
-            #         {"role": "system", "content": "You are an expert interviewer who creates targeted, insightful interview questions."},
+            #         {"role": "system", "content": INTERVIEW_QUESTIONS_PROMPT.system},
             #         {"role": "user", "content": prompt}
             #     ],
             #     temperature=0.8
@@ -187,6 +317,146 @@ class AIService:
         except Exception as e:
             raise Exception(f"Failed to generate questions: {str(e)}")
     
+    def generate_bank_questions(self, job_description, difficulty, count=10):
+        """
+        Generate the reusable, candidate-independent questions for a job
+        These are stored once per (job, difficulty) in the question bank
+        
+        Args:
+            job_description: JobDescription model instance
+            difficulty: 'easy', 'medium' or 'hard'
+            count: Number of questions to generate
+        
+        Returns:
+            list: List of question dictionaries
+        """
+        prompt = BANK_QUESTIONS_PROMPT.render(
+            count=count,
+            job_title=job_description.title,
+            experience_level=job_description.experience_level,
+            required_skills=job_description.required_skills,
+            difficulty=difficulty
+        )
+        
+        try:
+            # TODO: Uncomment when API key is configured
+            # response = openai.ChatCompletion.create(
+            #     model=self.model,
+            #     messages=[
+            #         {"role": "system", "content": BANK_QUESTIONS_PROMPT.system},
+            #         {"role": "user", "content": prompt}
+            #     ],
+            #     temperature=0.8
+            # )
+            # 
+            # return json.loads(response.choices[0].message.content)
+        
+            # Placeholder questions until API is configured
+            skills = job_description.required_skills or ['the required technologies']
+            questions = [
+                {
+                    "question_text": f"Can you describe your experience with {skill}?",
+                    "question_type": "technical",
+                    "difficulty": difficulty,
+                    "skills_tested": [skill],
+                    "expected_answer_points": ["Hands-on experience", "Specific projects", "Best practices"],
+                    "max_score": 10.0
+                }
+                for skill in skills[:4]
+            ]
+            questions += [
+                {
+                    "question_text": "Tell me about a challenging project you worked on recently.",
+                    "question_type": "behavioral",
+                    "difficulty": difficulty,
+                    "skills_tested": ["problem_solving", "communication"],
+                    "expected_answer_points": ["Project context", "Challenges faced", "Solutions implemented", "Outcomes"],
+                    "max_score": 10.0
+                },
+                {
+                    "question_text": "Describe a time you disagreed with a teammate and how you resolved it.",
+                    "question_type": "behavioral",
+                    "difficulty": difficulty,
+                    "skills_tested": ["collaboration", "communication"],
+                    "expected_answer_points": ["Situation", "Perspective taken", "Resolution", "What was learned"],
+                    "max_score": 10.0
+                },
+                {
+                    "question_text": "How would you approach designing a scalable system for our use case?",
+                    "question_type": "scenario",
+                    "difficulty": difficulty,
+                    "skills_tested": ["system_design", "scalability"],
+                    "expected_answer_points": ["Architecture considerations", "Technology choices", "Trade-offs"],
+                    "max_score": 10.0
+                },
+            ]
+            return questions[:count]
+        
+        except Exception as e:
+            raise Exception(f"Failed to generate bank questions: {str(e)}")
+    
+    def generate_personalized_questions(self, job_description, candidate_profile, difficulty, count=2):
+        """
+        Generate the candidate-specific questions that complement the bank
+        
+        Args:
+            job_description: JobDescription model instance
+            candidate_profile: Candidate model instance
+            difficulty: 'easy', 'medium' or 'hard'
+            count: Number of questions to generate
+        
+        Returns:
+            list: List of question dictionaries
+        """
+        prompt = PERSONALIZED_QUESTIONS_PROMPT.render(
+            count=count,
+            job_title=job_description.title,
+            required_skills=job_description.required_skills,
+            experience_years=candidate_profile.total_experience_years,
+            candidate_skills=candidate_profile.technical_skills,
+            current_title=candidate_profile.current_title,
+            difficulty=difficulty
+        )
+        
+        try:
+            # TODO: Uncomment when API key is configured
+            # response = openai.ChatCompletion.create(
+            #     model=self.model,
+            #     messages=[
+            #         {"role": "system", "content": PERSONALIZED_QUESTIONS_PROMPT.system},
+            #         {"role": "user", "content": prompt}
+            #     ],
+            #     temperature=0.8
+            # )
+            # 
+            # return json.loads(response.choices[0].message.content)
+        
+            # Placeholder questions until API is configured
+            skills = candidate_profile.technical_skills or ['your main technology']
+            role = candidate_profile.current_title or 'your current role'
+            questions = [
+                {
+                    "question_text": f"Your CV mentions {skills[0]}. How have you used it in production?",
+                    "question_type": "technical",
+                    "difficulty": difficulty,
+                    "skills_tested": skills[:1],
+                    "expected_answer_points": ["Concrete usage", "Problems solved", "Lessons learned"],
+                    "max_score": 10.0
+                },
+                {
+                    "question_text": f"What from your time as {role} would you bring to this position?",
+                    "question_type": "scenario",
+                    "difficulty": difficulty,
+                    "skills_tested": ["experience_relevance"],
+                    "expected_answer_points": ["Relevant experience", "Transferable skills", "Fit with the role"],
+                    "max_score": 10.0
+                },
+            ]
+            return questions[:count]
+        
+        except Exception as e:
+            raise Exception(f"Failed to generate personalized questions: {str(e)}")
+    
     def evaluate_answer(self, question, answer, context=None):
         """
         Evaluate a candidate's answer using AI
@@ -199,31 +469,14 @@ class AIService:
         Returns:
             dict: {score, feedback, strengths, improvements}
         """
-        prompt = f"""
-        Evaluate this interview answer:
-        
-        Question: {question.question_text}
-        Type: {question.question_type}
-        Expected points: {question.expected_answer_points}
-        
-        Candidate's Answer: {answer}
-        
-        Provide evaluation as JSON:
-        {{
-            "score": 7.5,  // 0-10
-            "feedback": "Detailed feedback on the answer",
-            "strengths": ["strength1", "strength2"],
-            "improvements": ["area1", "area2"],
-            "covered_points": ["point1", "point2"]
-        }}
-        """
+        prompt = build_evaluation_prompt(question, answer)
         
         try:
             # TODO: Uncomment when API key is configured
             # response = openai.ChatCompletion.create(
             #     model=self.model,
             #     messages=[
-            #         {"role": "system", "content": "You are an expert interviewer who provides fair, constructive evaluations."},
+            #         {"role": "system", "content": EVALUATION_PROMPT.system},
             #         {"role": "user", "content": prompt}
             #     ],
             #     temperature=0.5
@@ -233,42 +486,31 @@ class AIService:
             # return evaluation
             
             # Placeholder evaluation
-            return {
-                "score": 7.5,
-                "feedback": "Good answer with relevant experience mentioned.",
-                "strengths": ["Clear communication", "Relevant examples"],
-                "improvements": ["Could provide more technical depth"],
-                "covered_points": ["Experience", "Technologies used"]
-            }
+            return dict(PLACEHOLDER_EVALUATION)
         
         except Exception as e:
             raise Exception(f"Failed to evaluate answer: {str(e)}")
     
-    def generate_follow_up_question(self, question, answer):
+    def generate_follow_up_question(self, question, answer, transcript=None):
         """
         Generate an intelligent follow-up question based on the answer
         
         Args:
             question: Original question text
             answer: Candidate's answer
+            transcript: Optional earlier (speaker, text) turns, oldest first
             
         Returns:
             str: Follow-up question
         """
-        prompt = f"""
-        Original Question: {question}
-        Candidate's Answer: {answer}
-        
-        Generate a natural, probing follow-up question to dig deeper into their response.
-        Return only the question text, nothing else.
-        """
+        prompt = build_follow_up_prompt(question, answer, transcript)
         
         try:
             # TODO: Uncomment when API key is configured
             # response = openai.ChatCompletion.create(
             #     model=self.model,
             #     messages=[
-            #         {"role": "system", "content": "You are an expert interviewer asking insightful follow-up questions."},
+            #         {"role": "system", "content": FOLLOW_UP_PROMPT.system},
             #         {"role": "user", "content": prompt}
             #     ],
             #     temperature=0.7,
@@ -278,7 +520,231 @@ class AIService:
             # return response.choices[0].message.content.strip()
             
             # Placeholder
-            return "That's interesting. Can you elaborate more on the technical challenges you faced?"
+            return PLACEHOLDER_FOLLOW_UP
+        
+        except Exception as e:
+            return FALLBACK_FOLLOW_UP
+
+
+# One request limiter per event loop, shared by every AsyncAIService on it.
+# A semaphore binds to the loop that first waits on it, so code run through
+# async_to_sync or asyncio.run (Celery, DRF views, tests) gets its own
+_request_slots = weakref.WeakKeyDictionary()
+
+
+def get_request_slots():
+    """
+    Return the running event loop's semaphore capping in-flight LLM requests
+    """
+    loop = asyncio.get_running_loop()
+    slots = _request_slots.get(loop)
+    if slots is None:
+        slots = _request_slots[loop] = asyncio.Semaphore(settings.AI_MAX_CONCURRENT_REQUESTS)
+    return slots
+
+
+class AsyncAIService:
+    """
+    Async variant of AIService for use on the event loop (websocket consumers)
+    Completions go through the configured LLM backend (see llm_backends), and
+    in-flight requests are capped by AI_MAX_CONCURRENT_REQUESTS so a burst of
+    turns queues instead of piling up. Every call runs under its operation's
+    deadline, hedging policy and the shared circuit breaker (see resilience)
+    """
+    
+    def __init__(self, backend=None):
+        self.backend = backend or get_llm_backend()
+        self.resilience = get_resilience()
+    
+    async def _complete(self, operation, system_prompt, prompt, temperature, max_tokens=None,
+                        json_response=False, placeholder=''):
+        async def attempt():
+            async with get_request_slots():
+                return await self.backend.complete(
+                    system_prompt, prompt, temperature, max_tokens, json_response, placeholder
+                )
+        
+        return await self.resilience.call(operation, attempt)
+    
+    async def _stream(self, operation, system_prompt, prompt, temperature, max_tokens=None, placeholder=''):
+        async def attempt():
+            async with get_request_slots():
+                async for delta in self.backend.stream(system_prompt, prompt, temperature, max_tokens, placeholder):
+                    yield delta
+        
+        async for delta in self.resilience.stream(operation, attempt):
+            yield delta
+    
+    async def evaluate_answer(self, question, answer, context=None):
+        """
+        Evaluate a candidate's answer using AI
+        
+        Args:
+            question: Question object
+            answer: Candidate's answer text
+            context: Optional interview context
+            
+        Returns:
+            dict: {score, feedback, strengths, improvements, covered_points},
+                plus reused_evaluation when a near-duplicate answer's result was reused
+        """
+        evaluation = (await self.evaluate_answers([(question, answer)]))[0]
+        if evaluation is None:
+            raise Exception("Failed to evaluate answer")
+        return evaluation
+    
+    async def _evaluate_one(self, question, answer):
+        prompt = build_evaluation_prompt(question, answer)
         
+        try:
+            content = await self._complete(
+                'evaluation', EVALUATION_PROMPT.system, prompt, temperature=0.5, json_response=True,
+                placeholder=json.dumps(PLACEHOLDER_EVALUATION)
+            )
+            return json.loads(content)
         except Exception as e:
-            return "Can you tell me more about that?"
+            raise Exception(f"Failed to evaluate answer: {str(e)}")
+    
+    async def evaluate_answers(self, pairs):
+        """
+        Evaluate many answers concurrently, several per request where they fit
+        Answers nearly identical to one already evaluated for the same question
+        reuse that result (see answer_cache) instead of calling the LLM
+        
+        Args:
+            pairs: List of (Question, answer text) tuples
+            
+        Returns:
+            list: One evaluation dict per pair, in input order; None for a pair
+                whose evaluation failed, so one bad answer does not lose the rest
+        """
+        evaluations = [None] * len(pairs)
+        signatures = [None] * len(pairs)
+        
+        answer_cache = get_answer_cache()
+        if answer_cache is not None:
+            signatures = [answer_cache.signature(answer) for _, answer in pairs]
+            evaluations = await asyncio.gather(*(
+                answer_cache.lookup(str(question._id), signature)
+                for (question, _), signature in zip(pairs, signatures)
+            ))
+        
+        pending = [index for index, evaluation in enumerate(evaluations) if evaluation is None]
+        batches = pack_evaluation_batches(
+            [pairs[index] for index in pending],
+            settings.AI_EVALUATION_BATCH_TOKENS,
+            settings.AI_EVALUATION_BATCH_MAX_PAIRS
+        )
+        # Batches run concurrently; the shared request slots provide the rate limit
+        results = await asyncio.gather(
+            *(self._evaluate_batch(batch) for batch in batches),
+            return_exceptions=True
+        )
+        fresh = []
+        for batch, batch_result in zip(batches, results):
+            if isinstance(batch_result, Exception):
+                logger.warning('Answer evaluation failed for %d answers', len(batch), exc_info=batch_result)
+                batch_result = [None] * len(batch)
+            fresh.extend(batch_result)
+        
+        for index, evaluation in zip(pending, fresh):
+            evaluations[index] = evaluation
+            if evaluation is not None and answer_cache is not None:
+                await answer_cache.store(str(pairs[index][0]._id), signatures[index], evaluation)
+        return list(evaluations)
+    
+    async def _evaluate_batch(self, batch):
+        if len(batch) == 1:
+            return [await self._evaluate_one(*batch[0])]
+        
+        prompt = build_batch_evaluation_prompt(batch)
+        try:
+            content = await self._complete(
+                'batch_evaluation', BATCH_EVALUATION_PROMPT.system, prompt, temperature=0.5, json_response=True,
+                placeholder=json.dumps({
+                    "evaluations": [dict(PLACEHOLDER_EVALUATION, index=index) for index in range(len(batch))]
+                })
+            )
+            evaluations = {
+                evaluation.get('index'): evaluation
+                for evaluation in json.loads(content).get('evaluations', [])
+            }
+        except Exception:
+            evaluations = {}
+        
+        # Anything the batched reply dropped is re-asked individually
+        missing = [index for index in range(len(batch)) if index not in evaluations]
+        retried = await asyncio.gather(
+            *(self._evaluate_one(*batch[index]) for index in missing),
+            return_exceptions=True
+        )
+        for index, evaluation in zip(missing, retried):
+            if isinstance(evaluation, Exception):
+                logger.warning('Answer evaluation failed', exc_info=evaluation)
+                evaluation = None
+            evaluations[index] = evaluation
+        
+        results = []
+        for index in range(len(batch)):
+            if evaluations[index] is None:
+                results.append(None)
+                continue
+            evaluation = dict(evaluations[index])
+            evaluation.pop('index', None)
+            results.append(evaluation)
+        return results
+    
+    async def generate_follow_up_question(self, question, answer, transcript=None):
+        """
+        Generate an intelligent follow-up question based on the answer
+        
+        Args:
+            question: Original question text
+            answer: Candidate's answer
+            transcript: Optional earlier (speaker, text) turns, oldest first
+            
+        Returns:
+            str: Follow-up question
+        """
+        prompt = build_follow_up_prompt(question, answer, transcript)
+        
+        try:
+            content = await self._complete(
+                'follow_up', FOLLOW_UP_PROMPT.system, prompt, temperature=0.7, max_tokens=100,
+                placeholder=PLACEHOLDER_FOLLOW_UP
+            )
+        except Exception as e:
+            return fallback_follow_up(question, answer)
+        
+        follow_up = content.strip()
+        remember_follow_up(question, follow_up)
+        return follow_up
+    
+    async def stream_follow_up_question(self, question, answer, transcript=None):
+        """
+        Stream a follow-up question as it is generated
+        
+        Args:
+            question: Original question text
+            answer: Candidate's answer
+            transcript: Optional earlier (speaker, text) turns, oldest first
+            
+        Yields:
+            str: Chunks of the follow-up question, in order
+        """
+        prompt = build_follow_up_prompt(question, answer, transcript)
+        
+        chunks = []
+        try:
+            async for delta in self._stream(
+                'follow_up_stream', FOLLOW_UP_PROMPT.system, prompt, temperature=0.7, max_tokens=100,
+                placeholder=PLACEHOLDER_FOLLOW_UP
+            ):
+                chunks.append(delta)
+                yield delta
+        except Exception as e:
+            if not chunks:
+                yield fallback_follow_up(question, answer)
+            return
+        
+        remember_follow_up(question, ''.join(chunks).strip())
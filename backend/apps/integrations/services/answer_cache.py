@@ -0,0 +1,163 @@
+import uuid
+import zlib
+from functools import lru_cache
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+from .ai_cache import make_key, normalize_text
+
+# Bump when the evaluation prompt or output changes so old results are not reused
+ANSWER_CACHE_VERSION = 'v1'
+
+MERSENNE_PRIME = (1 << 31) - 1
+SHINGLE_SIZE = 3
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    Word n-grams of the normalized text
+    """
+    words = normalize_text(text).split()
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures from num_perm universal hash functions (a * x + b) mod p
+    """
+
+    def __init__(self, num_perm, seed=1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        items = shingles(text)
+        if not items:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(item.encode()) & MERSENNE_PRIME for item in items),
+            dtype=np.uint64,
+            count=len(items)
+        )
+        # Both factors are below 2**31, so the products fit in uint64
+        return ((np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME).min(axis=0)
+
+
+def estimated_similarity(first, second):
+    """
+    Estimated Jaccard similarity of the shingle sets behind two signatures
+    """
+    return float(np.mean(np.asarray(first) == np.asarray(second)))
+
+
+class NearDuplicateAnswerCache:
+    """
+    Reuses evaluate_answer results for near-identical answers to the same question
+    Signatures are split into LSH bands; each band is a cache bucket listing the
+    entries that share it, so a lookup only compares against likely matches.
+    Everything lives in a Django cache (the shared Redis tier by default), and
+    cache failures fall through to a normal evaluation
+    """
+
+    def __init__(self, alias, num_perm, bands, threshold, timeout, bucket_size):
+        self.cache = caches[alias]
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.timeout = timeout
+        self.bucket_size = bucket_size
+
+    def _band_keys(self, question_id, signature):
+        return [
+            make_key(
+                'answer_lsh', ANSWER_CACHE_VERSION, settings.OPENAI_MODEL, question_id, band,
+                ','.join(str(value) for value in signature[band * self.rows:(band + 1) * self.rows])
+            )
+            for band in range(self.bands)
+        ]
+
+    def _entry_key(self, entry_id):
+        return f'answer_eval:{entry_id}'
+
+    def signature(self, answer):
+        return self.hasher.signature(answer)
+
+    async def lookup(self, question_id, signature):
+        """
+        Return a prior evaluation for a near-duplicate answer, or None
+        The returned copy carries a reused_evaluation audit record
+        """
+        if signature is None:
+            return None
+
+        try:
+            buckets = await self.cache.aget_many(self._band_keys(question_id, signature))
+            candidates = {entry_id for bucket in buckets.values() for entry_id in bucket}
+            if not candidates:
+                return None
+            entries = await self.cache.aget_many([self._entry_key(entry_id) for entry_id in candidates])
+        except Exception:
+            return None
+
+        best_key, best_similarity = None, 0.0
+        for key, entry in entries.items():
+            similarity = estimated_similarity(signature, entry['signature'])
+            if similarity > best_similarity:
+                best_key, best_similarity = key, similarity
+
+        if best_key is None or best_similarity < self.threshold:
+            return None
+
+        evaluation = dict(entries[best_key]['evaluation'])
+        evaluation['reused_evaluation'] = {
+            'entry': best_key.split(':', 1)[1],
+            'similarity': round(best_similarity, 3)
+        }
+        return evaluation
+
+    async def store(self, question_id, signature, evaluation):
+        """
+        Index an LLM evaluation under the answer's signature
+        """
+        if signature is None or evaluation.get('reused_evaluation'):
+            return
+
+        entry_id = uuid.uuid4().hex
+        band_keys = self._band_keys(question_id, signature)
+        try:
+            await self.cache.aset(
+                self._entry_key(entry_id),
+                {'signature': [int(value) for value in signature], 'evaluation': evaluation},
+                self.timeout
+            )
+            buckets = await self.cache.aget_many(band_keys)
+            await self.cache.aset_many(
+                {
+                    key: ([entry_id] + buckets.get(key, []))[:self.bucket_size]
+                    for key in band_keys
+                },
+                self.timeout
+            )
+        except Exception:
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_answer_cache():
+    """
+    Return the process-wide near-duplicate answer cache, or None if it is disabled
+    """
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+    return NearDuplicateAnswerCache(
+        alias=settings.ANSWER_CACHE_ALIAS,
+        num_perm=settings.ANSWER_CACHE_NUM_PERM,
+        bands=settings.ANSWER_CACHE_BANDS,
+        threshold=settings.ANSWER_CACHE_THRESHOLD,
+        timeout=settings.ANSWER_CACHE_TIMEOUT,
+        bucket_size=settings.ANSWER_CACHE_BUCKET_SIZE
+    )
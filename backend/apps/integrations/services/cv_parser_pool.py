@@ -0,0 +1,109 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# Worker-process state: one CVParserService per worker, built once
+_parser = None
+
+
+def _init_worker():
+    global _parser
+    from .cv_parser_service import CVParserService
+
+    _parser = CVParserService()
+
+
+def _parse_file(path, content_hash=None):
+    # The parser picks the format from the file name, which open() sets to the path
+    with open(path, 'rb') as cv_file:
+        return _parser.parse_cv(cv_file, content_hash)
+
+
+class CVParserPool:
+    """
+    Process pool of CVParserService workers
+    PDF/DOCX text extraction and parsing are CPU-bound, so bulk uploads are
+    spread across processes instead of being parsed one after another
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._context = multiprocessing.get_context('spawn')
+        self._executor = self._create_executor()
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.size,
+            mp_context=self._context,
+            initializer=_init_worker
+        )
+
+    def parse(self, path, content_hash=None):
+        """
+        Parse one CV file on a worker and wait for the result
+
+        Args:
+            path: Local path of the stored CV
+            content_hash: SHA-256 of the file, if known (skips rehashing)
+
+        Returns:
+            dict: Parsed CV data
+        """
+        try:
+            return self._executor.submit(_parse_file, path, content_hash).result()
+        except BrokenProcessPool:
+            self._executor = self._create_executor()
+            raise
+
+    def parse_many(self, items):
+        """
+        Parse many CV files in parallel, yielding results as they finish
+
+        Args:
+            items: Iterable of (key, path, content_hash) tuples; content_hash may be None
+
+        Yields:
+            tuple: (key, parsed_data, error); exactly one of the last two is None
+        """
+        futures = {
+            self._executor.submit(_parse_file, path, content_hash): key
+            for key, path, content_hash in items
+        }
+        broken = False
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except BrokenProcessPool as e:
+                # A worker died (e.g. a native crash in a PDF library); the
+                # remaining files in this call fail and the pool is rebuilt
+                broken = True
+                yield futures[future], None, e
+            except Exception as e:
+                yield futures[future], None, e
+        if broken:
+            self._executor = self._create_executor()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_cv_parser_pool():
+    """
+    Return this process's shared CV parser pool, creating it on first use
+    """
+    global _pool
+    # The cv_parsing Celery worker runs tasks on threads, so guard creation
+    with _pool_lock:
+        if _pool is None:
+            from django.conf import settings
+
+            _pool = CVParserPool(settings.CV_PARSER_WORKERS or os.cpu_count() or 1)
+            atexit.register(_pool.shutdown)
+    return _pool
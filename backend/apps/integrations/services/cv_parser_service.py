@@ -1,7 +1,30 @@
+import hashlib
 import PyPDF2
 import docx
-import re
+from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
+from .ai_cache import TwoTierCache
+from .cv_scanner import ScannedCV, experience_months
+from .skill_matcher import get_skill_matcher
+
+# Bump when parsing output changes (including the skill taxonomy) so results
+# cached under the old version are not reused
+CV_PARSER_VERSION = '6'
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def cv_content_hash(cv_file):
+    """
+    SHA-256 of a file's content, read in chunks; the file is rewound afterwards
+    """
+    digest = hashlib.sha256()
+    cv_file.seek(0)
+    for chunk in iter(lambda: cv_file.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    cv_file.seek(0)
+    return digest.hexdigest()
+
 
 class CVParserService:
     """
@@ -9,16 +32,35 @@ class CVParserService:
     Extracts structured data from resumes
     """
     
-    def parse_cv(self, cv_file):
+    def parse_cv(self, cv_file, content_hash=None):
         """
         Parse a CV file and extract structured information
+        Results are cached by content hash and parser version, so a CV that
+        was parsed before is returned without parsing it again. Only the
+        date-independent parse is cached; total_experience_years is worked
+        out on every call, since roles ending "Present" keep growing
         
         Args:
             cv_file: UploadedFile object
+            content_hash: SHA-256 of the file if already known (computed otherwise)
             
         Returns:
             dict: Parsed CV data
         """
+        cache = TwoTierCache('cv_parse', settings.CV_PARSE_CACHE_TIMEOUT, settings.CV_PARSE_LOCAL_CACHE_TIMEOUT)
+        cache_key = cache.key(CV_PARSER_VERSION, content_hash or cv_content_hash(cv_file))
+        
+        parsed_data = cache.get(cache_key)
+        if parsed_data is None:
+            parsed_data = self._parse_file(cv_file)
+            cache.set(cache_key, parsed_data)
+        
+        parsed_data = dict(parsed_data)
+        parsed_data['total_experience_years'] = self._calculate_experience_years(parsed_data.pop('_experience'))
+        return parsed_data
+    
+    def _parse_file(self, cv_file):
+        """Extract text by file type and parse it (uncached, without total_experience_years)"""
         file_ext = cv_file.name.lower()[cv_file.name.rfind('.'):]
         
         # Extract text based on file type
@@ -62,172 +104,126 @@ class CVParserService:
         """
         Parse extracted text to structured data
         
+        The text is scanned once into sections (see ScannedCV); every
+        extractor reads from that scan rather than the raw text.
         This is a basic implementation. In production, you would use:
         - NLP models for better extraction
         - Named Entity Recognition (NER)
         - AI services like OpenAI for intelligent parsing
         """
+        scanned = ScannedCV(text)
+        skills = self._extract_skills(text, scanned)
+        roles = scanned.work_experience()
+        
         parsed_data = {
-            'full_name': self._extract_name(text),
-            'email': self._extract_email(text),
-            'phone': self._extract_phone(text),
-            'location': self._extract_location(text),
-            'linkedin_url': self._extract_linkedin(text),
-            'summary': self._extract_summary(text),
-            'technical_skills': self._extract_skills(text),
-            'soft_skills': [],
-            'languages': [],
-            'certifications': self._extract_certifications(text),
-            'work_experience': self._extract_work_experience(text),
-            'education': self._extract_education(text),
+            'full_name': self._extract_name(scanned),
+            'email': self._extract_email(scanned),
+            'phone': self._extract_phone(scanned),
+            'location': self._extract_location(scanned),
+            'linkedin_url': self._extract_linkedin(scanned),
+            'summary': self._extract_summary(scanned),
+            'current_title': self._extract_current_title(roles),
+            'technical_skills': skills['technical'][:15],  # Top 15 by mentions
+            'soft_skills': skills['soft'],
+            'languages': skills['languages'],
+            'skill_counts': skills['counts'],
+            'certifications': self._extract_certifications(scanned),
+            'work_experience': self._extract_work_experience(roles),
+            'education': self._extract_education(scanned),
             'projects': [],
-            'total_experience_years': self._calculate_experience_years(text)
+            # Inputs for total_experience_years, which depends on today's date
+            '_experience': {
+                'stated_years': max(scanned.experience_years, default=0),
+                'spans': [(role['_start'], role['_end']) for role in roles]
+            }
         }
         
         return parsed_data
     
-    def _extract_name(self, text):
+    def _extract_name(self, scanned):
         """Extract candidate name (usually first line)"""
-        lines = text.strip().split('\n')
-        for line in lines[:5]:  # Check first 5 lines
-            line = line.strip()
-            if line and len(line.split()) <= 4 and len(line) > 2:
+        for line in (scanned.header or scanned.lines)[:5]:  # Check first 5 lines
+            if '@' in line or 'linkedin' in line.lower() or sum(char.isdigit() for char in line) > 3:
+                continue  # Contact details, not a name
+            if len(line.split()) <= 4 and len(line) > 2:
                 # Likely a name (short, at top)
                 return line
         return "Unknown"
     
-    def _extract_email(self, text):
+    def _extract_email(self, scanned):
         """Extract email address"""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else None
+        return scanned.emails[0] if scanned.emails else None
     
-    def _extract_phone(self, text):
+    def _extract_phone(self, scanned):
         """Extract phone number"""
-        phone_pattern = r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,5}[-\s\.]?[0-9]{1,5}'
-        matches = re.findall(phone_pattern, text)
-        # Filter out likely false positives (too short)
-        valid_phones = [m for m in matches if len(re.sub(r'[^0-9]', '', m)) >= 10]
-        return valid_phones[0] if valid_phones else None
+        return scanned.phones[0] if scanned.phones else None
     
-    def _extract_location(self, text):
+    def _extract_location(self, scanned):
         """Extract location/address"""
-        # Basic pattern for city, state/country
-        location_keywords = ['location', 'address', 'based in', 'residing in']
-        lines = text.split('\n')
-        
-        for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in location_keywords):
-                # Next line might be the location
-                if i + 1 < len(lines):
-                    return lines[i + 1].strip()
-        
-        return None
+        return scanned.locations[0] if scanned.locations else None
     
-    def _extract_linkedin(self, text):
+    def _extract_linkedin(self, scanned):
         """Extract LinkedIn URL"""
-        linkedin_pattern = r'(https?://)?(www\.)?linkedin\.com/in/[\w-]+'
-        matches = re.findall(linkedin_pattern, text)
-        return matches[0] if matches else None
+        return scanned.linkedin_urls[0] if scanned.linkedin_urls else None
     
-    def _extract_summary(self, text):
+    def _extract_summary(self, scanned):
         """Extract professional summary"""
-        summary_keywords = ['summary', 'profile', 'objective', 'about']
-        lines = text.split('\n')
-        
-        for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in summary_keywords):
-                # Collect next few lines as summary
-                summary_lines = []
-                for j in range(i + 1, min(i + 6, len(lines))):
-                    if lines[j].strip() and not any(kw in lines[j].lower() for kw in ['experience', 'education', 'skills']):
-                        summary_lines.append(lines[j].strip())
-                    else:
-                        break
-                return ' '.join(summary_lines) if summary_lines else None
-        
-        return None
-    
-    def _extract_skills(self, text):
-        """Extract technical skills"""
-        # Common technical skills (expandable)
-        skill_keywords = [
-            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-            'node', 'django', 'flask', 'spring', 'sql', 'nosql', 'mongodb', 'postgresql',
-            'mysql', 'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'git', 'ci/cd',
-            'machine learning', 'ai', 'data science', 'tensorflow', 'pytorch',
-            'html', 'css', 'rest api', 'graphql', 'microservices', 'agile', 'scrum'
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
+        summary_lines = scanned.sections['summary'][:5]
+        return ' '.join(summary_lines) if summary_lines else None
+    
+    def _extract_current_title(self, roles):
+        """Title of the ongoing (or most recent) role"""
+        current = [role for role in roles if role['_end'] is None and role['title']]
+        if current:
+            return current[0]['title']
+        return roles[0]['title'] if roles else None
+    
+    def _extract_skills(self, text, scanned):
+        """
+        Extract skills from the taxonomy, most mentioned first
         
-        for skill in skill_keywords:
-            if skill in text_lower:
-                found_skills.append(skill.title())
+        Skill names that are also ordinary words ("Swift", "rails") are only
+        counted in the skills section; the rest of the CV is prose
         
-        return found_skills[:15]  # Return top 15 skills found
+        Returns:
+            dict: technical, soft and languages name lists, plus counts ({skill: hits})
+        """
+        matcher = get_skill_matcher()
+        counts = matcher.find(text, ambiguous=False)
+        for skill, hits in matcher.find('\n'.join(scanned.sections['skills'])).items():
+            counts[skill] = max(counts.get(skill, 0), hits)
+        counts = dict(sorted(counts.items(), key=lambda item: -item[1]))
+        
+        skills = {'technical': [], 'soft': [], 'languages': [], 'counts': counts}
+        for skill in counts:
+            category = matcher.categories.get(skill)
+            if category == 'soft_skills':
+                skills['soft'].append(skill)
+            elif category == 'human_languages':
+                skills['languages'].append(skill)
+            elif category != 'certifications':
+                skills['technical'].append(skill)
+        
+        return skills
     
-    def _extract_certifications(self, text):
+    def _extract_certifications(self, scanned):
         """Extract certifications"""
-        cert_keywords = ['certified', 'certification', 'certificate']
-        lines = text.split('\n')
-        
-        certifications = []
-        for line in lines:
-            if any(keyword in line.lower() for keyword in cert_keywords):
-                certifications.append(line.strip())
-        
-        return certifications
+        return list(dict.fromkeys(scanned.certification_lines))
     
-    def _extract_work_experience(self, text):
-        """Extract work experience (basic)"""
-        # This is a simplified version
-        # In production, use NER or AI parsing
-        experiences = []
-        
-        # Look for job titles, companies, dates
-        # Placeholder structure
-        experiences.append({
-            'company': 'Company Name',
-            'title': 'Job Title',
-            'start_date': '2020-01',
-            'end_date': '2023-12',
-            'description': 'Job responsibilities and achievements',
-            'achievements': []
-        })
-        
-        return experiences
+    def _extract_work_experience(self, roles):
+        """Extract work experience from the roles in the experience section"""
+        return [
+            {key: value for key, value in role.items() if not key.startswith('_')}
+            for role in roles
+        ]
     
-    def _extract_education(self, text):
+    def _extract_education(self, scanned):
         """Extract education history"""
-        education = []
-        
-        # Look for degree keywords
-        degree_keywords = ['bachelor', 'master', 'phd', 'b.s.', 'm.s.', 'b.tech', 'm.tech', 'mba']
-        lines = text.split('\n')
-        
-        for line in lines:
-            if any(keyword in line.lower() for keyword in degree_keywords):
-                education.append({
-                    'degree': line.strip(),
-                    'institution': 'University Name',
-                    'field': 'Computer Science',
-                    'start_date': None,
-                    'end_date': None,
-                    'gpa': None
-                })
-        
-        return education
+        return scanned.education()
     
-    def _calculate_experience_years(self, text):
-        """Calculate total years of experience"""
-        # Look for phrases like "5 years experience", "5+ years"
-        exp_pattern = r'(\d+)[\+]?\s*(years?|yrs?)\s*(of\s*)?(experience|exp)'
-        matches = re.findall(exp_pattern, text.lower())
-        
-        if matches:
-            years = [int(match[0]) for match in matches]
-            return max(years) if years else 0
-        
-        return 0
+    def _calculate_experience_years(self, experience, today=None):
+        """Calculate total years of experience as of today"""
+        # Stated totals ("5+ years of experience") or the span of the listed roles
+        roles = [{'_start': start, '_end': end} for start, end in experience['spans']]
+        from_roles = round(experience_months(roles, today) / 12, 1)
+        return max(experience['stated_years'], from_roles)
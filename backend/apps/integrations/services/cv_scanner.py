@@ -0,0 +1,314 @@
+import re
+from datetime import date
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERN = re.compile(r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,5}[-\s\.]?[0-9]{1,5}')
+LINKEDIN_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+', re.IGNORECASE)
+EXPERIENCE_YEARS_PATTERN = re.compile(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)', re.IGNORECASE)
+NON_DIGIT_PATTERN = re.compile(r'[^0-9]')
+
+# Section headings: a short line that is just the heading, optionally followed by ':'
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'professional profile', 'objective',
+                'career objective', 'about', 'about me'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'education': ('education', 'academic background', 'academics', 'qualifications',
+                  'educational qualifications'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'core competencies',
+               'competencies', 'technologies', 'tech stack'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'licenses and certifications',
+                       'licenses & certifications', 'courses'),
+    'projects': ('projects', 'personal projects', 'key projects'),
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_STRIP = re.compile(r'^[\W_]+|[\s:\-\u2013\u2014_]+$')
+
+LOCATION_PATTERN = re.compile(r'\b(?:location|address|based in|residing in)\b\s*[:\-]?\s*(.*)', re.IGNORECASE)
+CERTIFICATION_PATTERN = re.compile(r'certified|certification|certificate', re.IGNORECASE)
+DEGREE_PATTERN = re.compile(
+    r'\b(?:bachelor|master|ph\.?d|doctorate|b\.s\.?c?|m\.s\.?c?|bsc|msc|b\.?a\.|m\.?a\.|b\.?tech|m\.?tech|b\.?e\.|m\.?e\.|mba|bba|associate degree|diploma)\b',
+    re.IGNORECASE
+)
+# "Bachelor of Science in Computer Science": prefer the "in ..." part for the field
+FIELD_PATTERNS = tuple(
+    re.compile(rf'\b{word}\s+([A-Z][\w&/ ]+?)(?:\s*[,(|\u2013\u2014-]|\s+from\b|\s+at\b|$)')
+    for word in ('in', 'of')
+)
+INSTITUTION_PATTERN = re.compile(r'[^,|\u2013\u2014]*\b(?:university|college|institute|school|academy|polytechnic)\b[^,|\u2013\u2014]*', re.IGNORECASE)
+GPA_PATTERN = re.compile(r'\b(?:gpa|cgpa)\s*[:\-]?\s*(\d+(?:\.\d+)?(?:\s*/\s*\d+(?:\.\d+)?)?)', re.IGNORECASE)
+YEAR_PATTERN = re.compile(r'\b(19[5-9]\d|20\d\d)\b')
+BULLET_PATTERN = re.compile(r'^[\u2022\u25aa\u25cf\u25e6\u2023\u2043\u2219*\-\u2013\u2014>]\s*')
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_MONTH_NAME = r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+_MONTH_NUMBER = r'(?:0?[1-9]|1[0-2])'
+# Career dates: a bare number such as "9000" in "2000 - 9000 requests" is not a year
+MIN_YEAR = 1950
+_YEAR = r'(?:19[5-9]\d|20\d\d)'
+_DATE = rf'(?<![\d/.])(?:{_MONTH_NAME}\.?\s+{_YEAR}|{_MONTH_NUMBER}[/.]{_YEAR}|{_YEAR}[/.-]{_MONTH_NUMBER}|{_YEAR})(?!\d)'
+DATE_RANGE_PATTERN = re.compile(
+    rf'(?P<start>{_DATE})\s*(?:-|\u2013|\u2014|to|until)\s*(?P<end>{_DATE}|present|current|now|today|ongoing)',
+    re.IGNORECASE
+)
+_TITLE_COMPANY_SEPARATOR = re.compile(r'\s+(?:at|@)\s+|\s*[|,\u2013\u2014]\s*|\s+-\s+')
+
+
+def parse_date(value):
+    """
+    (year, month) for a CV date such as "Jan 2020", "03/2019", "2019-03" or "2019"
+    None means present/current; ValueError if the month or year is out of range
+    """
+    value = value.strip().lower().rstrip('.')
+    if value in ('present', 'current', 'now', 'today', 'ongoing'):
+        return None
+
+    parts = re.split(r'[\s/.\-]+', value)
+    if parts[0][:4].rstrip('.') in _MONTHS or parts[0][:3] in _MONTHS:
+        year, month = int(parts[-1]), _MONTHS.get(parts[0][:4], _MONTHS.get(parts[0][:3]))
+    elif len(parts) == 2:
+        # "2019-03" or "03/2019"
+        year, month = (int(parts[0]), int(parts[1])) if len(parts[0]) == 4 else (int(parts[1]), int(parts[0]))
+    else:
+        year, month = int(parts[0]), 1
+
+    if year < MIN_YEAR or not 1 <= month <= 12:
+        raise ValueError(f"Not a CV date: {value!r}")
+    return year, month
+
+
+def find_date_range(line, today=None):
+    """
+    The first plausible date range in a line as (match, start, end), or None
+    A range that ends before it starts, or starts or ends in the future, is
+    taken to be other numbers (e.g. "grew traffic 2010 - 2040%") and skipped
+    """
+    today = today or date.today()
+    current = (today.year, today.month)
+    for match in DATE_RANGE_PATTERN.finditer(line):
+        try:
+            start = parse_date(match.group('start'))
+            end = parse_date(match.group('end'))
+        except ValueError:
+            continue
+        if start is None or start > current:
+            continue
+        if end is not None and (end < start or end > current):
+            continue
+        return match, start, end
+    return None
+
+
+def format_date(value):
+    return 'Present' if value is None else f'{value[0]:04d}-{value[1]:02d}'
+
+
+def heading_section(lowered_line):
+    """
+    Section a line opens if it is a heading, else None
+    """
+    if len(lowered_line) > 40:
+        return None
+    return _HEADING_LOOKUP.get(_HEADING_STRIP.sub('', lowered_line))
+
+
+class ScannedCV:
+    """
+    A CV's text split into lines once and grouped into sections
+    Contact details, certification lines, degree lines and experience-year
+    mentions are picked up line by line during the same pass, so every
+    extractor reads from here instead of rescanning the text
+    """
+
+    def __init__(self, text):
+        self.lines = []
+        self.sections = {section: [] for section in SECTION_HEADINGS}
+        self.header = []  # Lines before the first heading (name, contact details)
+        self.emails = []
+        self.phones = []
+        self.linkedin_urls = []
+        self.locations = []
+        self.certification_lines = []
+        self.degree_lines = []
+        self.experience_years = []
+        self._scan(text or '')
+
+    def _scan(self, text):
+        section = None
+        expect_location = False
+
+        for raw_line in text.split('\n'):
+            line = raw_line.strip()
+            if not line:
+                continue
+            lowered = line.lower()
+            self.lines.append(line)
+
+            heading = heading_section(lowered)
+            if heading is not None:
+                section = heading
+                continue
+
+            if section is None:
+                self.header.append(line)
+            else:
+                self.sections[section].append(line)
+
+            if expect_location:
+                self.locations.append(line)
+                expect_location = False
+
+            if '@' in line:
+                self.emails.extend(EMAIL_PATTERN.findall(line))
+            if 'linkedin' in lowered:
+                self.linkedin_urls.extend(match.group(0) for match in LINKEDIN_PATTERN.finditer(line))
+            self.phones.extend(
+                match for match in PHONE_PATTERN.findall(line)
+                if len(NON_DIGIT_PATTERN.sub('', match)) >= 10
+            )
+
+            location = LOCATION_PATTERN.search(line)
+            if location:
+                if location.group(1).strip():
+                    self.locations.append(location.group(1).strip())
+                else:
+                    # "Location" on its own line: the next line holds the value
+                    expect_location = True
+
+            if section == 'certifications' or CERTIFICATION_PATTERN.search(line):
+                self.certification_lines.append(line)
+            if DEGREE_PATTERN.search(line):
+                self.degree_lines.append(line)
+            self.experience_years.extend(int(years) for years in EXPERIENCE_YEARS_PATTERN.findall(line))
+
+    def work_experience(self, today=None):
+        """
+        Roles in the experience section, one per date range
+        The date line (and a preceding heading-like line) gives title and company;
+        following lines up to the next role are its description and achievements
+        """
+        roles = []
+        pending_header = []
+        for line in self.sections['experience']:
+            found = find_date_range(line, today)
+            if found is None:
+                if roles and not pending_header and BULLET_PATTERN.match(line):
+                    roles[-1]['achievements'].append(BULLET_PATTERN.sub('', line))
+                elif roles and not pending_header and len(line.split()) > 8:
+                    roles[-1]['description_lines'].append(line)
+                else:
+                    pending_header.append(line)
+                continue
+
+            dates, start, end = found
+            header_text = (line[:dates.start()] + ' ' + line[dates.end():]).strip(' \t|,()-\u2013\u2014')
+            header_parts = [part for part in pending_header[-2:] if part] + ([header_text] if header_text else [])
+            # Lines left over before this header belong to the previous role
+            if roles:
+                roles[-1]['description_lines'].extend(pending_header[:-2])
+            pending_header = []
+
+            title, company = _split_title_company(header_parts)
+            roles.append({
+                'company': company,
+                'title': title,
+                'start': start,
+                'end': end,
+                'description_lines': [],
+                'achievements': []
+            })
+
+        if roles:
+            roles[-1]['description_lines'].extend(pending_header)
+
+        return [
+            {
+                'company': role['company'],
+                'title': role['title'],
+                'start_date': format_date(role['start']),
+                'end_date': format_date(role['end']),
+                'description': ' '.join(role['description_lines']),
+                'achievements': role['achievements'],
+                '_start': role['start'],
+                '_end': role['end']
+            }
+            for role in roles
+        ]
+
+    def education(self):
+        """
+        Degrees found in the education section (or anywhere, if it has no heading)
+        """
+        source = self.sections['education'] or self.degree_lines
+        entries = []
+        for index, line in enumerate(source):
+            if not DEGREE_PATTERN.search(line):
+                continue
+
+            # Institution and dates may sit on the degree line or the lines around
+            # it, as long as those lines are not another degree
+            nearby = ' | '.join(
+                other for other in source[max(0, index - 1):index + 2]
+                if other is line or not DEGREE_PATTERN.search(other)
+            )
+            institution = INSTITUTION_PATTERN.search(line) or INSTITUTION_PATTERN.search(nearby)
+            field = next((match for match in (pattern.search(line) for pattern in FIELD_PATTERNS) if match), None)
+            gpa = GPA_PATTERN.search(nearby)
+            years = YEAR_PATTERN.findall(line) or YEAR_PATTERN.findall(nearby)
+
+            entries.append({
+                'degree': line,
+                'institution': institution.group(0).strip() if institution else None,
+                'field': field.group(1).strip() if field else None,
+                'start_date': years[0] if len(years) > 1 else None,
+                'end_date': years[-1] if years else None,
+                'gpa': gpa.group(1).replace(' ', '') if gpa else None
+            })
+        return entries
+
+
+def _split_title_company(header_parts):
+    """
+    (title, company) from the lines above/around a role's dates
+    """
+    if len(header_parts) >= 2:
+        # "Acme Corp" on one line and "Senior Engineer" on the next, or vice versa
+        first, second = header_parts[-2], header_parts[-1]
+        if _TITLE_COMPANY_SEPARATOR.search(second):
+            return _split_title_company([second])
+        return second, first
+    if not header_parts:
+        return None, None
+
+    parts = [part.strip() for part in _TITLE_COMPANY_SEPARATOR.split(header_parts[0], maxsplit=1)]
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    return parts[0], None
+
+
+def experience_months(roles, today=None):
+    """
+    Total months covered by the roles' date ranges, counting overlaps once
+    """
+    today = today or date.today()
+    current = (today.year, today.month)
+    spans = sorted(
+        (tuple(role['_start']), tuple(role['_end'] or current))
+        for role in roles
+        if role['_start'] is not None
+    )
+
+    total = 0
+    covered_until = None
+    for start, end in spans:
+        start_index = start[0] * 12 + start[1]
+        end_index = end[0] * 12 + end[1] + 1
+        if covered_until is not None:
+            start_index = max(start_index, covered_until)
+        if end_index > start_index:
+            total += end_index - start_index
+        covered_until = max(covered_until or end_index, end_index)
+    return total
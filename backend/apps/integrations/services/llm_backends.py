@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from functools import lru_cache
+import openai
+from django.conf import settings
+from .prompts import count_tokens
+
+
+class LLMBackendError(Exception):
+    """
+    Raised by a backend when a completion fails
+    """
+
+
+class LLMBackend:
+    """
+    Interface for chat completion providers used by AsyncAIService
+
+    complete() returns the full response text; stream() yields it in chunks.
+    placeholder is the text the caller would use when no provider is
+    configured; only the stub backend answers with it
+    """
+    name = None
+
+    async def complete(self, system_prompt, prompt, temperature, max_tokens=None,
+                       json_response=False, placeholder=''):
+        raise NotImplementedError
+
+    async def stream(self, system_prompt, prompt, temperature, max_tokens=None, placeholder=''):
+        raise NotImplementedError
+        yield
+
+
+# One pooled client per process, shared by every OpenAIBackend
+_async_client = None
+
+
+def get_async_client():
+    """
+    Return the process-wide async OpenAI client, or None if no API key is configured
+    The underlying httpx pool keeps connections to the provider alive between calls
+    """
+    global _async_client
+    if _async_client is None and settings.OPENAI_API_KEY:
+        import httpx
+
+        _async_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            timeout=settings.AI_REQUEST_TIMEOUT,
+            max_retries=settings.AI_MAX_RETRIES,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.AI_MAX_CONCURRENT_REQUESTS,
+                    max_keepalive_connections=settings.AI_MAX_CONCURRENT_REQUESTS,
+                    keepalive_expiry=settings.AI_KEEPALIVE_SECONDS
+                )
+            )
+        )
+    return _async_client
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    The real provider, through the shared pooled client
+    """
+    name = 'openai'
+
+    def __init__(self, model=None):
+        self.client = get_async_client()
+        self.model = model or settings.OPENAI_MODEL
+
+    def _messages(self, system_prompt, prompt):
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+
+    async def complete(self, system_prompt, prompt, temperature, max_tokens=None,
+                       json_response=False, placeholder=''):
+        options = {}
+        if max_tokens:
+            options['max_tokens'] = max_tokens
+        if json_response:
+            options['response_format'] = {"type": "json_object"}
+
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._messages(system_prompt, prompt),
+                temperature=temperature,
+                **options
+            )
+        except openai.OpenAIError as e:
+            raise LLMBackendError(str(e)) from e
+        return response.choices[0].message.content
+
+    async def stream(self, system_prompt, prompt, temperature, max_tokens=None, placeholder=''):
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._messages(system_prompt, prompt),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except openai.OpenAIError as e:
+            raise LLMBackendError(str(e)) from e
+
+
+class StubBackend(LLMBackend):
+    """
+    Deterministic offline backend with provider-like timing
+    Answers with the caller's placeholder after time_to_first_token seconds,
+    then streams it word by word at tokens_per_second. A seeded RNG decides
+    which requests fail (error_rate) and how much latency jitter each gets,
+    so the same seed replays the same run
+    """
+    name = 'stub'
+
+    def __init__(self, time_to_first_token=0.0, tokens_per_second=0.0, error_rate=0.0,
+                 jitter=0.0, seed=0):
+        self.time_to_first_token = time_to_first_token
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.random = random.Random(seed)
+
+    def _plan(self, text):
+        # Draw everything up front so concurrent requests stay deterministic per call order
+        fails = self.error_rate > 0 and self.random.random() < self.error_rate
+        scale = 1 + self.random.uniform(-self.jitter, self.jitter) if self.jitter else 1
+        first = self.time_to_first_token * scale
+        per_token = (1 / self.tokens_per_second) * scale if self.tokens_per_second > 0 else 0
+        return fails, first, per_token
+
+    async def complete(self, system_prompt, prompt, temperature, max_tokens=None,
+                       json_response=False, placeholder=''):
+        fails, first, per_token = self._plan(placeholder)
+        await asyncio.sleep(first)
+        if fails:
+            raise LLMBackendError('Simulated provider error')
+        await asyncio.sleep(per_token * count_tokens(placeholder))
+        return placeholder
+
+    async def stream(self, system_prompt, prompt, temperature, max_tokens=None, placeholder=''):
+        fails, first, per_token = self._plan(placeholder)
+        await asyncio.sleep(first)
+        if fails:
+            raise LLMBackendError('Simulated provider error')
+
+        words = placeholder.split(' ')
+        for i, word in enumerate(words):
+            chunk = word if i == len(words) - 1 else word + ' '
+            if i:
+                await asyncio.sleep(per_token * count_tokens(chunk))
+            yield chunk
+
+
+class RecordReplayBackend(LLMBackend):
+    """
+    Records another backend's responses and their timing to a JSON-lines file,
+    or replays them from it without touching the network
+    Requests are keyed by a hash of the model, prompts and sampling options;
+    replay raises LLMBackendError for a request that was never recorded
+    """
+
+    def __init__(self, path, mode, inner=None, model=None, replay_timing=True):
+        self.path = path
+        self.mode = mode
+        self.name = mode
+        self.inner = inner
+        self.model = model or settings.OPENAI_MODEL
+        self.replay_timing = replay_timing
+        self.recordings = {}
+
+        if os.path.exists(path):
+            with open(path) as recordings:
+                for line in recordings:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.recordings[entry['key']] = entry
+
+    def _key(self, *parts):
+        return hashlib.sha256(json.dumps([self.model, *parts]).encode()).hexdigest()
+
+    def _save(self, key, chunks, first, duration):
+        entry = {'key': key, 'chunks': chunks, 'first': first, 'duration': duration}
+        self.recordings[key] = entry
+        with open(self.path, 'a') as recordings:
+            recordings.write(json.dumps(entry) + '\n')
+
+    def _lookup(self, key):
+        entry = self.recordings.get(key)
+        if entry is None:
+            raise LLMBackendError('No recorded response for this request')
+        return entry
+
+    async def complete(self, system_prompt, prompt, temperature, max_tokens=None,
+                       json_response=False, placeholder=''):
+        key = self._key('complete', system_prompt, prompt, temperature, max_tokens, json_response)
+
+        if self.mode == 'record':
+            started = time.perf_counter()
+            content = await self.inner.complete(
+                system_prompt, prompt, temperature, max_tokens, json_response, placeholder
+            )
+            duration = time.perf_counter() - started
+            self._save(key, [content], duration, duration)
+            return content
+
+        entry = self._lookup(key)
+        if self.replay_timing:
+            await asyncio.sleep(entry['duration'])
+        return ''.join(entry['chunks'])
+
+    async def stream(self, system_prompt, prompt, temperature, max_tokens=None, placeholder=''):
+        key = self._key('stream', system_prompt, prompt, temperature, max_tokens)
+
+        if self.mode == 'record':
+            started = time.perf_counter()
+            first = None
+            chunks = []
+            async for chunk in self.inner.stream(system_prompt, prompt, temperature, max_tokens, placeholder):
+                if first is None:
+                    first = time.perf_counter() - started
+                chunks.append(chunk)
+                yield chunk
+            self._save(key, chunks, first or 0.0, time.perf_counter() - started)
+            return
+
+        entry = self._lookup(key)
+        chunks = entry['chunks']
+        gap = (entry['duration'] - entry['first']) / max(len(chunks) - 1, 1)
+        for i, chunk in enumerate(chunks):
+            if self.replay_timing:
+                await asyncio.sleep(entry['first'] if i == 0 else gap)
+            yield chunk
+
+
+def build_stub_backend():
+    return StubBackend(
+        time_to_first_token=settings.AI_STUB_TIME_TO_FIRST_TOKEN,
+        tokens_per_second=settings.AI_STUB_TOKENS_PER_SECOND,
+        error_rate=settings.AI_STUB_ERROR_RATE,
+        jitter=settings.AI_STUB_JITTER,
+        seed=settings.AI_STUB_SEED
+    )
+
+
+@lru_cache(maxsize=None)
+def get_llm_backend():
+    """
+    Return the process-wide LLM backend selected by AI_LLM_BACKEND
+    'auto' uses the real provider when an API key is configured and the stub otherwise
+    """
+    backend = settings.AI_LLM_BACKEND
+    if backend == 'auto':
+        backend = 'openai' if settings.OPENAI_API_KEY else 'stub'
+
+    if backend == 'openai':
+        return OpenAIBackend()
+    if backend == 'stub':
+        return build_stub_backend()
+    if backend == 'record':
+        inner = OpenAIBackend() if settings.OPENAI_API_KEY else build_stub_backend()
+        return RecordReplayBackend(settings.AI_RECORDINGS_PATH, 'record', inner=inner)
+    if backend == 'replay':
+        return RecordReplayBackend(settings.AI_RECORDINGS_PATH, 'replay')
+    raise ValueError(f"Unknown AI_LLM_BACKEND: {backend!r}")
@@ -0,0 +1,300 @@
+from functools import lru_cache
+from string import Template
+from textwrap import dedent
+from django.conf import settings
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; fall back to a character estimate
+    tiktoken = None
+
+# Rough characters per token for English when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('cl100k_base')
+
+
+def count_tokens(text):
+    """
+    Count the tokens in text for the configured model
+    """
+    if tiktoken is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(_get_encoding(settings.OPENAI_MODEL).encode(text))
+
+
+def truncate_text(text, budget):
+    """
+    Cut text down to at most budget tokens, keeping its beginning
+    """
+    text = str(text or '')
+    if count_tokens(text) <= budget:
+        return text
+
+    if tiktoken is None:
+        return text[:budget * CHARS_PER_TOKEN].rstrip() + '...'
+    encoding = _get_encoding(settings.OPENAI_MODEL)
+    return encoding.decode(encoding.encode(text)[:budget]).rstrip() + '...'
+
+
+def fit_items(items, budget, separator=', '):
+    """
+    Join as many leading items as fit in budget tokens
+    """
+    kept = []
+    used = 0
+    for item in items or []:
+        item = str(item)
+        tokens = count_tokens(item + separator)
+        if used + tokens > budget:
+            break
+        kept.append(item)
+        used += tokens
+    return separator.join(kept)
+
+
+def fit_transcript(turns, budget):
+    """
+    Format (speaker, text) turns, dropping the oldest ones first to fit budget tokens
+    """
+    kept = []
+    used = 0
+    for speaker, text in reversed(list(turns or [])):
+        line = f"{speaker}: {text}"
+        tokens = count_tokens(line) + 1
+        if used + tokens > budget:
+            if not kept:
+                # Even the latest turn is too long; keep what fits of it
+                kept.append(truncate_text(line, budget))
+            break
+        kept.append(line)
+        used += tokens
+    return '\n'.join(reversed(kept))
+
+
+class Section:
+    """
+    A budgeted placeholder in a PromptTemplate
+    kind is 'text', 'items' or 'transcript'; budget is in tokens (None = unbounded)
+    """
+
+    def __init__(self, kind='text', budget=None, empty=''):
+        self.kind = kind
+        self.budget = budget
+        self.empty = empty
+
+    def fit(self, value, budget=None):
+        budget = budget if budget is not None else self.budget
+        if self.kind == 'transcript':
+            text = fit_transcript(value, budget) if budget is not None else '\n'.join(
+                f"{speaker}: {text}" for speaker, text in value or []
+            )
+        elif self.kind == 'items':
+            text = fit_items(value, budget) if budget is not None else ', '.join(str(item) for item in value or [])
+        else:
+            text = truncate_text(value, budget) if budget is not None else str(value or '')
+        return text or self.empty
+
+
+class PromptTemplate:
+    """
+    A system prompt plus a precompiled user template with per-section token budgets
+    The system prompt is fixed text (instructions and output format) so the
+    prefix of every request is identical and provider-side prompt caching can
+    hit; only the user message varies
+    """
+
+    def __init__(self, system, user, sections=None):
+        self.system = dedent(system).strip()
+        self.template = Template(dedent(user).strip())
+        self.sections = sections or {}
+
+    def render(self, budgets=None, **values):
+        """
+        Render the user message, trimming each budgeted section to fit
+
+        Args:
+            budgets: Optional per-call {section: tokens} overrides
+            **values: Template values; plain values are inserted as-is
+        """
+        budgets = budgets or {}
+        fitted = {}
+        for name, value in values.items():
+            section = self.sections.get(name)
+            fitted[name] = section.fit(value, budgets.get(name)) if section else value
+        return self.template.substitute(fitted)
+
+
+EVALUATION_RESULT_FORMAT = """
+    {
+        "score": 7.5,  // 0-10
+        "feedback": "Detailed feedback on the answer",
+        "strengths": ["strength1", "strength2"],
+        "improvements": ["area1", "area2"],
+        "covered_points": ["point1", "point2"]
+    }
+"""
+
+QUESTION_LIST_FORMAT = """
+    [
+        {
+            "question_text": "Question here?",
+            "question_type": "technical|behavioral|scenario",
+            "difficulty": "easy|medium|hard",
+            "skills_tested": ["skill1", "skill2"],
+            "expected_answer_points": ["point1", "point2"],
+            "max_score": 10.0
+        },
+        ...
+    ]
+"""
+
+ANSWER_SECTIONS = {
+    'question': Section('text', 300),
+    'expected_points': Section('items', 200, empty='None specified'),
+    'answer': Section('text', 1500),
+}
+
+EVALUATION_PROMPT = PromptTemplate(
+    system="""
+    You are an expert interviewer who provides fair, constructive evaluations.
+
+    Evaluate the candidate's answer to the interview question.
+    Provide evaluation as JSON:
+    """ + EVALUATION_RESULT_FORMAT,
+    user="""
+    Question: $question
+    Type: $question_type
+    Expected points: $expected_points
+
+    Candidate's Answer: $answer
+    """,
+    sections=ANSWER_SECTIONS
+)
+
+BATCH_EVALUATION_PROMPT = PromptTemplate(
+    system="""
+    You are an expert interviewer who provides fair, constructive evaluations.
+
+    Evaluate each numbered interview answer independently.
+    Provide evaluations as JSON, one per answer, with "index" set to the answer's number:
+    {"evaluations": [...]}
+    where each evaluation has the form:
+    """ + EVALUATION_RESULT_FORMAT,
+    user="""
+    $answers
+    """
+)
+
+BATCH_EVALUATION_ITEM = PromptTemplate(
+    system='',
+    user="""
+    [$index]
+    Question: $question
+    Type: $question_type
+    Expected points: $expected_points
+
+    Candidate's Answer: $answer
+    """,
+    sections=ANSWER_SECTIONS
+)
+
+FOLLOW_UP_PROMPT = PromptTemplate(
+    system="""
+    You are an expert interviewer asking insightful follow-up questions.
+
+    Given the interview so far, generate a natural, probing follow-up question
+    that digs deeper into the candidate's latest answer.
+    Return only the question text, nothing else.
+    """,
+    user="""
+    Earlier in the interview:
+    $transcript
+
+    Original Question: $question
+    Candidate's Answer: $answer
+    """,
+    sections={
+        'transcript': Section('transcript', 1000, empty='(nothing yet)'),
+        'question': Section('text', 300),
+        'answer': Section('text', 1500),
+    }
+)
+
+QUESTION_GENERATION_SYSTEM_PROMPT = """
+    You are an expert interviewer who creates targeted, insightful interview questions.
+
+    Return questions as a JSON array with structure:
+""" + QUESTION_LIST_FORMAT
+
+CANDIDATE_SECTIONS = {
+    'required_skills': Section('items', 150, empty='N/A'),
+    'candidate_skills': Section('items', 80, empty='N/A'),
+    'current_title': Section('text', 30, empty='N/A'),
+}
+
+INTERVIEW_QUESTIONS_PROMPT = PromptTemplate(
+    system=QUESTION_GENERATION_SYSTEM_PROMPT,
+    user="""
+    Generate 12 interview questions for the following:
+
+    Job: $job_title
+    Required Skills: $required_skills
+
+    Candidate:
+    - Experience: $experience_years years
+    - Skills: $candidate_skills
+    - Current Role: $current_title
+
+    Difficulty: $difficulty
+
+    Create exactly 12 questions:
+    - 5 technical questions
+    - 4 behavioral questions
+    - 3 scenario-based questions
+    """,
+    sections=CANDIDATE_SECTIONS
+)
+
+BANK_QUESTIONS_PROMPT = PromptTemplate(
+    system=QUESTION_GENERATION_SYSTEM_PROMPT,
+    user="""
+    Generate $count interview questions for the following role.
+    They will be reused for every candidate, so do not assume anything about the candidate.
+
+    Job: $job_title
+    Experience Level: $experience_level
+    Required Skills: $required_skills
+
+    Difficulty: $difficulty
+
+    Mix technical, behavioral and scenario-based questions
+    (roughly 40% technical, 40% behavioral, 20% scenario).
+    """,
+    sections=CANDIDATE_SECTIONS
+)
+
+PERSONALIZED_QUESTIONS_PROMPT = PromptTemplate(
+    system=QUESTION_GENERATION_SYSTEM_PROMPT,
+    user="""
+    Generate $count interview questions personalized to this candidate's background
+    for the role below. Focus on their own experience and how it maps to the role.
+
+    Job: $job_title
+    Required Skills: $required_skills
+
+    Candidate:
+    - Experience: $experience_years years
+    - Skills: $candidate_skills
+    - Current Role: $current_title
+
+    Difficulty: $difficulty
+    """,
+    sections=CANDIDATE_SECTIONS
+)
@@ -0,0 +1,337 @@
+import asyncio
+import bisect
+import time
+from collections import deque
+from django.conf import settings
+from .llm_backends import LLMBackendError
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+
+class DeadlineExceeded(LLMBackendError):
+    """
+    Raised when an LLM operation runs past its deadline
+    """
+
+
+class CircuitOpenError(LLMBackendError):
+    """
+    Raised instead of calling the provider while the circuit breaker is open
+    """
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram plus a window of recent samples for percentiles
+    """
+
+    def __init__(self, window=500):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.recent = deque(maxlen=window)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+        self.total += 1
+        self.sum += seconds
+
+    def percentile(self, pct):
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def snapshot(self):
+        labels = [f'le_{bound}' for bound in LATENCY_BUCKETS] + ['le_inf']
+        return {
+            'count': self.total,
+            'mean_ms': round(self.sum / self.total * 1000, 1) if self.total else None,
+            **{
+                f'p{pct}_ms': round(value * 1000, 1) if value is not None else None
+                for pct, value in ((50, self.percentile(50)), (95, self.percentile(95)), (99, self.percentile(99)))
+            },
+            'buckets': dict(zip(labels, self.counts))
+        }
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and rejects calls for
+    reset_timeout seconds; then lets one trial call through (half-open) and
+    closes again if it succeeds
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def release(self):
+        """
+        Give back a half-open trial that ended without an outcome
+        """
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self.trial_in_flight:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+
+class Operation:
+    """
+    Deadline, hedging policy and metrics for one kind of LLM call
+    hedge_percentile None disables hedging for the operation
+    """
+
+    def __init__(self, name, deadline, hedge_percentile=None):
+        self.name = name
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.latency = LatencyHistogram()
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self):
+        """
+        Seconds to wait on the first request before sending a duplicate, or None
+        """
+        if self.hedge_percentile is None or len(self.latency.recent) < settings.AI_HEDGE_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    def snapshot(self):
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'rejected_by_breaker': self.rejected,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'hedge_delay_ms': round(self.hedge_delay() * 1000, 1) if self.hedge_delay() is not None else None,
+            'latency': self.latency.snapshot()
+        }
+
+
+class Resilience:
+    """
+    Runs LLM calls under per-operation deadlines, hedges slow ones and trips
+    a provider-wide circuit breaker when calls keep failing
+    """
+
+    def __init__(self):
+        self.breaker = CircuitBreaker(
+            settings.AI_CIRCUIT_FAILURE_THRESHOLD,
+            settings.AI_CIRCUIT_RESET_TIMEOUT
+        )
+        self.operations = {}
+        for name, (deadline, hedge_percentile) in settings.AI_OPERATION_POLICIES.items():
+            self.operations[name] = Operation(name, deadline, hedge_percentile)
+
+    def operation(self, name):
+        if name not in self.operations:
+            self.operations[name] = Operation(name, settings.AI_REQUEST_TIMEOUT)
+        return self.operations[name]
+
+    def _admit(self, operation):
+        if not self.breaker.allow():
+            operation.rejected += 1
+            raise CircuitOpenError('LLM provider circuit is open')
+        operation.calls += 1
+
+    def _settle(self, operation, elapsed, error=None):
+        if error is None:
+            operation.latency.observe(elapsed)
+            self.breaker.record_success()
+            return
+
+        operation.failures += 1
+        if isinstance(error, DeadlineExceeded):
+            operation.timeouts += 1
+        self.breaker.record_failure()
+
+    async def _race(self, operation, start_attempt, deadline_at):
+        """
+        Run start_attempt(), adding one hedged duplicate if the first is slow
+        Returns the first successful result; the other attempt is cancelled
+        """
+        primary = asyncio.ensure_future(start_attempt())
+        attempts = [primary]
+        hedge_delay = operation.hedge_delay()
+        hedge_at = time.perf_counter() + hedge_delay if hedge_delay is not None else None
+        last_error = None
+
+        try:
+            while attempts:
+                now = time.perf_counter()
+                if now >= deadline_at:
+                    raise DeadlineExceeded(f'{operation.name} exceeded {operation.deadline}s')
+
+                wake_at = deadline_at if hedge_at is None else min(deadline_at, hedge_at)
+                done, _ = await asyncio.wait(attempts, timeout=wake_at - now, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    attempts.remove(task)
+                    if task.exception() is None:
+                        if task is not primary:
+                            operation.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+
+                if not done and hedge_at is not None and time.perf_counter() >= hedge_at:
+                    # The first attempt is past the hedge threshold: send a duplicate
+                    operation.hedges += 1
+                    attempts.append(asyncio.ensure_future(start_attempt()))
+                    hedge_at = None
+
+            raise last_error
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def call(self, name, make_call):
+        """
+        Await make_call() under the operation's deadline, hedging and breaker
+
+        Args:
+            name: Operation name (see AI_OPERATION_POLICIES)
+            make_call: Zero-argument callable returning a new awaitable per attempt
+        """
+        operation = self.operation(name)
+        self._admit(operation)
+        started = time.perf_counter()
+
+        try:
+            result = await self._race(operation, make_call, started + operation.deadline)
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            self._settle(operation, None, e)
+            raise
+        self._settle(operation, time.perf_counter() - started)
+        return result
+
+    async def stream(self, name, make_stream):
+        """
+        Iterate make_stream() under the operation's breaker, hedging the time to
+        first chunk and bounding the whole stream by the operation's deadline
+
+        Args:
+            name: Operation name (see AI_OPERATION_POLICIES)
+            make_stream: Zero-argument callable returning a new async iterator per attempt
+        """
+        operation = self.operation(name)
+        self._admit(operation)
+        started = time.perf_counter()
+        deadline_at = started + operation.deadline
+        streams = []
+
+        async def first_chunk():
+            stream = make_stream().__aiter__()
+            streams.append(stream)
+            try:
+                return stream, await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, None
+
+        # Stream latency is time to first chunk, which is what hedging races on
+        first_chunk_after = None
+        try:
+            stream, chunk = await self._race(operation, first_chunk, deadline_at)
+            first_chunk_after = time.perf_counter() - started
+            for other in streams:
+                if other is not stream:
+                    await _close(other)
+
+            while chunk is not None:
+                yield chunk
+                remaining = deadline_at - time.perf_counter()
+                if remaining <= 0:
+                    raise DeadlineExceeded(f'{operation.name} exceeded {operation.deadline}s')
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), remaining)
+                except StopAsyncIteration:
+                    chunk = None
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded(f'{operation.name} exceeded {operation.deadline}s')
+        except (asyncio.CancelledError, GeneratorExit):
+            # The caller stopped listening; that says nothing about the provider
+            if first_chunk_after is not None:
+                self._settle(operation, first_chunk_after)
+            else:
+                self.breaker.release()
+            for stream in streams:
+                await _close(stream)
+            raise
+        except Exception as e:
+            self._settle(operation, None, e)
+            for stream in streams:
+                await _close(stream)
+            raise
+        self._settle(operation, first_chunk_after)
+
+    def snapshot(self):
+        return {
+            'circuit': {
+                'state': self.breaker.state,
+                'consecutive_failures': self.breaker.failures,
+                'times_opened': self.breaker.times_opened
+            },
+            'operations': {name: operation.snapshot() for name, operation in self.operations.items()}
+        }
+
+
+async def _close(stream):
+    aclose = getattr(stream, 'aclose', None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+# One Resilience per process, so breaker state and histograms cover every call
+_resilience = None
+
+
+def get_resilience():
+    global _resilience
+    if _resilience is None:
+        _resilience = Resilience()
+    return _resilience
@@ -0,0 +1,187 @@
+import json
+from collections import deque
+from functools import lru_cache
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _lower(text):
+    # Keep offsets aligned with the original text (a few characters such as
+    # 'İ' grow when lowercased)
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+def load_taxonomy(path):
+    """
+    Load a skill taxonomy file
+
+    The file is JSON: {"skills": [{"name", "category", "aliases", "case_sensitive", "ambiguous"}]}.
+    Every name and alias is matched case-insensitively, except the spellings listed
+    in case_sensitive (e.g. "Go", "R"). Spellings listed in ambiguous (e.g. "Swift",
+    "rails") are also ordinary words, so callers can leave them out of a scan over
+    free prose (see SkillMatcher.find)
+    """
+    with open(path, encoding='utf-8') as taxonomy_file:
+        return json.load(taxonomy_file)['skills']
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every skill name and alias in a taxonomy
+    Finds all canonical skills in a text in one pass, regardless of how many
+    patterns there are. Matches must sit on word boundaries, so "ai" does not
+    match inside "maintain" and "java" does not match inside "javascript";
+    where matches overlap the longest one wins ("react native" over "react")
+    """
+
+    def __init__(self, skills):
+        self.skills = [skill['name'] for skill in skills]
+        self.categories = {skill['name']: skill.get('category') for skill in skills}
+        self.lookup = {}
+
+        # Trie: goto[state] maps a character to the next state
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for index, skill in enumerate(skills):
+            case_sensitive = set(skill.get('case_sensitive', []))
+            ambiguous = set(skill.get('ambiguous', []))
+            for spelling in [skill['name'], *skill.get('aliases', [])]:
+                exact = spelling if spelling in case_sensitive else None
+                if exact is None:
+                    self.lookup.setdefault(_lower(spelling).strip(), index)
+                self._add(_lower(spelling).strip(), index, exact, spelling in ambiguous)
+
+        self._build_failure_links()
+
+    def _add(self, pattern, index, exact, ambiguous):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(pattern), index, exact, ambiguous))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def _matches(self, text, ambiguous=True):
+        """
+        (start, end, skill index) for every word-bounded match, skipping
+        ambiguous spellings unless ambiguous is True
+        """
+        lowered = _lower(text)
+        goto, fail, output = self.goto, self.fail, self.output
+        matches = []
+        state = 0
+
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+
+            end = position + 1
+            for length, index, exact, is_ambiguous in output[state]:
+                if is_ambiguous and not ambiguous:
+                    continue
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                if exact is not None and text[start:end] != exact:
+                    continue
+                matches.append((start, end, index))
+
+        return matches
+
+    def find(self, text, ambiguous=True):
+        """
+        Canonical skills mentioned in the text with their hit counts
+
+        Args:
+            text: Free text (a CV, a job description)
+            ambiguous: Whether to match spellings that are also ordinary words
+                ("Swift", "rails"); pass False when scanning prose rather than
+                a skills list
+
+        Returns:
+            dict: {canonical skill: hits}, most frequent first
+        """
+        counts = {}
+        first_seen = {}
+        covered_until = 0
+
+        # Leftmost-longest: drop matches that overlap an earlier, longer one
+        for start, end, index in sorted(self._matches(text or '', ambiguous), key=lambda match: (match[0], -match[1])):
+            if start < covered_until:
+                continue
+            covered_until = end
+            name = self.skills[index]
+            counts[name] = counts.get(name, 0) + 1
+            first_seen.setdefault(name, start)
+
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], first_seen[item[0]])))
+
+    def canonical(self, skill):
+        """
+        Canonical name for a single skill string, or None if it is not in the taxonomy
+        """
+        index = self.lookup.get(_lower(skill or '').strip())
+        if index is not None:
+            return self.skills[index]
+        found = self.find(skill)
+        return next(iter(found)) if len(found) == 1 else None
+
+    def normalize(self, skills):
+        """
+        Map a list of free-form skills (e.g. JobDescription.required_skills) to
+        canonical names, dropping duplicates and keeping unknown skills as written
+        """
+        normalized = []
+        seen = set()
+        for skill in skills or []:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            name = self.canonical(skill) or skill.strip()
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                normalized.append(name)
+        return normalized
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(path=None):
+    """
+    Return the process-wide skill matcher, compiled once from the taxonomy file
+    """
+    if path is None:
+        from django.conf import settings
+
+        path = settings.SKILL_TAXONOMY_PATH
+    return SkillMatcher(load_taxonomy(path))
@@ -3,6 +3,69 @@ import mediapipe as mp
 import numpy as np
 from datetime import datetime
 
+
+def generate_summary(frame_analyses):
+    """
+    Generate summary report from multiple frame analyses
+    Works on the analysis dicts alone, so no VideoAnalysisService (and none of
+    its MediaPipe graphs) is needed
+
+    Args:
+        frame_analyses: List of frame analysis results
+
+    Returns:
+        dict: Summary report
+    """
+    if not frame_analyses:
+        return {
+            'overall_engagement': 0.0,
+            'dominant_emotion': 'unknown',
+            'confidence_score': 0.0,
+            'key_moments': []
+        }
+
+    # Calculate averages
+    engagement_scores = [f['engagement_score'] for f in frame_analyses]
+    avg_engagement = sum(engagement_scores) / len(engagement_scores)
+
+    # Find dominant emotion
+    emotions = [f['facial_analysis'].get('emotion', 'unknown') for f in frame_analyses if f['facial_analysis']['face_detected']]
+    dominant_emotion = max(set(emotions), key=emotions.count) if emotions else 'unknown'
+
+    # Calculate confidence
+    confidence_scores = [f['body_analysis'].get('confidence_level', 0) for f in frame_analyses if f['body_analysis']['pose_detected']]
+    avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0
+
+    # Identify key moments
+    key_moments = _identify_key_moments(frame_analyses)
+
+    return {
+        'overall_engagement': round(avg_engagement, 2),
+        'dominant_emotion': dominant_emotion,
+        'confidence_score': round(avg_confidence, 2),
+        'posture_quality': 'good',  # Simplified
+        'eye_contact_percentage': 0.85,  # Simplified
+        'key_moments': key_moments
+    }
+
+
+def _identify_key_moments(frame_analyses):
+    """
+    Identify noteworthy moments in the interview
+    """
+    key_moments = []
+
+    # Find moments with significant changes or notable events
+    # Placeholder logic
+    key_moments.append({
+        'timestamp': '00:05:23',
+        'observation': 'High engagement detected',
+        'score': 0.9
+    })
+
+    return key_moments
+
+
 class VideoAnalysisService:
     """
     Video analysis service for body language and facial expression detection
@@ -62,6 +125,22 @@ class VideoAnalysisService:
             'engagement_score': engagement_score
         }
     
+    def analyze_encoded_frame(self, buffer):
+        """
+        Decode a JPEG/PNG frame and analyze it
+        
+        Args:
+            buffer: Encoded image bytes (bytes or memoryview)
+            
+        Returns:
+            dict: Analysis results, or None if the frame could not be decoded
+        """
+        frame = cv2.imdecode(np.frombuffer(buffer, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return None
+        
+        return self.analyze_frame(frame)
+    
     def _analyze_facial_expressions(self, rgb_frame):
         """
         Analyze facial expressions and emotions
@@ -216,61 +295,9 @@ class VideoAnalysisService:
     
     def generate_summary(self, frame_analyses):
         """
-        Generate summary report from multiple frame analyses
-        
-        Args:
-            frame_analyses: List of frame analysis results
-            
-        Returns:
-            dict: Summary report
+        Generate summary report from multiple frame analyses (see generate_summary)
         """
-        if not frame_analyses:
-            return {
-                'overall_engagement': 0.0,
-                'dominant_emotion': 'unknown',
-                'confidence_score': 0.0,
-                'key_moments': []
-            }
-        
-        # Calculate averages
-        engagement_scores = [f['engagement_score'] for f in frame_analyses]
-        avg_engagement = sum(engagement_scores) / len(engagement_scores)
-        
-        # Find dominant emotion
-        emotions = [f['facial_analysis'].get('emotion', 'unknown') for f in frame_analyses if f['facial_analysis']['face_detected']]
-        dominant_emotion = max(set(emotions), key=emotions.count) if emotions else 'unknown'
-        
-        # Calculate confidence
-        confidence_scores = [f['body_analysis'].get('confidence_level', 0) for f in frame_analyses if f['body_analysis']['pose_detected']]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0
-        
-        # Identify key moments
-        key_moments = self._identify_key_moments(frame_analyses)
-        
-        return {
-            'overall_engagement': round(avg_engagement, 2),
-            'dominant_emotion': dominant_emotion,
-            'confidence_score': round(avg_confidence, 2),
-            'posture_quality': 'good',  # Simplified
-            'eye_contact_percentage': 0.85,  # Simplified
-            'key_moments': key_moments
-        }
-    
-    def _identify_key_moments(self, frame_analyses):
-        """
-        Identify noteworthy moments in the interview
-        """
-        key_moments = []
-        
-        # Find moments with significant changes or notable events
-        # Placeholder logic
-        key_moments.append({
-            'timestamp': '00:05:23',
-            'observation': 'High engagement detected',
-            'score': 0.9
-        })
-        
-        return key_moments
+        return generate_summary(frame_analyses)
     
     def cleanup(self):
         """
@@ -0,0 +1,157 @@
+import asyncio
+import atexit
+import multiprocessing
+import os
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Worker-process state: one warm VideoAnalysisService per interview, so
+# MediaPipe's tracking state carries over between frames of the same interview
+_services = OrderedDict()
+_max_services = 8
+
+
+def _init_worker(max_services):
+    global _max_services
+    _max_services = max_services
+
+    # Import MediaPipe once per worker, up front, instead of on the first frame
+    from . import video_analysis_service  # noqa: F401
+
+
+def _get_service(interview_id):
+    from .video_analysis_service import VideoAnalysisService
+
+    service = _services.get(interview_id)
+    if service is None:
+        service = VideoAnalysisService()
+        _services[interview_id] = service
+
+        # Evict the least recently used interview's graphs
+        while len(_services) > _max_services:
+            _, evicted = _services.popitem(last=False)
+            evicted.cleanup()
+    else:
+        _services.move_to_end(interview_id)
+
+    return service
+
+
+def _analyze(interview_id, frame_bytes):
+    return _get_service(interview_id).analyze_encoded_frame(frame_bytes)
+
+
+def _summarize(frame_analyses):
+    # Aggregation only: no need for (or LRU churn from) the interview's graphs
+    from .video_analysis_service import generate_summary
+
+    return generate_summary(frame_analyses)
+
+
+def _release(interview_id):
+    service = _services.pop(interview_id, None)
+    if service is not None:
+        service.cleanup()
+
+
+class VideoAnalysisPool:
+    """
+    Process pool for CPU-bound video analysis
+    Each worker is a single-process executor so an interview can be pinned to
+    one worker; frames for the same interview always land on the same process
+    and reuse its warm MediaPipe graphs
+    """
+
+    def __init__(self, size, sessions_per_worker=8):
+        self.size = size
+        self.sessions_per_worker = sessions_per_worker
+        self._context = multiprocessing.get_context('spawn')
+        self._workers = [self._create_worker() for _ in range(size)]
+
+    def _create_worker(self):
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self.sessions_per_worker,)
+        )
+
+    def _worker_index(self, interview_id):
+        return zlib.crc32(str(interview_id).encode()) % self.size
+
+    async def analyze(self, interview_id, frame):
+        """
+        Analyze one encoded frame on the interview's worker
+
+        Args:
+            interview_id: Interview the frame belongs to (selects the worker)
+            frame: Encoded JPEG bytes or memoryview
+
+        Returns:
+            dict: Per-frame analysis, or None if the frame could not be analyzed
+        """
+        index = self._worker_index(interview_id)
+        loop = asyncio.get_running_loop()
+
+        # Frames must be copied once here to cross the process boundary
+        try:
+            return await loop.run_in_executor(
+                self._workers[index], _analyze, str(interview_id), bytes(frame)
+            )
+        except BrokenProcessPool:
+            # The worker died (e.g. a native crash); replace it and drop the frame
+            self._workers[index] = self._create_worker()
+            return None
+
+    async def summarize(self, interview_id, frame_analyses):
+        """
+        Summarize an interview's per-frame analyses on its worker
+
+        Returns:
+            dict: VideoAnalysisService.generate_summary report, or None if the worker died
+        """
+        index = self._worker_index(interview_id)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._workers[index], _summarize, frame_analyses
+            )
+        except BrokenProcessPool:
+            self._workers[index] = self._create_worker()
+            return None
+
+    async def release(self, interview_id):
+        """
+        Free the interview's MediaPipe graphs on its worker
+        """
+        index = self._worker_index(interview_id)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._workers[index], _release, str(interview_id))
+        except BrokenProcessPool:
+            self._workers[index] = self._create_worker()
+
+    def shutdown(self):
+        for worker in self._workers:
+            worker.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+
+
+def get_video_analysis_pool():
+    """
+    Return this process's shared video analysis pool, creating it on first use
+    """
+    global _pool
+    if _pool is None:
+        from django.conf import settings
+
+        _pool = VideoAnalysisPool(
+            settings.VIDEO_ANALYSIS_WORKERS or os.cpu_count() or 1,
+            settings.VIDEO_ANALYSIS_SESSIONS_PER_WORKER
+        )
+        atexit.register(_pool.shutdown)
+    return _pool
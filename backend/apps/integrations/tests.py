@@ -0,0 +1,70 @@
+from datetime import date
+from django.test import SimpleTestCase
+from .services.cv_scanner import ScannedCV, experience_months, parse_date
+from .services.skill_matcher import get_skill_matcher
+
+TODAY = date(2024, 6, 1)
+
+
+class CVDateTests(SimpleTestCase):
+    """
+    Numbers in experience bullets must not be read as employment dates
+    """
+
+    def scan_roles(self, experience):
+        return ScannedCV('Experience\n' + experience).work_experience(today=TODAY)
+
+    def test_numeric_ranges_in_bullets_are_not_roles(self):
+        roles = self.scan_roles(
+            'Senior Engineer at Acme | Jan 2019 - Present\n'
+            '- Scaled the API from 2000 - 9000 requests per second\n'
+            '- Cut p99 latency from 1200 - 1800 ms\n'
+            '- Grew weekly signups 2010 - 2040 by the end of the quarter\n'
+        )
+
+        self.assertEqual(len(roles), 1)
+        self.assertEqual(roles[0]['company'], 'Acme')
+        self.assertEqual(len(roles[0]['achievements']), 3)
+        self.assertEqual(round(experience_months(roles, today=TODAY) / 12, 1), 5.5)
+
+    def test_invalid_month_is_not_a_date(self):
+        with self.assertRaises(ValueError):
+            parse_date('13/2020')
+        self.assertEqual(self.scan_roles('Engineer, Initech\n13/2020 - 02/2021\n'), [])
+
+    def test_years_are_bounded(self):
+        with self.assertRaises(ValueError):
+            parse_date('1949')
+        self.assertEqual(self.scan_roles('Engineer, Initech\n2022 - 2031\n'), [])
+
+    def test_range_ending_before_it_starts_is_skipped(self):
+        self.assertEqual(self.scan_roles('Engineer, Initech\n2021 - 2018\n'), [])
+
+    def test_date_formats(self):
+        self.assertEqual(parse_date('Jan 2020'), (2020, 1))
+        self.assertEqual(parse_date('03/2019'), (2019, 3))
+        self.assertEqual(parse_date('2019-03'), (2019, 3))
+        self.assertEqual(parse_date('2019'), (2019, 1))
+        self.assertIsNone(parse_date('Present'))
+
+        roles = self.scan_roles('Developer, Globex\n2015 - 2018\nAnalyst, Hooli\n03/2012 - 2014.05\n')
+        self.assertEqual(
+            [(role['start_date'], role['end_date']) for role in roles],
+            [('2015-01', '2018-01'), ('2012-03', '2014-05')]
+        )
+
+
+class SkillMatcherTests(SimpleTestCase):
+    """
+    Skill names that are also ordinary words only count in a skills list
+    """
+
+    def test_ambiguous_names_are_skipped_in_prose(self):
+        matcher = get_skill_matcher()
+        prose = 'Swift learner and Go-getter who keeps projects on the rails with Django and Ruby on Rails.'
+
+        self.assertEqual(list(matcher.find(prose, ambiguous=False)), ['Django', 'Ruby on Rails'])
+        self.assertEqual(list(matcher.find('Go, Swift, Flask, Python')), ['Go', 'Swift', 'Flask', 'Python'])
+
+    def test_normalize_still_accepts_ambiguous_names(self):
+        self.assertEqual(get_skill_matcher().normalize(['flask', 'rails', 'Go']), ['Flask', 'Ruby on Rails', 'Go'])
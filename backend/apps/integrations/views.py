@@ -0,0 +1,14 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .services.resilience import get_resilience
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def llm_metrics(request):
+    """
+    LLM call latency histograms, hedging counters and circuit state for this server process
+    GET /api/integrations/metrics/llm/
+    """
+    return Response(get_resilience().snapshot())
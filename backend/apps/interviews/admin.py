@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Interview, InterviewMessage
+from .models import Interview, InterviewMessage, ConnectionEvent
 
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
@@ -55,3 +55,10 @@ class InterviewMessageAdmin(admin.ModelAdmin):
     def get_content_preview(self, obj):
         return obj.content[:50] + '...' if len(obj.content) > 50 else obj.content
     get_content_preview.short_description = 'Content'
+
+
+@admin.register(ConnectionEvent)
+class ConnectionEventAdmin(admin.ModelAdmin):
+    list_display = ('interview', 'event_type', 'status', 'timestamp')
+    list_filter = ('event_type', 'status')
+    readonly_fields = ('_id', 'timestamp')
@@ -0,0 +1,161 @@
+import asyncio
+import atexit
+import logging
+import threading
+import uuid
+from django.conf import settings
+from django.utils import timezone
+from channels.db import database_sync_to_async
+from .models import InterviewMessage
+
+logger = logging.getLogger(__name__)
+
+# Every live buffer in this process, so pending messages can be flushed on shutdown
+_live_buffers = set()
+
+
+class MessageBuffer:
+    """
+    Write-behind buffer for InterviewMessage rows
+    Messages get their id and timestamp in memory so they can be broadcast
+    immediately; rows are persisted with bulk inserts when the buffer reaches
+    its size threshold, on a timer, on close() and at process exit
+    """
+
+    def __init__(self, flush_size=None, flush_interval=None):
+        self.flush_size = flush_size or settings.INTERVIEW_MESSAGE_FLUSH_SIZE
+        self.flush_interval = flush_interval or settings.INTERVIEW_MESSAGE_FLUSH_INTERVAL
+        self._pending = []
+        self._in_flight = []
+        self._lock = threading.Lock()
+        # Held for a whole flush, so a flush waits for one already writing
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        _live_buffers.add(self)
+
+    def start(self):
+        """
+        Start the periodic flush timer on the running event loop
+        """
+        if self._timer is None:
+            self._timer = asyncio.ensure_future(self._run_timer())
+
+    def add(self, interview_id, sender, message_type, content, question_id=None, **extra):
+        """
+        Queue a message for persistence
+
+        Returns:
+            InterviewMessage: Unsaved instance with its final _id and timestamp
+        """
+        message = InterviewMessage(
+            _id=uuid.uuid4(),
+            interview_id=interview_id,
+            sender=sender,
+            message_type=message_type,
+            content=content,
+            question_id=question_id,
+            timestamp=timezone.now(),
+            **extra
+        )
+
+        with self._lock:
+            self._pending.append(message)
+            should_flush = len(self._pending) >= self.flush_size
+
+        if should_flush:
+            asyncio.ensure_future(self.flush())
+
+        return message
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _take_pending(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        return batch
+
+    def holds(self, interview_id):
+        """
+        Whether any message for the interview is pending or being written
+        """
+        interview_id = str(interview_id)
+        with self._lock:
+            messages = self._pending + self._in_flight
+        return any(str(message.interview_id) == interview_id for message in messages)
+
+    def _restore_pending(self, batch):
+        with self._lock:
+            self._pending[:0] = batch
+
+    def flush_sync(self):
+        """
+        Persist all pending messages with a single bulk insert
+        """
+        with self._flush_lock:
+            batch = self._take_pending()
+            if not batch:
+                return 0
+
+            self._in_flight = batch
+            try:
+                InterviewMessage.objects.bulk_create(batch)
+            except Exception:
+                # Keep the messages so the next flush can retry them
+                self._restore_pending(batch)
+                raise
+            finally:
+                self._in_flight = []
+
+        return len(batch)
+
+    async def flush(self):
+        try:
+            return await database_sync_to_async(self.flush_sync)()
+        except Exception:
+            logger.exception('Failed to flush interview messages')
+            return 0
+
+    async def _run_timer(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._pending:
+                await self.flush()
+
+    async def close(self):
+        """
+        Stop the timer and flush everything still pending
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        await self.flush()
+        if not self._pending:
+            _live_buffers.discard(self)
+
+
+async def flush_interview(interview_id):
+    """
+    Flush every live buffer in this process holding messages for an interview
+    A reconnecting client's new connection calls this before reading the
+    interview's history, in case the old connection has not flushed yet
+    """
+    for buffer in list(_live_buffers):
+        if buffer.holds(interview_id):
+            await buffer.flush()
+
+
+def flush_all_buffers():
+    """
+    Synchronously flush every live buffer in this process
+    Registered with atexit so a graceful server shutdown does not lose messages
+    """
+    for buffer in list(_live_buffers):
+        try:
+            buffer.flush_sync()
+        except Exception:
+            logger.exception('Failed to flush interview messages on shutdown')
+
+
+atexit.register(flush_all_buffers)
@@ -0,0 +1,59 @@
+import json
+from functools import lru_cache
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    orjson = None
+
+
+class StdlibJSONCodec:
+    """
+    JSON codec built on the standard library
+    """
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """
+    JSON codec built on orjson (several times faster than the stdlib)
+    Websocket text frames must be str, so the encoded bytes are decoded once
+    """
+    name = 'orjson'
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, default=str).decode()
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+@lru_cache(maxsize=None)
+def get_codec():
+    """
+    Resolve the websocket JSON codec from WEBSOCKET_JSON_CODEC
+    'auto' picks orjson when it is installed
+    """
+    name = settings.WEBSOCKET_JSON_CODEC
+
+    if name == 'orjson' or (name == 'auto' and orjson is not None):
+        if orjson is None:
+            raise ImportError("WEBSOCKET_JSON_CODEC is 'orjson' but orjson is not installed")
+        return OrjsonCodec()
+    return StdlibJSONCodec()
+
+
+def dumps(obj):
+    return get_codec().dumps(obj)
+
+
+def loads(data):
+    return get_codec().loads(data)
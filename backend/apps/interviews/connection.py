@@ -0,0 +1,99 @@
+import time
+from django.utils import timezone
+from .models import ConnectionEvent
+
+
+class ConnectionQualityAggregator:
+    """
+    Aggregates a connection's quality pings in memory
+    Status changes become their own event; pings with an unchanged status
+    are folded into one quality_summary event per flush window
+    """
+
+    def __init__(self, interview_id, flush_interval):
+        self.interview_id = interview_id
+        self.flush_interval = flush_interval
+        self.status = None
+        self._pending = []
+        self._reset_window()
+
+    def _reset_window(self):
+        self._window_start = timezone.now()
+        self._window_started = time.monotonic()
+        self._samples = 0
+        self._quality_counts = {}
+        self._numeric = []
+
+    def record(self, status, quality):
+        """
+        Record one ping
+
+        Returns:
+            bool: True if the status changed and should be flushed promptly
+        """
+        changed = status != self.status
+        if changed:
+            # Close the previous status's window before logging the change
+            self._close_window()
+            self.status = status
+            self._pending.append(ConnectionEvent(
+                interview_id=self.interview_id,
+                event_type='status_change',
+                status=status,
+                details={'quality': quality}
+            ))
+
+        self._samples += 1
+        key = str(quality)
+        self._quality_counts[key] = self._quality_counts.get(key, 0) + 1
+        if isinstance(quality, (int, float)) and not isinstance(quality, bool):
+            self._numeric.append(quality)
+
+        return changed
+
+    def _close_window(self):
+        if self._samples:
+            details = {
+                'window_start': self._window_start.isoformat(),
+                'samples': self._samples,
+                'quality_counts': self._quality_counts
+            }
+            if self._numeric:
+                details['min_quality'] = min(self._numeric)
+                details['max_quality'] = max(self._numeric)
+                details['avg_quality'] = round(sum(self._numeric) / len(self._numeric), 3)
+
+            self._pending.append(ConnectionEvent(
+                interview_id=self.interview_id,
+                event_type='quality_summary',
+                status=self.status,
+                details=details
+            ))
+        self._reset_window()
+
+    def _window_elapsed(self):
+        return time.monotonic() - self._window_started >= self.flush_interval
+
+    def due(self):
+        """
+        Whether there is a status change to log or a full window to summarize
+        """
+        return bool(self._pending) or bool(self._samples and self._window_elapsed())
+
+    def drain(self, final=False):
+        """
+        Return all events to persist, closing the window if it is complete
+        (or unconditionally when final, e.g. on disconnect)
+        """
+        if final or self._window_elapsed():
+            self._close_window()
+        events, self._pending = self._pending, []
+        return events
+
+
+def save_connection_events(events):
+    """
+    Append connection events with a single bulk insert
+    """
+    if events:
+        ConnectionEvent.objects.bulk_create(events)
@@ -1,8 +1,29 @@
-import json
+import asyncio
+import base64
+import logging
+import time
+import uuid
+from collections import deque
+from django.conf import settings
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from .models import Interview, InterviewMessage
-import uuid
+from apps.integrations.services.ai_service import AsyncAIService
+from apps.integrations.services.video_worker_pool import get_video_analysis_pool
+from apps.questions.bank import QuestionBank
+from apps.questions.models import QuestionSet
+from apps.scoring.evaluation import evaluate_interview
+from . import codec
+from .buffers import MessageBuffer, flush_interview
+from .connection import ConnectionQualityAggregator, save_connection_events
+from .media import BackpressureThrottle, LatestFrameQueue
+from .models import InterviewMessage
+from .protocol import MEDIA_AUDIO, MEDIA_VIDEO, decode_media_frame
+from .replay import get_replay_log
+from .session import InterviewSession
+from .speculation import FollowUpSpeculator
+
+logger = logging.getLogger(__name__)
+
 
 class InterviewConsumer(AsyncWebsocketConsumer):
     """
@@ -10,10 +31,62 @@ class InterviewConsumer(AsyncWebsocketConsumer):
     Handles bidirectional communication between AI interviewer and candidate
     """
     
+    # Write-behind buffer used for this connection's messages
+    message_buffer_class = MessageBuffer
+    
     async def connect(self):
         self.interview_id = self.scope['url_route']['kwargs']['interview_id']
         self.room_group_name = f'interview_{self.interview_id}'
         
+        # A previous connection to this interview may still have unwritten messages
+        await flush_interview(self.interview_id)
+        
+        # Load the interview once; handlers work off this session
+        self.session = await self.load_session()
+        if self.session is None:
+            await self.close()
+            return
+        
+        # Messages are persisted write-behind, off the conversational path
+        self.message_buffer = self.message_buffer_class()
+        self.message_buffer.start()
+        
+        # Quality pings are aggregated in memory and flushed periodically
+        self.connection_log = ConnectionQualityAggregator(
+            self.session.interview_id,
+            settings.CONNECTION_LOG_FLUSH_INTERVAL
+        )
+        
+        # The last AI prompt is the question the candidate is answering;
+        # earlier exchanges give follow-ups context (the prompt builder trims them to budget)
+        self.last_question = ''
+        self.transcript = deque(maxlen=settings.INTERVIEW_TRANSCRIPT_TURNS)
+        
+        # Planned questions from the candidate's question set, asked in order;
+        # each one gets up to its max_followups before the next is asked
+        self.questions = deque(await self.load_questions())
+        self.current_question = None
+        self.followups_asked = 0
+        
+        # Follow-ups are drafted from interim answer text while the candidate is still answering
+        self.speculator = None
+        if settings.INTERVIEW_SPECULATIVE_FOLLOW_UPS:
+            self.speculator = FollowUpSpeculator(
+                self.draft_follow_up,
+                pause=settings.INTERVIEW_SPECULATION_PAUSE,
+                min_overlap=settings.INTERVIEW_SPECULATION_MIN_OVERLAP,
+                max_new_words=settings.INTERVIEW_SPECULATION_MAX_NEW_WORDS
+            )
+        
+        # Video analysis runs off a bounded latest-frame-wins queue
+        self.video_queue = None
+        self.video_task = None
+        if self.session.video_analysis_allowed:
+            self.video_queue = LatestFrameQueue(settings.VIDEO_FRAME_QUEUE_SIZE)
+            self.video_backpressure = BackpressureThrottle(settings.VIDEO_BACKPRESSURE_INTERVAL)
+            self.frame_analyses = deque(maxlen=settings.VIDEO_ANALYSIS_HISTORY)
+            self.video_task = asyncio.ensure_future(self.run_video_analysis())
+        
         # Join room group
         await self.channel_layer.group_add(
             self.room_group_name,
@@ -23,11 +96,12 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         await self.accept()
         
         # Send connection confirmation
-        await self.send(text_data=json.dumps({
+        await self.send_frame({
             'type': 'connection_established',
             'interview_id': self.interview_id,
+            'last_seq': await get_replay_log().current(self.session.interview_id),
             'message': 'Connected to interview session'
-        }))
+        })
     
     async def disconnect(self, close_code):
         # Leave room group
@@ -35,12 +109,38 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             self.channel_name
         )
+        
+        video_task = getattr(self, 'video_task', None)
+        if video_task is not None:
+            video_task.cancel()
+            if self.frame_analyses:
+                await self.save_video_summary()
+            if self.video_queue.received:
+                await get_video_analysis_pool().release(self.session.interview_id)
+        
+        speculator = getattr(self, 'speculator', None)
+        if speculator is not None:
+            speculator.close()
+        
+        # Persist anything still buffered for this connection
+        message_buffer = getattr(self, 'message_buffer', None)
+        if message_buffer is not None:
+            await message_buffer.close()
+        
+        connection_log = getattr(self, 'connection_log', None)
+        if connection_log is not None:
+            await self.write_connection_events(connection_log.drain(final=True))
     
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         """
         Receive message from WebSocket
+        Binary frames carry media (see protocol.py); text frames are JSON control messages
         """
-        data = json.loads(text_data)
+        if bytes_data is not None:
+            await self.receive_media(bytes_data)
+            return
+        
+        data = codec.loads(text_data)
         message_type = data.get('type')
         
         if message_type == 'candidate_message':
@@ -55,6 +155,30 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             await self.handle_video_frame(data)
         elif message_type == 'connection_status':
             await self.handle_connection_status(data)
+        elif message_type == 'video_stats':
+            await self.handle_video_stats(data)
+        elif message_type == 'resume':
+            await self.handle_resume(data)
+        elif message_type == 'interim_transcript':
+            await self.handle_interim_transcript(data)
+    
+    async def receive_media(self, bytes_data):
+        """
+        Dispatch a binary media frame without copying its payload
+        """
+        try:
+            frame = decode_media_frame(bytes_data)
+        except ValueError as e:
+            await self.send_frame({
+                'type': 'error',
+                'message': str(e)
+            })
+            return
+        
+        if frame.kind == MEDIA_AUDIO:
+            await self.process_audio(frame.payload, frame.sequence, frame.timestamp_ms)
+        elif frame.kind == MEDIA_VIDEO:
+            await self.process_video_frame(frame.payload, frame.sequence, frame.timestamp_ms)
     
     async def handle_candidate_message(self, data):
         """
@@ -66,43 +190,139 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         message = await self.save_message(
             sender='candidate',
             message_type='answer',
-            content=content
+            content=content,
+            question_id=self.current_question_id
         )
         
         # Broadcast to room
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'interview_message',
-                'sender': 'candidate',
-                'content': content,
-                'message_id': str(message._id),
-                'timestamp': message.timestamp.isoformat()
-            }
-        )
+        await self.broadcast({
+            'type': 'message',
+            'sender': 'candidate',
+            'content': content,
+            'message_id': str(message._id),
+            'timestamp': message.timestamp.isoformat()
+        })
+        
+        if self.question_due():
+            await self.ask_question(self.questions.popleft(), content)
+            return
+        
+        if data.get('stream', settings.INTERVIEW_STREAM_AI_REPLIES):
+            await self.stream_ai_reply(content)
+            return
         
-        # Generate AI response (this would call the AI service)
-        # TODO: Integrate with AIService for intelligent follow-up
         ai_response = await self.generate_ai_response(content)
         
         # Save AI message
         ai_message = await self.save_message(
             sender='ai',
             message_type='followup',
-            content=ai_response
+            content=ai_response,
+            question_id=self.current_question_id
         )
+        self.followups_asked += 1
         
         # Send AI response
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'interview_message',
+        await self.broadcast({
+            'type': 'message',
+            'sender': 'ai',
+            'content': ai_response,
+            'message_id': str(ai_message._id),
+            'timestamp': ai_message.timestamp.isoformat()
+        })
+        self.record_exchange(content, ai_response)
+    
+    async def stream_ai_reply(self, candidate_message):
+        """
+        Stream the AI reply to the room as delta frames, then commit it
+        The commit frame carries the full content and the persisted message id
+        """
+        stream_id = str(uuid.uuid4())
+        chunks = []
+        
+        async for chunk in self.stream_ai_response(candidate_message):
+            # Deltas are ephemeral; the commit frame is what gets replayed
+            await self.broadcast({
+                'type': 'message_delta',
                 'sender': 'ai',
-                'content': ai_response,
-                'message_id': str(ai_message._id),
-                'timestamp': ai_message.timestamp.isoformat()
-            }
+                'stream_id': stream_id,
+                'index': len(chunks),
+                'delta': chunk
+            }, sequenced=False)
+            chunks.append(chunk)
+        
+        ai_response = ''.join(chunks)
+        ai_message = await self.save_message(
+            sender='ai',
+            message_type='followup',
+            content=ai_response,
+            question_id=self.current_question_id
+        )
+        self.followups_asked += 1
+        
+        await self.broadcast({
+            'type': 'message_commit',
+            'sender': 'ai',
+            'stream_id': stream_id,
+            'content': ai_response,
+            'message_id': str(ai_message._id),
+            'timestamp': ai_message.timestamp.isoformat()
+        })
+        self.record_exchange(candidate_message, ai_response)
+    
+    @property
+    def current_question_id(self):
+        return self.current_question._id if self.current_question is not None else None
+    
+    def question_due(self):
+        """
+        Whether the next turn asks a planned question rather than a follow-up
+        """
+        if not self.questions:
+            return False
+        
+        current = self.current_question
+        return current is None or not current.enable_followup or self.followups_asked >= current.max_followups
+    
+    async def ask_question(self, question, candidate_message):
+        """
+        Ask a planned question; the candidate's answers are recorded against it
+        """
+        self.current_question = question
+        self.followups_asked = 0
+        
+        ai_message = await self.save_message(
+            sender='ai',
+            message_type='question',
+            content=question.question_text,
+            question_id=question._id
         )
+        
+        await self.broadcast({
+            'type': 'message',
+            'sender': 'ai',
+            'content': question.question_text,
+            'question_id': str(question._id),
+            'message_id': str(ai_message._id),
+            'timestamp': ai_message.timestamp.isoformat()
+        })
+        self.record_exchange(candidate_message, question.question_text)
+    
+    def record_exchange(self, candidate_message, ai_response):
+        """
+        Move the finished question/answer into the transcript and make the reply current
+        """
+        self.transcript.append(('Interviewer', self.last_question))
+        self.transcript.append(('Candidate', candidate_message))
+        self.last_question = ai_response
+    
+    async def handle_interim_transcript(self, data):
+        """
+        Handle the candidate's answer-in-progress (live speech-to-text or typing)
+        """
+        # No follow-up is needed when the next turn is a planned question
+        if self.speculator is not None and not self.question_due():
+            self.speculator.update(self.last_question, data.get('content', ''))
     
     async def handle_start_interview(self, data):
         """
@@ -119,14 +339,13 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             content=welcome_message
         )
         
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'interview_started',
-                'message': welcome_message,
-                'timestamp': message.timestamp.isoformat()
-            }
-        )
+        self.last_question = welcome_message
+        
+        await self.broadcast({
+            'type': 'interview_started',
+            'message': welcome_message,
+            'timestamp': message.timestamp.isoformat()
+        })
     
     async def handle_end_interview(self, data):
         """
@@ -134,36 +353,156 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         """
         await self.update_interview_status('completed')
         
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'interview_ended',
-                'message': 'Interview session ended. Thank you for your time!'
-            }
-        )
+        await self.broadcast({
+            'type': 'interview_ended',
+            'message': 'Interview session ended. Thank you for your time!'
+        })
+        
+        # Score every answer in the background so the scorecard is ready right away
+        if settings.INTERVIEW_SCORE_ON_END:
+            await self.message_buffer.flush()
+            self.scoring_task = asyncio.ensure_future(self.score_interview())
     
     async def handle_audio_data(self, data):
         """
-        Handle audio data from candidate (for STT processing)
+        Handle base64 audio data sent inside JSON (legacy clients)
         """
-        audio_data = data.get('audio')
+        audio_data = base64.b64decode(data.get('audio') or '')
+        await self.process_audio(memoryview(audio_data), data.get('sequence'), data.get('timestamp'))
+    
+    async def handle_video_frame(self, data):
+        """
+        Handle base64 video frame sent inside JSON (legacy clients)
+        """
+        frame_data = base64.b64decode(data.get('frame') or '')
+        await self.process_video_frame(memoryview(frame_data), data.get('sequence'), data.get('timestamp'))
+    
+    async def process_audio(self, audio, sequence=None, timestamp_ms=None):
+        """
+        Handle raw PCM audio from candidate (for STT processing)
         
+        Args:
+            audio: memoryview over the PCM payload
+            sequence: Client sequence number, if provided
+            timestamp_ms: Client capture time, if provided
+        """
         # TODO: Send to Google Speech-to-Text API
-        # transcribed_text = await self.transcribe_audio(audio_data)
+        # transcribed_text = await self.transcribe_audio(audio)
         
         # For now, echo back
-        await self.send(text_data=json.dumps({
+        await self.send_frame({
             'type': 'audio_processed',
             'status': 'received',
+            'sequence': sequence,
             'message': 'Audio data received for processing'
-        }))
+        })
     
-    async def handle_video_frame(self, data):
+    async def process_video_frame(self, frame, sequence=None, timestamp_ms=None):
         """
-        Handle video frame for analysis (facial expression, body language)
+        Handle raw JPEG video frame for analysis (facial expression, body language)
+        
+        Args:
+            frame: memoryview over the JPEG payload
+            sequence: Client sequence number, if provided
+            timestamp_ms: Client capture time, if provided
         """
-        # TODO: Send to OpenCV/MediaPipe for analysis
-        pass
+        if self.video_queue is None:
+            # Video analysis disabled or not consented for this interview
+            return
+        
+        dropped = self.video_queue.put(frame)
+        
+        # Tell the client to slow down when we are shedding frames
+        if dropped and self.video_backpressure.ready():
+            await self.send_frame({
+                'type': 'backpressure',
+                'stream': 'video',
+                **self.video_queue.stats()
+            })
+    
+    async def run_video_analysis(self):
+        """
+        Analyze queued frames one at a time for the life of the connection
+        """
+        while True:
+            frame = await self.video_queue.get()
+            started = time.monotonic()
+            try:
+                analysis = await get_video_analysis_pool().analyze(self.session.interview_id, frame)
+            except Exception:
+                # A bad frame (or a failing worker) must not end analysis for the connection
+                logger.exception('Video frame analysis failed for interview %s', self.session.interview_id)
+                analysis = None
+            self.video_queue.record_processed(time.monotonic() - started)
+            
+            if analysis is not None:
+                self.frame_analyses.append(analysis)
+    
+    async def save_video_summary(self):
+        """
+        Summarize this connection's frame analyses into the interview's
+        facial expression and body language analysis
+        """
+        try:
+            summary = await get_video_analysis_pool().summarize(
+                self.session.interview_id, list(self.frame_analyses)
+            )
+            if summary is None:
+                return
+            
+            await self.update_interview_analysis(
+                facial_expression_analysis={
+                    'dominant_emotions': [summary['dominant_emotion']],
+                    'engagement_score': summary['overall_engagement'],
+                    'key_moments': summary['key_moments']
+                },
+                body_language_analysis={
+                    'overall_summary': f"Posture: {summary.get('posture_quality', 'unknown')}",
+                    'confidence_score': summary['confidence_score'],
+                    'key_moments': []
+                }
+            )
+        except Exception:
+            logger.exception('Failed to save video analysis for interview %s', self.session.interview_id)
+    
+    async def handle_video_stats(self, data):
+        """
+        Report video frame counters for this connection
+        """
+        stats = self.video_queue.stats() if self.video_queue is not None else None
+        await self.send_frame({
+            'type': 'video_stats',
+            'enabled': self.video_queue is not None,
+            'stats': stats
+        })
+    
+    async def handle_resume(self, data):
+        """
+        Replay the frames a reconnecting client missed
+        The client sends the last seq it saw; frames may overlap with live ones
+        already delivered since reconnecting, so clients drop seqs they have seen
+        """
+        last_seq = int(data.get('last_seq') or 0)
+        frames, current_seq, complete = await get_replay_log().since(self.session.interview_id, last_seq)
+        
+        if not complete:
+            # Part of the gap has been trimmed, or the log was reset since the
+            # client last saw it; the client must resync and refetch over REST
+            await self.send_frame({
+                'type': 'replay_gap',
+                'last_seq': last_seq,
+                'current_seq': current_seq
+            })
+            return
+        
+        for frame in frames:
+            await self.send(text_data=frame)
+        
+        await self.send_frame({
+            'type': 'replay_complete',
+            'replayed': len(frames),
+            'current_seq': current_seq
+        })
     
     async def handle_connection_status(self, data):
         """
@@ -172,94 +511,143 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         status = data.get('status')
         quality = data.get('quality')
         
-        await self.log_connection_event(status, quality)
+        self.connection_log.record(status, quality)
+        if self.connection_log.due():
+            await self.write_connection_events(self.connection_log.drain())
     
-    # Message handlers (called when messages are sent to the group)
-    async def interview_message(self, event):
+    # Outbound frames
+    async def send_frame(self, payload):
         """
-        Receive message from room group and send to WebSocket
+        Encode a frame and send it to this connection only
         """
-        await self.send(text_data=json.dumps({
-            'type': 'message',
-            'sender': event['sender'],
-            'content': event['content'],
-            'message_id': event['message_id'],
-            'timestamp': event['timestamp']
-        }))
+        await self.send(text_data=codec.dumps(payload))
     
-    async def interview_started(self, event):
+    async def broadcast(self, payload, sequenced=True):
         """
-        Handle interview started event
+        Send a frame to everyone in the interview room
+        The frame is encoded once here; every member forwards the same text.
+        Sequenced frames get a per-interview "seq" and are kept in the replay log
         """
-        await self.send(text_data=json.dumps({
-            'type': 'interview_started',
-            'message': event['message'],
-            'timestamp': event['timestamp']
-        }))
+        frame = codec.dumps(payload)
+        if sequenced:
+            _, frame = await get_replay_log().append(self.session.interview_id, frame)
+        
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                'type': 'interview_frame',
+                'frame': frame
+            }
+        )
     
-    async def interview_ended(self, event):
+    # Message handlers (called when messages are sent to the group)
+    async def interview_frame(self, event):
         """
-        Handle interview ended event
+        Receive a pre-encoded frame from room group and send to WebSocket
         """
-        await self.send(text_data=json.dumps({
-            'type': 'interview_ended',
-            'message': event['message']
-        }))
+        await self.send(text_data=event['frame'])
     
     # Database operations
     @database_sync_to_async
-    def save_message(self, sender, message_type, content, question_id=None):
+    def load_session(self):
+        """
+        Load the lightweight interview session for this connection
+        """
+        return InterviewSession.load(self.interview_id)
+    
+    @database_sync_to_async
+    def load_questions(self):
+        """
+        Questions from the candidate's latest question set that this interview has not asked yet
+        """
+        question_set = QuestionSet.objects.filter(
+            job_id=self.session.job_id,
+            candidate_id=self.session.candidate_id,
+            is_template=False
+        ).first()
+        if question_set is None:
+            return []
+        
+        # A reconnecting client picks up after the last question asked
+        asked = set(
+            InterviewMessage.objects.filter(
+                interview_id=self.session.interview_id,
+                sender='ai',
+                message_type='question'
+            ).values_list('question_id', flat=True)
+        )
+        return [question for question in QuestionBank().get_questions(question_set) if question._id not in asked]
+    
+    async def save_message(self, sender, message_type, content, question_id=None):
         """
-        Save message to database
+        Queue message for write-behind persistence
+        The returned message already carries its final id and timestamp
         """
-        interview = Interview.objects.get(_id=self.interview_id)
-        message = InterviewMessage.objects.create(
-            interview=interview,
+        return self.message_buffer.add(
+            interview_id=self.session.interview_id,
             sender=sender,
             message_type=message_type,
             content=content,
             question_id=question_id
         )
-        return message
     
     @database_sync_to_async
     def update_interview_status(self, status):
         """
         Update interview status
         """
-        from django.utils import timezone
-        interview = Interview.objects.get(_id=self.interview_id)
-        interview.status = status
-        
-        if status == 'in_progress' and not interview.started_at:
-            interview.started_at = timezone.now()
-        elif status == 'completed' and not interview.ended_at:
-            interview.ended_at = timezone.now()
-        
-        interview.save()
-        return interview
+        self.session.set_status(status)
+        return self.session
     
     @database_sync_to_async
-    def log_connection_event(self, status, quality):
+    def update_interview_analysis(self, **fields):
         """
-        Log connection quality event
+        Write video analysis summaries to the interview
         """
-        interview = Interview.objects.get(_id=self.interview_id)
-        if not interview.connection_log:
-            interview.connection_log = []
-        
-        from django.utils import timezone
-        interview.connection_log.append({
-            'timestamp': timezone.now().isoformat(),
-            'status': status,
-            'quality': quality
-        })
-        interview.save()
+        self.session.update(**fields)
+    
+    @database_sync_to_async
+    def write_connection_events(self, events):
+        """
+        Append connection events to their own collection
+        """
+        save_connection_events(events)
+    
+    async def score_interview(self):
+        """
+        Batch-evaluate the interview's answers into its InterviewScore
+        Runs as a background task, so failures are logged here rather than lost
+        """
+        try:
+            await evaluate_interview(self.session.interview_id)
+        except Exception:
+            logger.exception('Failed to score interview %s', self.session.interview_id)
     
     async def generate_ai_response(self, candidate_message):
         """
         Generate AI response using LLM
-        TODO: Integrate with OpenAI API
         """
-        # Placeholder response
-        return "That's an interesting point. Can you elaborate more on your experience with that?"
+        chunks = [chunk async for chunk in self.stream_ai_response(candidate_message)]
+        return ''.join(chunks)
+    
+    async def stream_ai_response(self, candidate_message):
+        """
+        Stream the AI follow-up to the candidate's answer chunk by chunk
+        """
+        if self.speculator is not None:
+            draft = await self.speculator.take(self.last_question, candidate_message)
+            if draft is not None:
+                yield draft
+                return
+        
+        ai_service = AsyncAIService()
+        async for chunk in ai_service.stream_follow_up_question(
+            self.last_question, candidate_message, list(self.transcript)
+        ):
+            yield chunk
+    
+    async def draft_follow_up(self, question, answer):
+        """
+        Generate a speculative follow-up for an answer still in progress
+        """
+        return await AsyncAIService().generate_follow_up_question(question, answer, list(self.transcript))
@@ -0,0 +1,341 @@
+import asyncio
+import json
+import os
+import random
+import time
+import tracemalloc
+import uuid
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import re_path
+from channels.layers import InMemoryChannelLayer, channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from apps.integrations.services.llm_backends import get_llm_backend
+from apps.interviews.buffers import MessageBuffer
+from apps.interviews.consumers import InterviewConsumer
+from apps.interviews.protocol import MEDIA_AUDIO, MEDIA_VIDEO, encode_media_frame
+from apps.interviews.replay import get_replay_log
+from apps.interviews.session import InterviewSession
+
+AUDIO_CHUNK_BYTES = 3200  # 100 ms of 16 kHz 16-bit mono PCM
+
+
+class InMemoryStore:
+    """
+    Stand-in for MongoDB: keeps everything the consumer would persist
+    """
+
+    def __init__(self, video_analysis):
+        self.video_analysis = video_analysis
+        self.messages = []
+        self.connection_events = []
+        self.video_summaries = []
+
+
+class InMemoryMessageBuffer(MessageBuffer):
+    store = None
+
+    def flush_sync(self):
+        batch = self._take_pending()
+        self.store.messages.extend(batch)
+        return len(batch)
+
+
+class BenchmarkConsumer(InterviewConsumer):
+    """
+    InterviewConsumer with its database operations redirected to an InMemoryStore
+    """
+    store = None
+    message_buffer_class = InMemoryMessageBuffer
+
+    async def load_session(self):
+        return InterviewSession(
+            interview_id=self.interview_id,
+            enable_video_analysis=self.store.video_analysis,
+            video_analysis_consent=self.store.video_analysis
+        )
+
+    async def load_questions(self):
+        # No question sets in memory; every turn is a follow-up
+        return []
+
+    async def update_interview_status(self, status):
+        self.session.status = status
+        return self.session
+
+    async def write_connection_events(self, events):
+        self.store.connection_events.extend(events)
+
+    async def update_interview_analysis(self, **fields):
+        self.store.video_summaries.append(fields)
+
+    async def score_interview(self):
+        # Interviews only exist in memory; there is nothing to score
+        pass
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Load-test InterviewConsumer with simulated candidates over the in-memory channel layer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=50, help='Concurrent interviews')
+        parser.add_argument('--turns', type=int, default=5, help='Candidate messages per interview')
+        parser.add_argument('--think-time', type=float, default=2.0, help='Mean seconds between candidate messages')
+        parser.add_argument('--audio-rate', type=float, default=10.0, help='Audio chunks per second per candidate (0 to disable)')
+        parser.add_argument('--video-fps', type=float, default=15.0, help='Video frames per second per candidate (0 to disable)')
+        parser.add_argument('--frame-bytes', type=int, default=20000, help='Size of each simulated video frame')
+        parser.add_argument('--ping-interval', type=float, default=5.0, help='Seconds between connection quality pings')
+        parser.add_argument('--video-analysis', action='store_true', help='Run frames through the video analysis pool')
+        parser.add_argument('--store', choices=['memory', 'mongo'], default='memory',
+                            help='Persist to an in-memory stand-in or the configured MongoDB')
+        parser.add_argument('--llm', choices=['stub', 'configured'], default='stub',
+                            help='Simulated LLM timing, or the backend configured in settings')
+        parser.add_argument('--llm-ttft', type=float, default=0.6, help='Stub time to first token (seconds)')
+        parser.add_argument('--llm-tokens-per-second', type=float, default=40.0, help='Stub streaming rate')
+        parser.add_argument('--llm-error-rate', type=float, default=0.0, help='Fraction of stub requests that fail')
+        parser.add_argument('--turn-timeout', type=float, default=60.0, help='Seconds to wait for an AI reply')
+        parser.add_argument('--no-memory', action='store_true', help='Skip tracemalloc (it slows the run down)')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.frame_payload = self._build_frame(options)
+
+        fixtures = None
+        if options['store'] == 'mongo':
+            fixtures = self._create_fixtures(options['candidates'])
+            interview_ids = [str(interview._id) for interview in fixtures['interviews']]
+            consumer = InterviewConsumer
+        else:
+            interview_ids = [str(uuid.uuid4()) for _ in range(options['candidates'])]
+            BenchmarkConsumer.store = InMemoryStore(options['video_analysis'])
+            InMemoryMessageBuffer.store = BenchmarkConsumer.store
+            consumer = BenchmarkConsumer
+
+        self.application = URLRouter([
+            re_path(r'ws/interview/(?P<interview_id>[0-9a-f-]+)/$', consumer.as_asgi()),
+        ])
+
+        # In-memory channel layer and replay log: the run measures this process only
+        channel_layers.set('default', InMemoryChannelLayer())
+        overrides = {'INTERVIEW_REPLAY_BACKEND': 'memory'}
+        if options['llm'] == 'stub':
+            overrides.update(
+                AI_LLM_BACKEND='stub',
+                AI_STUB_TIME_TO_FIRST_TOKEN=options['llm_ttft'],
+                AI_STUB_TOKENS_PER_SECOND=options['llm_tokens_per_second'],
+                AI_STUB_ERROR_RATE=options['llm_error_rate'],
+                AI_STUB_JITTER=0.25,
+                AI_STUB_SEED=options['seed']
+            )
+        try:
+            with override_settings(**overrides):
+                get_replay_log.cache_clear()
+                get_llm_backend.cache_clear()
+                report = asyncio.run(self.run(interview_ids))
+        finally:
+            get_replay_log.cache_clear()
+            get_llm_backend.cache_clear()
+            if fixtures is not None:
+                self._delete_fixtures(fixtures)
+
+        self._print_report(report)
+
+    def _build_frame(self, options):
+        if options['video_analysis']:
+            # A real JPEG, so the analysis pool does actual work
+            import cv2
+            import numpy as np
+
+            image = np.random.default_rng(options['seed']).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+            return cv2.imencode('.jpg', image)[1].tobytes()
+        return os.urandom(options['frame_bytes'])
+
+    def _create_fixtures(self, count):
+        from apps.candidates.models import Candidate
+        from apps.interviews.models import Interview
+        from apps.jobs.models import JobDescription
+
+        job = JobDescription.objects.create(title='Benchmark Engineer', description='Load test fixture')
+        candidates = [
+            Candidate.objects.create(full_name=f'Benchmark Candidate {i}', email=f'bench{i}@example.com')
+            for i in range(count)
+        ]
+        interviews = [
+            Interview.objects.create(
+                job=job,
+                candidate=candidate,
+                enable_video_analysis=self.options['video_analysis'],
+                video_analysis_consent=self.options['video_analysis']
+            )
+            for candidate in candidates
+        ]
+        return {'job': job, 'candidates': candidates, 'interviews': interviews}
+
+    def _delete_fixtures(self, fixtures):
+        # Interviews, messages and connection events cascade from the job
+        fixtures['job'].delete()
+        for candidate in fixtures['candidates']:
+            candidate.delete()
+
+    async def run(self, interview_ids):
+        self.latencies = []
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.failures = 0
+        self.connected = 0
+        self.all_connected = asyncio.Event()
+        self.total = len(interview_ids)
+
+        track_memory = not self.options['no_memory']
+        if track_memory:
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0] if track_memory else 0
+
+        started = time.perf_counter()
+        measure = asyncio.ensure_future(self._measure_memory(baseline)) if track_memory else None
+        await asyncio.gather(*(self.run_candidate(interview_id) for interview_id in interview_ids))
+        elapsed = time.perf_counter() - started
+
+        memory_per_connection = await measure if measure is not None else None
+        if track_memory:
+            tracemalloc.stop()
+
+        return {
+            'candidates': self.total,
+            'turns': len(self.latencies),
+            'failed_turns': self.failures,
+            'elapsed_seconds': round(elapsed, 2),
+            'turn_latency_ms': {
+                name: round(percentile(self.latencies, pct) * 1000, 1) if self.latencies else None
+                for name, pct in (('p50', 50), ('p95', 95), ('p99', 99))
+            },
+            'messages_per_second': round((self.frames_sent + self.frames_received) / elapsed, 1),
+            'frames_sent': self.frames_sent,
+            'frames_received': self.frames_received,
+            'memory_per_connection_kb': memory_per_connection
+        }
+
+    async def _measure_memory(self, baseline):
+        # Measured once every candidate is connected and mid-interview
+        await self.all_connected.wait()
+        current = tracemalloc.get_traced_memory()[0]
+        return round((current - baseline) / self.total / 1024, 1)
+
+    async def run_candidate(self, interview_id):
+        communicator = WebsocketCommunicator(self.application, f'/ws/interview/{interview_id}/')
+        connected, _ = await communicator.connect(timeout=30)
+        if not connected:
+            self.failures += self.options['turns']
+            self._mark_connected()
+            return
+
+        turn_done = asyncio.Event()
+        reader = asyncio.ensure_future(self._read_frames(communicator, turn_done))
+
+        await self._send_json(communicator, {'type': 'start_interview'})
+        self._mark_connected()
+
+        media = []
+        if self.options['audio_rate'] > 0:
+            media.append(asyncio.ensure_future(self._send_media(
+                communicator, MEDIA_AUDIO, bytes(AUDIO_CHUNK_BYTES), self.options['audio_rate']
+            )))
+        if self.options['video_fps'] > 0:
+            media.append(asyncio.ensure_future(self._send_media(
+                communicator, MEDIA_VIDEO, self.frame_payload, self.options['video_fps']
+            )))
+        if self.options['ping_interval'] > 0:
+            media.append(asyncio.ensure_future(self._send_pings(communicator)))
+
+        for turn in range(self.options['turns']):
+            await asyncio.sleep(self.random.expovariate(1 / self.options['think_time']))
+
+            turn_done.clear()
+            sent_at = time.perf_counter()
+            await self._send_json(communicator, {
+                'type': 'candidate_message',
+                'content': f'Answer {turn}: I designed and shipped a service handling real traffic.'
+            })
+            try:
+                await asyncio.wait_for(turn_done.wait(), self.options['turn_timeout'])
+                self.latencies.append(time.perf_counter() - sent_at)
+            except asyncio.TimeoutError:
+                self.failures += 1
+
+        for task in media:
+            task.cancel()
+        await self._send_json(communicator, {'type': 'end_interview'})
+        reader.cancel()
+        await communicator.disconnect()
+
+    def _mark_connected(self):
+        self.connected += 1
+        if self.connected == self.total:
+            self.all_connected.set()
+
+    async def _read_frames(self, communicator, turn_done):
+        while True:
+            output = await communicator.output_queue.get()
+            if output.get('type') != 'websocket.send':
+                continue
+
+            self.frames_received += 1
+            text = output.get('text')
+            if not text:
+                continue
+
+            frame = json.loads(text)
+            # An AI reply is complete on its commit (streaming) or full message
+            if frame.get('sender') == 'ai' and frame.get('type') in ('message_commit', 'message'):
+                turn_done.set()
+
+    async def _send_json(self, communicator, payload):
+        self.frames_sent += 1
+        await communicator.send_to(text_data=json.dumps(payload))
+
+    async def _send_media(self, communicator, kind, payload, rate):
+        sequence = 0
+        interval = 1 / rate
+        while True:
+            sequence += 1
+            self.frames_sent += 1
+            frame = encode_media_frame(kind, sequence, int(time.time() * 1000), payload)
+            await communicator.send_to(bytes_data=frame)
+            await asyncio.sleep(interval)
+
+    async def _send_pings(self, communicator):
+        while True:
+            await asyncio.sleep(self.options['ping_interval'])
+            await self._send_json(communicator, {
+                'type': 'connection_status',
+                'status': 'connected',
+                'quality': round(self.random.uniform(0.6, 1.0), 2)
+            })
+
+    def _print_report(self, report):
+        if self.options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        latency = report['turn_latency_ms']
+        self.stdout.write(f"Candidates:           {report['candidates']}")
+        self.stdout.write(f"Turns completed:      {report['turns']} ({report['failed_turns']} failed)")
+        self.stdout.write(f"Elapsed:              {report['elapsed_seconds']} s")
+        self.stdout.write(f"Turn latency p50:     {latency['p50']} ms")
+        self.stdout.write(f"Turn latency p95:     {latency['p95']} ms")
+        self.stdout.write(f"Turn latency p99:     {latency['p99']} ms")
+        self.stdout.write(f"Messages per second:  {report['messages_per_second']}")
+        if report['memory_per_connection_kb'] is not None:
+            self.stdout.write(f"Memory per connection: {report['memory_per_connection_kb']} KB")
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from collections import deque
+
+
+class LatestFrameQueue:
+    """
+    Bounded per-connection queue for video frames
+    When the queue is full a new frame evicts the oldest unprocessed one, so
+    memory stays fixed and analysis never lags more than maxsize frames
+    behind the client, however fast it sends
+    """
+
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self._frames = deque()
+        self._ready = asyncio.Event()
+
+        # Counters
+        self.received = 0
+        self.dropped = 0
+        self.processed = 0
+
+        # Moving average of analysis time, used for the backpressure hint
+        self.avg_processing_seconds = None
+
+    def __len__(self):
+        return len(self._frames)
+
+    def put(self, frame):
+        """
+        Enqueue a frame, dropping the oldest one if the queue is full
+
+        Returns:
+            bool: True if a frame was dropped to make room
+        """
+        self.received += 1
+        dropped = False
+
+        if len(self._frames) >= self.maxsize:
+            self._frames.popleft()
+            self.dropped += 1
+            dropped = True
+
+        self._frames.append(frame)
+        self._ready.set()
+        return dropped
+
+    async def get(self):
+        """
+        Wait for and return the oldest queued frame
+        Queued frames are analyzed in order; put() already keeps only the newest maxsize
+        """
+        while not self._frames:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._frames.popleft()
+
+    def record_processed(self, seconds):
+        """
+        Record how long one frame took to analyze
+        """
+        self.processed += 1
+        if self.avg_processing_seconds is None:
+            self.avg_processing_seconds = seconds
+        else:
+            self.avg_processing_seconds = 0.8 * self.avg_processing_seconds + 0.2 * seconds
+
+    def suggested_fps(self):
+        """
+        Frame rate the analysis pipeline can currently keep up with
+        """
+        if not self.avg_processing_seconds:
+            return None
+        return max(1, int(1 / self.avg_processing_seconds))
+
+    def stats(self):
+        return {
+            'received_frames': self.received,
+            'dropped_frames': self.dropped,
+            'processed_frames': self.processed,
+            'queued_frames': len(self._frames),
+            'suggested_fps': self.suggested_fps()
+        }
+
+
+class BackpressureThrottle:
+    """
+    Rate-limits backpressure hints so a flooding client gets one every
+    interval seconds rather than one per dropped frame
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._last_sent = 0.0
+
+    def ready(self):
+        now = time.monotonic()
+        if now - self._last_sent < self.interval:
+            return False
+        self._last_sent = now
+        return True
@@ -1,5 +1,6 @@
 from djongo import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 import uuid
 from apps.jobs.models import JobDescription
 from apps.candidates.models import Candidate
@@ -84,6 +85,7 @@ class Interview(models.Model):
     # {dominant_emotions, engagement_score, key_moments: [{timestamp, emotion, intensity}]}
     
     # Connection quality
+    # Legacy; new events are appended to ConnectionEvent instead
     connection_log = models.JSONField(default=list, blank=True, null=True)
     # [{timestamp, event_type, details}]
     
@@ -133,7 +135,8 @@ class InterviewMessage(models.Model):
     question_id = models.UUIDField(null=True, blank=True)  # Reference to Question model
     
     # Timing
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Assigned in memory when the message is buffered (see buffers.MessageBuffer)
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     audio_duration_seconds = models.FloatField(null=True, blank=True)
     
     # For voice interviews
@@ -150,3 +153,34 @@ class InterviewMessage(models.Model):
     
     def __str__(self):
         return f"{self.sender}: {self.content[:50]}..."
+
+
+class ConnectionEvent(models.Model):
+    """
+    Connection events for an interview, stored as their own time-ordered
+    collection so each event is a single insert rather than a rewrite of the
+    Interview document
+    """
+    _id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='connection_events')
+    
+    event_type = models.CharField(
+        max_length=20,
+        choices=[
+            ('status_change', 'Status Change'),
+            ('quality_summary', 'Quality Summary')
+        ]
+    )
+    status = models.CharField(max_length=50, blank=True, null=True)
+    
+    details = models.JSONField(default=dict, blank=True, null=True)
+    # quality_summary: {window_start, samples, quality_counts, min_quality, max_quality, avg_quality}
+    
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    class Meta:
+        db_table = 'interview_connection_events'
+        ordering = ['timestamp']
+    
+    def __str__(self):
+        return f"{self.event_type}: {self.status} at {self.timestamp}"
@@ -0,0 +1,80 @@
+"""
+Binary websocket protocol for interview media
+
+Audio and video are sent as binary frames instead of base64 inside JSON.
+Each frame starts with a fixed 14-byte big-endian header followed by the raw
+payload (16-bit PCM for audio, JPEG for video):
+
+    version    uint8   protocol version (currently 1)
+    kind       uint8   1 = audio_data, 2 = video_frame
+    sequence   uint32  per-stream sequence number set by the client
+    timestamp  uint64  client capture time in milliseconds since the epoch
+
+Control messages stay JSON text frames.
+"""
+import struct
+
+PROTOCOL_VERSION = 1
+
+MEDIA_FRAME_HEADER = struct.Struct('!BBIQ')
+
+MEDIA_AUDIO = 1
+MEDIA_VIDEO = 2
+
+MEDIA_KINDS = {
+    MEDIA_AUDIO: 'audio_data',
+    MEDIA_VIDEO: 'video_frame',
+}
+
+
+class MediaFrame:
+    """
+    A decoded binary media frame
+    The payload is a memoryview into the received bytes, never a copy
+    """
+
+    __slots__ = ('kind', 'sequence', 'timestamp_ms', 'payload')
+
+    def __init__(self, kind, sequence, timestamp_ms, payload):
+        self.kind = kind
+        self.sequence = sequence
+        self.timestamp_ms = timestamp_ms
+        self.payload = payload
+
+    @property
+    def message_type(self):
+        return MEDIA_KINDS[self.kind]
+
+
+def decode_media_frame(data):
+    """
+    Decode a binary media frame
+
+    Args:
+        data: Raw bytes received on the websocket
+
+    Returns:
+        MediaFrame
+
+    Raises:
+        ValueError: If the header is truncated, or the version or kind is unknown
+    """
+    if len(data) < MEDIA_FRAME_HEADER.size:
+        raise ValueError('Media frame is shorter than its header')
+
+    version, kind, sequence, timestamp_ms = MEDIA_FRAME_HEADER.unpack_from(data)
+
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f'Unsupported media protocol version: {version}')
+    if kind not in MEDIA_KINDS:
+        raise ValueError(f'Unknown media frame kind: {kind}')
+
+    payload = memoryview(data)[MEDIA_FRAME_HEADER.size:]
+    return MediaFrame(kind, sequence, timestamp_ms, payload)
+
+
+def encode_media_frame(kind, sequence, timestamp_ms, payload):
+    """
+    Encode a binary media frame (the inverse of decode_media_frame)
+    """
+    return MEDIA_FRAME_HEADER.pack(PROTOCOL_VERSION, kind, sequence, timestamp_ms) + bytes(payload)
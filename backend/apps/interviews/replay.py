@@ -0,0 +1,125 @@
+from collections import deque
+from functools import lru_cache
+from django.conf import settings
+
+# Assigns the next sequence number and appends the frame in one atomic step.
+# The frame arrives already encoded; the sequence number is spliced in as the
+# first key so the JSON is never decoded and re-encoded.
+APPEND_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+local frame = '{"seq":' .. seq .. ',' .. string.sub(ARGV[1], 2)
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], seq .. '-0', 'frame', frame)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return {seq, frame}
+"""
+
+
+def with_sequence(seq, frame):
+    """
+    Prefix an encoded JSON object frame with its sequence number
+    """
+    return '{"seq":%d,%s' % (seq, frame[1:])
+
+
+class RedisReplayLog:
+    """
+    Bounded per-interview replay log on Redis Streams
+    Every sequenced frame gets a monotonic per-interview number (also used as
+    its stream entry id), so a reconnecting client can fetch only what it missed
+    """
+
+    def __init__(self, url, maxlen, ttl):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self._append = self.client.register_script(APPEND_SCRIPT)
+
+    def _keys(self, interview_id):
+        return f'interview:{interview_id}:seq', f'interview:{interview_id}:frames'
+
+    async def append(self, interview_id, frame):
+        """
+        Sequence and store an encoded frame
+
+        Returns:
+            tuple: (seq, frame with its "seq" field)
+        """
+        seq, frame = await self._append(keys=self._keys(interview_id), args=[frame, self.maxlen, self.ttl])
+        return int(seq), frame
+
+    async def current(self, interview_id):
+        seq_key, _ = self._keys(interview_id)
+        return int(await self.client.get(seq_key) or 0)
+
+    async def since(self, interview_id, last_seq):
+        """
+        Frames after last_seq
+
+        Returns:
+            tuple: (frames, current_seq, complete) where complete is False if
+            some of the missed frames have already been trimmed from the log
+        """
+        seq_key, stream_key = self._keys(interview_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.get(seq_key)
+            pipe.xrange(stream_key, min=f'{last_seq + 1}-0', max='+')
+            current, entries = await pipe.execute()
+
+        current = int(current or 0)
+        frames = [fields['frame'] for _, fields in entries]
+        first_seq = int(entries[0][0].split('-')[0]) if entries else current + 1
+        # A last_seq beyond the counter means the log was lost (expired keys, a
+        # Redis restart); the client's seqs are stale and it must resync
+        complete = last_seq <= current and (last_seq == current or first_seq == last_seq + 1)
+        return frames, current, complete
+
+
+class MemoryReplayLog:
+    """
+    In-process replay log for development, tests and benchmarks
+    Only correct with a single server process
+    """
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self._logs = {}
+
+    def _log(self, interview_id):
+        log = self._logs.get(interview_id)
+        if log is None:
+            log = self._logs[interview_id] = {'seq': 0, 'frames': deque(maxlen=self.maxlen)}
+        return log
+
+    async def append(self, interview_id, frame):
+        log = self._log(interview_id)
+        log['seq'] += 1
+        frame = with_sequence(log['seq'], frame)
+        log['frames'].append((log['seq'], frame))
+        return log['seq'], frame
+
+    async def current(self, interview_id):
+        return self._log(interview_id)['seq']
+
+    async def since(self, interview_id, last_seq):
+        log = self._log(interview_id)
+        entries = [(seq, frame) for seq, frame in log['frames'] if seq > last_seq]
+        first_seq = entries[0][0] if entries else log['seq'] + 1
+        complete = last_seq <= log['seq'] and (last_seq == log['seq'] or first_seq == last_seq + 1)
+        return [frame for _, frame in entries], log['seq'], complete
+
+
+@lru_cache(maxsize=None)
+def get_replay_log():
+    """
+    Return this process's replay log, as configured by INTERVIEW_REPLAY_BACKEND
+    """
+    if settings.INTERVIEW_REPLAY_BACKEND == 'memory':
+        return MemoryReplayLog(settings.INTERVIEW_REPLAY_MAXLEN)
+    return RedisReplayLog(
+        settings.REDIS_URL,
+        settings.INTERVIEW_REPLAY_MAXLEN,
+        settings.INTERVIEW_REPLAY_TTL
+    )
@@ -0,0 +1,84 @@
+from django.utils import timezone
+from .models import Interview
+
+
+class InterviewSession:
+    """
+    Lightweight per-connection view of an Interview
+    Loaded once when the websocket connects so message handlers never refetch
+    the full Interview document (transcript and analysis blobs included)
+    """
+
+    # Only the columns the consumer actually needs on the hot path
+    FIELDS = (
+        '_id', 'job_id', 'candidate_id', 'status', 'interview_type',
+        'started_at', 'ended_at', 'enable_video_analysis',
+        'video_analysis_consent', 'enable_recording', 'enable_captions',
+        'fallback_mode_used'
+    )
+
+    def __init__(self, interview_id, job_id=None, candidate_id=None, status='scheduled',
+                 interview_type='chat', started_at=None, ended_at=None,
+                 enable_video_analysis=True, video_analysis_consent=False,
+                 enable_recording=True, enable_captions=True, fallback_mode_used=False):
+        self.interview_id = interview_id
+        self.job_id = job_id
+        self.candidate_id = candidate_id
+        self.status = status
+        self.interview_type = interview_type
+        self.started_at = started_at
+        self.ended_at = ended_at
+        self.enable_video_analysis = enable_video_analysis
+        self.video_analysis_consent = video_analysis_consent
+        self.enable_recording = enable_recording
+        self.enable_captions = enable_captions
+        self.fallback_mode_used = fallback_mode_used
+
+    @classmethod
+    def load(cls, interview_id):
+        """
+        Load the session from a single projected query
+
+        Args:
+            interview_id: Interview primary key
+
+        Returns:
+            InterviewSession, or None if the interview does not exist
+        """
+        row = Interview.objects.filter(_id=interview_id).values(*cls.FIELDS).first()
+        if row is None:
+            return None
+
+        row['interview_id'] = row.pop('_id')
+        return cls(**row)
+
+    @property
+    def video_analysis_allowed(self):
+        return self.enable_video_analysis and self.video_analysis_consent
+
+    def update(self, **fields):
+        """
+        Persist only the given fields and mirror them on the session
+        Uses a targeted UPDATE instead of a full document save
+        """
+        Interview.objects.filter(_id=self.interview_id).update(
+            updated_at=timezone.now(),
+            **fields
+        )
+
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def set_status(self, status):
+        """
+        Move the interview to a new status, stamping start/end times once
+        """
+        fields = {'status': status}
+        now = timezone.now()
+
+        if status == 'in_progress' and not self.started_at:
+            fields['started_at'] = now
+        elif status == 'completed' and not self.ended_at:
+            fields['ended_at'] = now
+
+        self.update(**fields)
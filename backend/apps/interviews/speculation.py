@@ -0,0 +1,165 @@
+import asyncio
+import re
+import time
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def answer_words(text):
+    return _WORD_PATTERN.findall((text or '').lower())
+
+
+def answer_changed(draft, final, min_overlap, max_new_words):
+    """
+    Whether the final answer differs materially from the draft a speculation used
+    Small tails ("...and that's it") and minor edits are tolerated
+    """
+    draft_words = answer_words(draft)
+    final_words = answer_words(final)
+    if not draft_words:
+        return True
+
+    draft_set = set(draft_words)
+    final_set = set(final_words)
+    overlap = len(draft_set & final_set) / len(draft_set | final_set)
+    new_words = len([word for word in final_words if word not in draft_set])
+    return overlap < min_overlap or new_words > max_new_words
+
+
+class SpeculationStats:
+    """
+    Process-wide counters for speculative follow-up generation
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+        self.saved_ms = 0.0
+
+    def record_hit(self, saved_ms):
+        self.hits += 1
+        self.saved_ms += saved_ms
+
+    def snapshot(self):
+        resolved = self.hits + self.misses
+        return {
+            'started': self.started,
+            'hits': self.hits,
+            'misses': self.misses,
+            'cancelled': self.cancelled,
+            'hit_rate': round(self.hits / resolved, 3) if resolved else None,
+            'saved_ms_total': round(self.saved_ms, 1),
+            'saved_ms_per_hit': round(self.saved_ms / self.hits, 1) if self.hits else None
+        }
+
+
+speculation_stats = SpeculationStats()
+
+
+class FollowUpSpeculator:
+    """
+    Drafts the follow-up question while the candidate is still answering
+    Each interim transcript update restarts a pause timer; once the candidate
+    pauses, a follow-up is generated in the background for the answer so far.
+    The final answer then takes the draft if it has not materially changed,
+    and otherwise the draft is cancelled and the caller generates afresh
+
+    generate is an async callable (question, answer) -> follow-up text
+    """
+
+    def __init__(self, generate, pause, min_overlap, max_new_words, stats=speculation_stats):
+        self.generate = generate
+        self.pause = pause
+        self.min_overlap = min_overlap
+        self.max_new_words = max_new_words
+        self.stats = stats
+        self._timer = None
+        self._draft = None
+        self._draft_answer = ''
+        self._draft_question = ''
+        self._started_at = 0.0
+        self._finished_at = None
+
+    def update(self, question, interim_answer):
+        """
+        Record interim answer text; drafting starts after the pause
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.ensure_future(self._speculate_after_pause(question, interim_answer))
+
+    async def _speculate_after_pause(self, question, interim_answer):
+        await asyncio.sleep(self.pause)
+        self._timer = None
+
+        # Still drafting for the same answer; let it finish
+        if self._draft is not None and self._draft_answer == interim_answer:
+            return
+        self._cancel_draft()
+
+        self.stats.started += 1
+        self._draft_question = question
+        self._draft_answer = interim_answer
+        self._started_at = time.perf_counter()
+        self._finished_at = None
+        self._draft = asyncio.ensure_future(self.generate(question, interim_answer))
+        self._draft.add_done_callback(self._mark_finished)
+
+    def _mark_finished(self, task):
+        # A superseded draft's callback can fire after the next draft started;
+        # once take() holds the draft, an unset time means it finished after the take
+        if task is not self._draft or task.cancelled():
+            return
+        self._finished_at = time.perf_counter()
+
+    def _cancel_draft(self):
+        if self._draft is not None:
+            if not self._draft.done():
+                self._draft.cancel()
+                self.stats.cancelled += 1
+            self._draft = None
+
+    async def take(self, question, final_answer):
+        """
+        Return the drafted follow-up for the final answer, or None on a miss
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        draft = self._draft
+        if draft is None:
+            return None
+        self._draft = None
+
+        if question != self._draft_question or answer_changed(
+            self._draft_answer, final_answer, self.min_overlap, self.max_new_words
+        ):
+            self.stats.misses += 1
+            if not draft.done():
+                draft.cancel()
+                self.stats.cancelled += 1
+            return None
+
+        taken_at = time.perf_counter()
+        try:
+            follow_up = await draft
+        except Exception:
+            self.stats.misses += 1
+            return None
+
+        # Generation time that elapsed before the final answer arrived
+        finished_at = self._finished_at or time.perf_counter()
+        self.stats.record_hit((min(taken_at, finished_at) - self._started_at) * 1000)
+        return follow_up
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._cancel_draft()
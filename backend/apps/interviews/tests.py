@@ -0,0 +1,137 @@
+import asyncio
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import TransactionTestCase, override_settings
+from apps.candidates.models import Candidate
+from apps.integrations.services.llm_backends import get_llm_backend
+from apps.jobs.models import JobDescription
+from apps.questions.models import Question, QuestionSet
+from apps.scoring.models import InterviewScore
+from .models import Interview, InterviewMessage
+from .replay import get_replay_log
+from .routing import websocket_urlpatterns
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    INTERVIEW_REPLAY_BACKEND='memory',
+    INTERVIEW_SPECULATIVE_FOLLOW_UPS=False,
+    INTERVIEW_SCORE_ON_END=True,
+    AI_LLM_BACKEND='stub',
+    ANSWER_CACHE_ENABLED=False
+)
+class InterviewScoringTests(TransactionTestCase):
+    """
+    An interview driven over the websocket ends with every answered question scored
+    """
+
+    def setUp(self):
+        get_replay_log.cache_clear()
+        get_llm_backend.cache_clear()
+
+        job = JobDescription.objects.create(title='Backend Engineer', description='Builds APIs')
+        candidate = Candidate.objects.create(full_name='Test Candidate', email='candidate@example.com')
+        self.questions = [
+            Question.objects.create(
+                job=job,
+                candidate=candidate,
+                question_text='How do you make an API idempotent?',
+                question_type='technical',
+                expected_answer_points=['idempotency keys', 'retries are safe'],
+                max_followups=1,
+                order=0
+            ),
+            Question.objects.create(
+                job=job,
+                candidate=candidate,
+                question_text='Tell me about a production incident you handled.',
+                question_type='behavioral',
+                expected_answer_points=['root cause', 'postmortem'],
+                max_followups=0,
+                order=1
+            ),
+        ]
+        QuestionSet.objects.create(
+            name='Backend Engineer - Test Candidate',
+            job_role=job.title,
+            job=job,
+            candidate=candidate,
+            questions=[str(question._id) for question in self.questions]
+        )
+        self.interview = Interview.objects.create(job=job, candidate=candidate)
+
+    def tearDown(self):
+        get_replay_log.cache_clear()
+        get_llm_backend.cache_clear()
+
+    async def receive_until(self, communicator, frame_type, sender=None):
+        while True:
+            frame = await communicator.receive_json_from(timeout=5)
+            if frame.get('type') == frame_type and (sender is None or frame.get('sender') == sender):
+                return frame
+
+    async def answer(self, communicator, content):
+        await communicator.send_json_to({'type': 'candidate_message', 'content': content, 'stream': False})
+        return await self.receive_until(communicator, 'message', sender='ai')
+
+    @database_sync_to_async
+    def get_score(self):
+        return InterviewScore.objects.filter(interview_id=self.interview._id).first()
+
+    @database_sync_to_async
+    def get_messages(self):
+        return list(
+            InterviewMessage.objects.filter(interview_id=self.interview._id)
+            .order_by('timestamp')
+            .values('sender', 'message_type', 'question_id')
+        )
+
+    async def test_end_interview_scores_each_answered_question(self):
+        application = URLRouter(websocket_urlpatterns)
+        communicator = WebsocketCommunicator(application, f'/ws/interview/{self.interview._id}/')
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        await self.receive_until(communicator, 'connection_established')
+
+        await communicator.send_json_to({'type': 'start_interview'})
+        await self.receive_until(communicator, 'interview_started')
+
+        first, second = self.questions
+        reply = await self.answer(communicator, 'Ready.')
+        self.assertEqual(reply['question_id'], str(first._id))
+
+        reply = await self.answer(communicator, 'Clients send an idempotency key so retries are safe.')
+        self.assertNotIn('question_id', reply)  # Follow-up on the first question
+
+        reply = await self.answer(communicator, 'The key maps to the stored response.')
+        self.assertEqual(reply['question_id'], str(second._id))
+
+        reply = await self.answer(communicator, 'We found the root cause and wrote a postmortem.')
+        self.assertNotIn('question_id', reply)  # Set exhausted; follow-ups continue
+
+        await communicator.send_json_to({'type': 'end_interview'})
+        await self.receive_until(communicator, 'interview_ended')
+
+        score = None
+        for _ in range(50):
+            score = await self.get_score()
+            if score is not None:
+                break
+            await asyncio.sleep(0.1)
+        await communicator.disconnect()
+
+        self.assertIsNotNone(score)
+        self.assertEqual(
+            {entry['question_id'] for entry in score.question_scores},
+            {str(first._id), str(second._id)}
+        )
+
+        messages = await self.get_messages()
+        answers = [message for message in messages if message['sender'] == 'candidate']
+        self.assertIsNone(answers[0]['question_id'])  # "Ready." answers the welcome message
+        self.assertTrue(all(message['question_id'] for message in answers[1:]))
+        self.assertEqual(
+            [message['question_id'] for message in messages if message['message_type'] == 'question'],
+            [first._id, second._id]
+        )
@@ -2,5 +2,5 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
-    # Will be populated with interview endpoints
+    path('metrics/speculation/', views.speculation_metrics, name='speculation-metrics'),
 ]
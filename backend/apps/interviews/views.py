@@ -1,4 +1,14 @@
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from .speculation import speculation_stats
 
-# Interview views will be added here
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def speculation_metrics(request):
+    """
+    Speculative follow-up generation counters for this server process
+    GET /api/interviews/metrics/speculation/
+    """
+    return Response(speculation_stats.snapshot())
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.integrations.services.skill_matcher import get_skill_matcher
 from .models import JobDescription
 
 class JobDescriptionSerializer(serializers.ModelSerializer):
@@ -11,3 +12,10 @@ class JobDescriptionCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobDescription
         exclude = ('_id', 'created_at', 'updated_at', 'created_by')
+    
+    def validate_required_skills(self, value):
+        # Store canonical names so "k8s" and "Kubernetes" match the same CV skill
+        return get_skill_matcher().normalize(value)
+    
+    def validate_nice_to_have_skills(self, value):
+        return get_skill_matcher().normalize(value)
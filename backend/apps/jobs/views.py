@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from .models import JobDescription
 from .serializers import JobDescriptionSerializer, JobDescriptionCreateSerializer
 from apps.integrations.services.ai_service import AIService
+from apps.integrations.services.skill_matcher import get_skill_matcher
 
 class JobDescriptionViewSet(viewsets.ModelViewSet):
     """
@@ -27,10 +28,12 @@ class JobDescriptionViewSet(viewsets.ModelViewSet):
         """
         Generate a complete JD from just a job title using AI
         POST /api/jobs/generate_from_title/
-        Body: {"title": "Java Developer", "company": "Tech Corp"}
+        Body: {"title": "Java Developer", "company": "Tech Corp", "refresh": false}
+        Set "refresh" to bypass the generation cache
         """
         job_title = request.data.get('title')
         company = request.data.get('company', '')
+        refresh = str(request.data.get('refresh', '')).lower() in ('1', 'true', 'yes')
         
         if not job_title:
             return Response(
@@ -40,9 +43,12 @@ class JobDescriptionViewSet(viewsets.ModelViewSet):
         
         try:
             ai_service = AIService()
-            jd_data = ai_service.generate_job_description(job_title, company)
+            jd_data = ai_service.generate_job_description(job_title, company, use_cache=not refresh)
             
             # Create the JD
+            matcher = get_skill_matcher()
+            jd_data['required_skills'] = matcher.normalize(jd_data.get('required_skills'))
+            jd_data['nice_to_have_skills'] = matcher.normalize(jd_data.get('nice_to_have_skills'))
             jd_data['created_by'] = request.user
             jd_data['ai_generated'] = True
             jd = JobDescription.objects.create(**jd_data)
@@ -0,0 +1,145 @@
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from apps.integrations.services.ai_service import AIService, resolve_difficulty
+from .models import Question, QuestionSet
+
+
+class QuestionBank:
+    """
+    Reusable question bank on top of Question and QuestionSet
+    The candidate-independent questions for a (job, difficulty) are generated
+    once and stored as a template QuestionSet; each candidate's set reuses them
+    and only the personalized questions need a fresh LLM call
+    """
+
+    def __init__(self, ai_service=None):
+        self.ai_service = ai_service or AIService()
+
+    def _create_questions(self, job, question_data, candidate=None, start_order=0):
+        questions = [
+            Question(
+                job=job,
+                candidate=candidate,
+                question_text=data['question_text'],
+                question_type=data.get('question_type', 'technical'),
+                difficulty=data.get('difficulty', 'medium'),
+                expected_answer_points=data.get('expected_answer_points', []),
+                skills_tested=data.get('skills_tested', []),
+                max_score=data.get('max_score', 10.0),
+                order=start_order + i,
+                ai_generated=True
+            )
+            for i, data in enumerate(question_data)
+        ]
+        Question.objects.bulk_create(questions)
+        return questions
+
+    def _find_template(self, job, difficulty):
+        template = QuestionSet.objects.filter(job=job, difficulty=difficulty, is_template=True).first()
+
+        # A JD edited after the template was built invalidates it
+        if template is not None and job.updated_at and template.updated_at < job.updated_at:
+            return None
+        return template
+
+    def get_or_create_template(self, job, difficulty):
+        """
+        Return the bank template for (job, difficulty), generating it on first use
+
+        Args:
+            job: JobDescription model instance
+            difficulty: 'easy', 'medium' or 'hard'
+
+        Returns:
+            QuestionSet: Template set whose questions are shared by all candidates
+        """
+        template = self._find_template(job, difficulty)
+        if template is not None:
+            return template
+
+        # Only one process generates a given template; others wait for it
+        lock = caches['shared']
+        lock_key = f'question_bank_lock:{job._id}:{difficulty}'
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.QUESTION_BANK_LOCK_TIMEOUT
+        acquired = lock.add(lock_key, token, settings.QUESTION_BANK_LOCK_TIMEOUT)
+        while not acquired:
+            if time.monotonic() > deadline:
+                # The holder is taking too long; generate without the lock
+                # and leave its lock alone
+                break
+            time.sleep(0.5)
+            template = self._find_template(job, difficulty)
+            if template is not None:
+                return template
+            acquired = lock.add(lock_key, token, settings.QUESTION_BANK_LOCK_TIMEOUT)
+
+        try:
+            template = self._find_template(job, difficulty)
+            if template is not None:
+                return template
+
+            question_data = self.ai_service.generate_bank_questions(
+                job, difficulty, count=settings.QUESTION_BANK_SIZE
+            )
+            questions = self._create_questions(job, question_data)
+
+            # Retire any stale template for this slot
+            QuestionSet.objects.filter(job=job, difficulty=difficulty, is_template=True).update(is_template=False)
+
+            return QuestionSet.objects.create(
+                name=f"{job.title} ({difficulty}) question bank",
+                job_role=job.title,
+                job=job,
+                difficulty=difficulty,
+                questions=[str(question._id) for question in questions],
+                is_template=True
+            )
+        finally:
+            # Only release our own lock; it may have expired and been taken over
+            if acquired and lock.get(lock_key) == token:
+                lock.delete(lock_key)
+
+    def assemble_for_candidate(self, job, candidate, difficulty='auto'):
+        """
+        Build a candidate's question set from the bank plus personalized questions
+
+        Args:
+            job: JobDescription model instance
+            candidate: Candidate model instance
+            difficulty: 'easy', 'medium', 'hard', or 'auto'
+
+        Returns:
+            QuestionSet: The candidate's set, bank questions first
+        """
+        difficulty = resolve_difficulty(candidate, difficulty)
+        template = self.get_or_create_template(job, difficulty)
+
+        personalized_data = self.ai_service.generate_personalized_questions(
+            job, candidate, difficulty, count=settings.QUESTION_BANK_PERSONALIZED_COUNT
+        )
+        personalized = self._create_questions(
+            job, personalized_data, candidate=candidate, start_order=len(template.questions)
+        )
+
+        return QuestionSet.objects.create(
+            name=f"{job.title} - {candidate.full_name}",
+            job_role=job.title,
+            job=job,
+            candidate=candidate,
+            difficulty=difficulty,
+            questions=template.questions + [str(question._id) for question in personalized],
+            is_template=False
+        )
+
+    def get_questions(self, question_set):
+        """
+        Load a set's Question objects in set order
+        """
+        by_id = {
+            str(question._id): question
+            for question in Question.objects.filter(_id__in=question_set.questions)
+        }
+        return [by_id[question_id] for question_id in question_set.questions if question_id in by_id]
@@ -76,6 +76,12 @@ class QuestionSet(models.Model):
     description = models.TextField(blank=True, null=True)
     job_role = models.CharField(max_length=200)
     
+    # Question bank: templates are shared per (job, difficulty); candidate sets
+    # combine a template's questions with the candidate's personalized ones
+    job = models.ForeignKey(JobDescription, on_delete=models.CASCADE, related_name='question_sets', null=True, blank=True)
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='question_sets', null=True, blank=True)
+    difficulty = models.CharField(max_length=20, blank=True, null=True)
+    
     questions = models.JSONField(default=list)  # List of question IDs
     
     is_template = models.BooleanField(default=False)
@@ -0,0 +1,115 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from apps.integrations.services.ai_service import AsyncAIService
+from apps.interviews.models import InterviewMessage
+from apps.questions.models import Question
+from .local_scoring import prescore_answer
+from .models import InterviewScore
+
+
+def collect_answer_pairs(interview_id):
+    """
+    Pair each question asked in an interview with the candidate's answer
+    Candidate messages without their own question_id belong to the last
+    question the AI asked; several messages for one question are joined
+
+    Returns:
+        list: (Question, answer text) tuples in the order the questions were asked
+    """
+    messages = InterviewMessage.objects.filter(interview_id=interview_id).values(
+        'sender', 'question_id', 'content'
+    ).order_by('timestamp')
+
+    answers = {}
+    current_question = None
+    for message in messages:
+        question_id = message['question_id']
+        if message['sender'] == 'ai':
+            if question_id:
+                current_question = question_id
+            continue
+
+        question_id = question_id or current_question
+        if question_id:
+            answers.setdefault(question_id, []).append(message['content'])
+
+    questions = Question.objects.in_bulk(list(answers.keys()))
+    return [
+        (questions[question_id], '\n'.join(parts))
+        for question_id, parts in answers.items()
+        if question_id in questions
+    ]
+
+
+def local_evaluation(prescore):
+    """
+    Turn a local pre-score into an evaluation for answers that skip the LLM
+    """
+    return {
+        'score': prescore['score'],
+        'feedback': 'Scored locally from coverage of the expected answer points.',
+        'strengths': [f"Covered: {point}" for point in prescore['covered_points']],
+        'improvements': [f"Did not cover: {point}" for point in prescore['missing_points']],
+        'covered_points': prescore['covered_points']
+    }
+
+
+def save_question_scores(interview_id, pairs, evaluations, prescores):
+    """
+    Write per-question evaluations to the interview's InterviewScore
+    An evaluation of None keeps the provisional (local) result for now
+    """
+    question_scores = []
+    for (question, _), evaluation, prescore in zip(pairs, evaluations, prescores):
+        scored_by = 'local' if evaluation is None else 'llm'
+        evaluation = evaluation or local_evaluation(prescore)
+        question_scores.append({
+            'question_id': str(question._id),
+            'score': evaluation.get('score', 0.0),
+            'provisional_score': prescore['score'],
+            'scored_by': scored_by,
+            'max_score': question.max_score,
+            'feedback': evaluation.get('feedback', ''),
+            'strengths': evaluation.get('strengths', []),
+            'improvements': evaluation.get('improvements', []),
+            'covered_points': evaluation.get('covered_points', []),
+            'reused_evaluation': evaluation.get('reused_evaluation')
+        })
+
+    score, _ = InterviewScore.objects.update_or_create(
+        interview_id=interview_id,
+        defaults={'question_scores': question_scores}
+    )
+    return score
+
+
+async def evaluate_interview(interview_id):
+    """
+    Evaluate every answered question in an interview
+    Each answer is pre-scored locally and the provisional scorecard saved at
+    once; only borderline or long answers then go to the LLM, concurrently.
+    An answer whose LLM evaluation fails keeps its local score
+
+    Args:
+        interview_id: Interview primary key
+
+    Returns:
+        InterviewScore: Score with question_scores filled in, or None if nothing was answered
+    """
+    pairs = await sync_to_async(collect_answer_pairs)(interview_id)
+    if not pairs:
+        return None
+
+    prescores = [prescore_answer(question, answer) for question, answer in pairs]
+    evaluations = [None] * len(pairs)
+    pending = [index for index, prescore in enumerate(prescores) if prescore['needs_llm']]
+    if not settings.LOCAL_SCORING_ENABLED:
+        pending = list(range(len(pairs)))
+
+    if pending:
+        await sync_to_async(save_question_scores)(interview_id, pairs, evaluations, prescores)
+        results = await AsyncAIService().evaluate_answers([pairs[index] for index in pending])
+        for index, evaluation in zip(pending, results):
+            evaluations[index] = evaluation
+
+    return await sync_to_async(save_question_scores)(interview_id, pairs, evaluations, prescores)
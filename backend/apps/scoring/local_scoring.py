@@ -0,0 +1,121 @@
+import re
+import numpy as np
+from django.conf import settings
+
+_WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have how i if in into is it
+its me my of on or our so that the their them then there these they this to was we were what when
+which while who will with would you your about also just really very
+""".split())
+
+# Answers shorter than this many words are scaled down proportionally
+MIN_FULL_CREDIT_WORDS = 40
+
+
+def _stem(word):
+    # Crude suffix stripping: "challenges", "challenged" and "challenge" all become "challeng"
+    for suffix in ('ing', 'ed', 's'):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            word = word[:-len(suffix)]
+            break
+    return word[:-1] if len(word) > 3 and word.endswith('e') else word
+
+
+def tokenize(text):
+    return [_stem(word) for word in _WORD_PATTERN.findall((text or '').lower()) if word not in STOPWORDS]
+
+
+def _tfidf(documents, vocabulary):
+    """
+    L2-normalized TF-IDF matrix (documents x vocabulary) with smoothed IDF
+    """
+    matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(documents):
+        for token in tokens:
+            matrix[row, vocabulary[token]] += 1.0
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1.0
+    matrix *= idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def coverage(points, answer_tokens, sentences):
+    """
+    How well each point is covered by the answer, in [0, 1]
+    Takes the better of the point's best sentence-level cosine similarity and
+    the fraction of the point's terms that appear anywhere in the answer
+    """
+    point_tokens = [tokenize(point) for point in points]
+    if not points or not answer_tokens:
+        return np.zeros(len(points), dtype=np.float32)
+
+    vocabulary = {}
+    for tokens in point_tokens + sentences:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    matrix = _tfidf(point_tokens + sentences, vocabulary)
+    point_vectors = matrix[:len(points)]
+    sentence_vectors = matrix[len(points):]
+    similarity = (point_vectors @ sentence_vectors.T).max(axis=1)
+
+    answer_terms = set(answer_tokens)
+    recall = np.array([
+        len(set(tokens) & answer_terms) / len(set(tokens)) if tokens else 0.0
+        for tokens in point_tokens
+    ], dtype=np.float32)
+
+    return np.maximum(similarity, recall)
+
+
+def prescore_answer(question, answer):
+    """
+    Provisional score for an answer from its coverage of the question's
+    expected_answer_points and skills_tested, with no LLM call
+
+    Args:
+        question: Question object
+        answer: Candidate's answer text
+
+    Returns:
+        dict: {score, covered_points, missing_points, coverage, needs_llm}
+    """
+    threshold = settings.LOCAL_SCORING_COVERAGE_THRESHOLD
+    points = [str(point) for point in question.expected_answer_points or []]
+    skills = [str(skill).replace('_', ' ') for skill in question.skills_tested or []]
+
+    answer_tokens = tokenize(answer)
+    sentences = [tokens for tokens in (tokenize(part) for part in _SENTENCE_PATTERN.split(answer or '')) if tokens]
+
+    point_coverage = coverage(points, answer_tokens, sentences)
+    skill_coverage = coverage(skills, answer_tokens, sentences)
+
+    covered = point_coverage >= threshold
+    points_score = float(covered.mean()) if points else 0.0
+    skills_score = float((skill_coverage >= threshold).mean()) if skills else points_score
+
+    word_count = len((answer or '').split())
+    length_factor = min(1.0, word_count / MIN_FULL_CREDIT_WORDS)
+    score = round(10 * (0.8 * points_score + 0.2 * skills_score) * length_factor, 1)
+
+    # Borderline, long or unscorable answers still get a full LLM evaluation
+    needs_llm = (
+        not points
+        or settings.LOCAL_SCORING_LLM_BAND[0] <= score <= settings.LOCAL_SCORING_LLM_BAND[1]
+        or word_count > settings.LOCAL_SCORING_LONG_ANSWER_WORDS
+    )
+
+    return {
+        'score': score,
+        'covered_points': [point for point, hit in zip(points, covered) if hit],
+        'missing_points': [point for point, hit in zip(points, covered) if not hit],
+        'coverage': {point: round(float(value), 2) for point, value in zip(points, point_coverage)},
+        'needs_llm': needs_llm
+    }
@@ -1,8 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import views
 
 router = DefaultRouter()
 
 urlpatterns = [
+    path('prescore/', views.prescore, name='prescore'),
     path('', include(router.urls)),
 ]
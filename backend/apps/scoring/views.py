@@ -0,0 +1,24 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from apps.questions.models import Question
+from .local_scoring import prescore_answer
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def prescore(request):
+    """
+    Provisional score for an answer from expected-point coverage (no LLM call)
+    POST /api/scoring/prescore/
+    Body: {"question_id": "uuid", "answer": "..."}
+    """
+    question = Question.objects.filter(_id=request.data.get('question_id')).first()
+    if question is None:
+        return Response(
+            {'error': 'Question not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return Response(prescore_answer(question, request.data.get('answer', '')))
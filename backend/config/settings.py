@@ -84,12 +84,32 @@ DATABASES = {
 }
 
 
+REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+
+# Caches: an in-process LRU tier in front of a shared Redis tier
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'local',
+        'OPTIONS': {'MAX_ENTRIES': config('LOCAL_CACHE_MAX_ENTRIES', default=1000, cast=int)},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'interviewer_ai',
+    },
+}
+
 # Channel Layers for WebSocket
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
         'CONFIG': {
-            "hosts": [config('REDIS_URL', default='redis://localhost:6379/0')],
+            "hosts": [REDIS_URL],
         },
     },
 }
@@ -158,17 +178,86 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MAX_UPLOAD_SIZE = config('MAX_UPLOAD_SIZE', default=10485760, cast=int)  # 10MB
 
 # Celery Configuration
-CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# CV parsing runs on its own queue and workers so it cannot starve other tasks
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'apps.candidates.tasks.*': {'queue': 'cv_parsing'},
+}
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # parsing tasks are long; don't hoard them
+
+# Bulk CV ingestion (CV_PARSER_WORKERS 0 = one parser process per CPU core)
+CV_PARSER_WORKERS = config('CV_PARSER_WORKERS', default=0, cast=int)
+CV_BULK_MAX_FILES = config('CV_BULK_MAX_FILES', default=500, cast=int)
+CV_BULK_INSERT_SIZE = config('CV_BULK_INSERT_SIZE', default=100, cast=int)
+DATA_UPLOAD_MAX_NUMBER_FILES = CV_BULK_MAX_FILES
+
+# CV parse results cached by content hash and parser version; repeat uploads link to the existing candidate
+CV_PARSE_CACHE_TIMEOUT = config('CV_PARSE_CACHE_TIMEOUT', default=60 * 60 * 24 * 90, cast=int)  # seconds, shared tier
+CV_PARSE_LOCAL_CACHE_TIMEOUT = config('CV_PARSE_LOCAL_CACHE_TIMEOUT', default=3600, cast=int)  # seconds, in-process tier
+CV_DEDUPLICATE_CANDIDATES = config('CV_DEDUPLICATE_CANDIDATES', default=True, cast=bool)
+
+# Skill taxonomy compiled into the skill matcher (CV parsing, job skill normalization)
+SKILL_TAXONOMY_PATH = config('SKILL_TAXONOMY_PATH', default=str(BASE_DIR / 'apps' / 'integrations' / 'data' / 'skills_taxonomy.json'))
+
 # AI & Integration Settings
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 OPENAI_MODEL = config('OPENAI_MODEL', default='gpt-4-turbo-preview')
 
+# Generated job description cache
+JD_CACHE_TIMEOUT = config('JD_CACHE_TIMEOUT', default=7 * 24 * 3600, cast=int)  # seconds, shared tier
+JD_LOCAL_CACHE_TIMEOUT = config('JD_LOCAL_CACHE_TIMEOUT', default=3600, cast=int)  # seconds, in-process tier
+
+# Question bank: shared questions per (job, difficulty) plus personalized ones per candidate
+QUESTION_BANK_SIZE = config('QUESTION_BANK_SIZE', default=10, cast=int)
+QUESTION_BANK_PERSONALIZED_COUNT = config('QUESTION_BANK_PERSONALIZED_COUNT', default=2, cast=int)
+QUESTION_BANK_LOCK_TIMEOUT = config('QUESTION_BANK_LOCK_TIMEOUT', default=120, cast=int)  # seconds
+
+# Async LLM client (shared per process)
+AI_MAX_CONCURRENT_REQUESTS = config('AI_MAX_CONCURRENT_REQUESTS', default=32, cast=int)  # per event loop
+AI_REQUEST_TIMEOUT = config('AI_REQUEST_TIMEOUT', default=30.0, cast=float)  # seconds
+AI_MAX_RETRIES = config('AI_MAX_RETRIES', default=2, cast=int)
+AI_KEEPALIVE_SECONDS = config('AI_KEEPALIVE_SECONDS', default=60.0, cast=float)
+
+# LLM backend: 'auto' (openai with an API key, stub without), 'openai', 'stub',
+# 'record' (calls the provider and saves responses) or 'replay' (answers from the recordings)
+AI_LLM_BACKEND = config('AI_LLM_BACKEND', default='auto')
+AI_RECORDINGS_PATH = config('AI_RECORDINGS_PATH', default=str(BASE_DIR / 'llm_recordings.jsonl'))
+
+# Stub backend timing and failures, for offline load tests
+AI_STUB_TIME_TO_FIRST_TOKEN = config('AI_STUB_TIME_TO_FIRST_TOKEN', default=0.0, cast=float)  # seconds
+AI_STUB_TOKENS_PER_SECOND = config('AI_STUB_TOKENS_PER_SECOND', default=0.0, cast=float)  # 0 = instant
+AI_STUB_ERROR_RATE = config('AI_STUB_ERROR_RATE', default=0.0, cast=float)
+AI_STUB_JITTER = config('AI_STUB_JITTER', default=0.0, cast=float)  # +/- fraction of each delay
+AI_STUB_SEED = config('AI_STUB_SEED', default=0, cast=int)
+
+# Token budget for earlier transcript turns in follow-up prompts (oldest turns are dropped first)
+AI_TRANSCRIPT_TOKEN_BUDGET = config('AI_TRANSCRIPT_TOKEN_BUDGET', default=1000, cast=int)
+
+# LLM resilience: per-operation deadline (seconds) and the latency percentile after
+# which a duplicate (hedged) request is sent (None = never hedge)
+AI_OPERATION_POLICIES = {
+    'follow_up': (config('AI_FOLLOW_UP_DEADLINE', default=8.0, cast=float), 95),
+    'follow_up_stream': (config('AI_FOLLOW_UP_DEADLINE', default=8.0, cast=float), 95),
+    'evaluation': (config('AI_EVALUATION_DEADLINE', default=45.0, cast=float), None),
+    'batch_evaluation': (config('AI_EVALUATION_DEADLINE', default=45.0, cast=float), None),
+}
+AI_HEDGE_MIN_SAMPLES = config('AI_HEDGE_MIN_SAMPLES', default=20, cast=int)  # latencies seen before hedging starts
+AI_CIRCUIT_FAILURE_THRESHOLD = config('AI_CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)  # consecutive failures
+AI_CIRCUIT_RESET_TIMEOUT = config('AI_CIRCUIT_RESET_TIMEOUT', default=30.0, cast=float)  # seconds before a trial call
+AI_FOLLOW_UP_CACHE_TIMEOUT = config('AI_FOLLOW_UP_CACHE_TIMEOUT', default=3600, cast=int)  # fallback follow-ups
+
+# Batch answer evaluation: pairs are packed into one request up to these limits
+AI_EVALUATION_BATCH_TOKENS = config('AI_EVALUATION_BATCH_TOKENS', default=3000, cast=int)
+AI_EVALUATION_BATCH_MAX_PAIRS = config('AI_EVALUATION_BATCH_MAX_PAIRS', default=4, cast=int)
+
 GOOGLE_CLOUD_CREDENTIALS = config('GOOGLE_CLOUD_CREDENTIALS_PATH', default='')
 AZURE_SPEECH_KEY = config('AZURE_SPEECH_KEY', default='')
 AZURE_SPEECH_REGION = config('AZURE_SPEECH_REGION', default='')
@@ -177,3 +266,63 @@ AZURE_SPEECH_REGION = config('AZURE_SPEECH_REGION', default='')
 DEFAULT_INTERVIEW_DURATION = config('DEFAULT_INTERVIEW_DURATION', default=3600, cast=int)
 VIDEO_RECORDING_ENABLED = config('VIDEO_RECORDING_ENABLED', default=True, cast=bool)
 BODY_LANGUAGE_ANALYSIS_ENABLED = config('BODY_LANGUAGE_ANALYSIS_ENABLED', default=True, cast=bool)
+
+# Interview message write-behind buffering
+INTERVIEW_MESSAGE_FLUSH_SIZE = config('INTERVIEW_MESSAGE_FLUSH_SIZE', default=20, cast=int)
+INTERVIEW_MESSAGE_FLUSH_INTERVAL = config('INTERVIEW_MESSAGE_FLUSH_INTERVAL', default=2.0, cast=float)  # seconds
+
+# Connection quality pings are aggregated per connection and written every interval
+CONNECTION_LOG_FLUSH_INTERVAL = config('CONNECTION_LOG_FLUSH_INTERVAL', default=60.0, cast=float)  # seconds
+
+# Websocket JSON codec: 'auto' (orjson when installed), 'orjson' or 'json'
+WEBSOCKET_JSON_CODEC = config('WEBSOCKET_JSON_CODEC', default='auto')
+
+# Per-interview replay log for reconnecting clients: 'redis' (Streams) or 'memory'
+INTERVIEW_REPLAY_BACKEND = config('INTERVIEW_REPLAY_BACKEND', default='redis')
+INTERVIEW_REPLAY_MAXLEN = config('INTERVIEW_REPLAY_MAXLEN', default=500, cast=int)  # frames kept per interview
+INTERVIEW_REPLAY_TTL = config('INTERVIEW_REPLAY_TTL', default=86400, cast=int)  # seconds
+
+# Earlier turns kept in memory per connection for follow-up context
+INTERVIEW_TRANSCRIPT_TURNS = config('INTERVIEW_TRANSCRIPT_TURNS', default=40, cast=int)
+
+# Near-duplicate answer cache: evaluations are reused for answers to the same question whose
+# MinHash-estimated similarity is at least the threshold (ANSWER_CACHE_NUM_PERM / ANSWER_CACHE_BANDS rows per band)
+ANSWER_CACHE_ENABLED = config('ANSWER_CACHE_ENABLED', default=True, cast=bool)
+ANSWER_CACHE_ALIAS = config('ANSWER_CACHE_ALIAS', default='shared')
+ANSWER_CACHE_THRESHOLD = config('ANSWER_CACHE_THRESHOLD', default=0.9, cast=float)
+ANSWER_CACHE_NUM_PERM = config('ANSWER_CACHE_NUM_PERM', default=64, cast=int)
+ANSWER_CACHE_BANDS = config('ANSWER_CACHE_BANDS', default=16, cast=int)
+ANSWER_CACHE_TIMEOUT = config('ANSWER_CACHE_TIMEOUT', default=60 * 60 * 24 * 30, cast=int)  # seconds
+ANSWER_CACHE_BUCKET_SIZE = config('ANSWER_CACHE_BUCKET_SIZE', default=50, cast=int)  # entries kept per LSH bucket
+
+# Local answer pre-scoring: answers scoring inside the band (or longer than the word limit)
+# still get a full LLM evaluation; the rest keep their local score
+LOCAL_SCORING_ENABLED = config('LOCAL_SCORING_ENABLED', default=True, cast=bool)
+LOCAL_SCORING_COVERAGE_THRESHOLD = config('LOCAL_SCORING_COVERAGE_THRESHOLD', default=0.35, cast=float)
+LOCAL_SCORING_LLM_BAND = (
+    config('LOCAL_SCORING_LLM_BAND_LOW', default=3.5, cast=float),
+    config('LOCAL_SCORING_LLM_BAND_HIGH', default=7.5, cast=float),
+)
+LOCAL_SCORING_LONG_ANSWER_WORDS = config('LOCAL_SCORING_LONG_ANSWER_WORDS', default=250, cast=int)
+
+# Speculative follow-ups: drafted after the candidate pauses for INTERVIEW_SPECULATION_PAUSE
+# seconds and reused if the final answer overlaps the draft enough
+INTERVIEW_SPECULATIVE_FOLLOW_UPS = config('INTERVIEW_SPECULATIVE_FOLLOW_UPS', default=True, cast=bool)
+INTERVIEW_SPECULATION_PAUSE = config('INTERVIEW_SPECULATION_PAUSE', default=0.8, cast=float)  # seconds
+INTERVIEW_SPECULATION_MIN_OVERLAP = config('INTERVIEW_SPECULATION_MIN_OVERLAP', default=0.85, cast=float)
+INTERVIEW_SPECULATION_MAX_NEW_WORDS = config('INTERVIEW_SPECULATION_MAX_NEW_WORDS', default=8, cast=int)
+
+# Batch-evaluate all answers into the interview's score as soon as it ends
+INTERVIEW_SCORE_ON_END = config('INTERVIEW_SCORE_ON_END', default=True, cast=bool)
+
+# Stream AI replies as delta frames (clients may override per message with "stream")
+INTERVIEW_STREAM_AI_REPLIES = config('INTERVIEW_STREAM_AI_REPLIES', default=True, cast=bool)
+
+# Video frame queueing (frames beyond the queue size replace older unprocessed ones)
+VIDEO_FRAME_QUEUE_SIZE = config('VIDEO_FRAME_QUEUE_SIZE', default=1, cast=int)
+VIDEO_BACKPRESSURE_INTERVAL = config('VIDEO_BACKPRESSURE_INTERVAL', default=2.0, cast=float)  # seconds
+VIDEO_ANALYSIS_HISTORY = config('VIDEO_ANALYSIS_HISTORY', default=600, cast=int)  # frame results kept per connection, summarized into the interview on disconnect
+
+# Video analysis process pool (0 = one worker per CPU core)
+VIDEO_ANALYSIS_WORKERS = config('VIDEO_ANALYSIS_WORKERS', default=0, cast=int)
+VIDEO_ANALYSIS_SESSIONS_PER_WORKER = config('VIDEO_ANALYSIS_SESSIONS_PER_WORKER', default=8, cast=int)
@@ -18,7 +18,18 @@ module.exports = {
       name: 'interviewer-ai-celery',
       cwd: './backend',
       script: 'celery',
-      args: '-A config worker -l info',
+      args: '-A config worker -l info -Q default',
+      interpreter: './venv/bin/python',
+      instances: 1,
+      autorestart: true,
+      watch: false,
+      max_memory_restart: '1G',
+    },
+    {
+      name: 'interviewer-ai-celery-cv',
+      cwd: './backend',
+      script: 'celery',
+      args: '-A config worker -l info -Q cv_parsing -P threads -c 4 -n cv@%h',
       interpreter: './venv/bin/python',
       instances: 1,
       autorestart: true,
@@ -77,6 +77,22 @@ export const candidatesAPI = {
       headers: { 'Content-Type': 'multipart/form-data' },
     })
   },
+  parsingStatus: (id: string) => api.get(`/candidates/${id}/parsing_status/`),
+  bulkUploadCVs: (files: File[]) => {
+    const formData = new FormData()
+    files.forEach((file) => formData.append('cv_files', file))
+    return api.post('/candidates/bulk_upload_cv/', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    })
+  },
+  bulkUploadArchive: (archive: File) => {
+    const formData = new FormData()
+    formData.append('archive', archive)
+    return api.post('/candidates/bulk_upload_cv/', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    })
+  },
+  batchStatus: (batchId: string) => api.get(`/candidates/batches/${batchId}/`),
   addNote: (id: string, content: string) =>
     api.post(`/candidates/${id}/add_note/`, { content }),
 }
@@ -15,40 +15,85 @@ export default function InterviewRoom({}: InterviewRoomProps) {
   const [showCaptions, setShowCaptions] = useState(true)
   const [audioEnabled, setAudioEnabled] = useState(true)
   const [videoEnabled, setVideoEnabled] = useState(true)
-  const [messages, setMessages] = useState<Array<{ sender: string; text: string; timestamp: Date }>>([])
+  const [messages, setMessages] = useState<Array<{ sender: string; text: string; timestamp: Date; streamId?: string }>>([])
   const [inputMessage, setInputMessage] = useState('')
   
   const webcamRef = useRef<Webcam>(null)
   const wsRef = useRef<WebSocket | null>(null)
   
+  // Every sequence number up to lastSeq has been seen, so it is where a
+  // dropped connection resumes; seqs seen beyond it (live frames that arrive
+  // ahead of the replay) are kept in seenSeqs until the gap fills in
+  const lastSeqRef = useRef(0)
+  const seenSeqsRef = useRef(new Set<number>())
+  
+  const setLastSeq = (seq: number) => {
+    const seen = seenSeqsRef.current
+    lastSeqRef.current = seq
+    seen.forEach(other => {
+      if (other <= lastSeqRef.current) seen.delete(other)
+    })
+    while (seen.has(lastSeqRef.current + 1)) {
+      lastSeqRef.current += 1
+      seen.delete(lastSeqRef.current)
+    }
+  }
+  
   useEffect(() => {
     if (!interviewId) return
     
-    // Initialize WebSocket connection
-    const ws = new WebSocket(`${process.env.NEXT_PUBLIC_WS_URL}/interview/${interviewId}/`)
-    wsRef.current = ws
-    
-    ws.onopen = () => {
-      console.log('WebSocket connected')
-      setIsConnected(true)
-    }
-    
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data)
-      handleWebSocketMessage(data)
-    }
+    let closedByUs = false
+    let retryDelay = 1000
+    let retryTimer: ReturnType<typeof setTimeout> | null = null
     
-    ws.onerror = (error) => {
-      console.error('WebSocket error:', error)
+    const connect = () => {
+      // Initialize WebSocket connection
+      const ws = new WebSocket(`${process.env.NEXT_PUBLIC_WS_URL}/interview/${interviewId}/`)
+      wsRef.current = ws
+      
+      ws.onopen = () => {
+        console.log('WebSocket connected')
+        setIsConnected(true)
+        retryDelay = 1000
+        
+        // Ask only for the frames missed while disconnected
+        if (lastSeqRef.current > 0) {
+          ws.send(JSON.stringify({ type: 'resume', last_seq: lastSeqRef.current }))
+        }
+      }
+      
+      ws.onmessage = (event) => {
+        const data = JSON.parse(event.data)
+        if (typeof data.seq === 'number') {
+          // Drop frames already seen (replay can overlap with live frames)
+          if (data.seq <= lastSeqRef.current || seenSeqsRef.current.has(data.seq)) return
+          seenSeqsRef.current.add(data.seq)
+          setLastSeq(lastSeqRef.current)
+        }
+        handleWebSocketMessage(data)
+      }
+      
+      ws.onerror = (error) => {
+        console.error('WebSocket error:', error)
+      }
+      
+      ws.onclose = () => {
+        console.log('WebSocket disconnected')
+        setIsConnected(false)
+        
+        if (!closedByUs) {
+          retryTimer = setTimeout(connect, retryDelay)
+          retryDelay = Math.min(retryDelay * 2, 30000)
+        }
+      }
     }
     
-    ws.onclose = () => {
-      console.log('WebSocket disconnected')
-      setIsConnected(false)
-    }
+    connect()
     
     return () => {
-      ws.close()
+      closedByUs = true
+      if (retryTimer) clearTimeout(retryTimer)
+      wsRef.current?.close()
     }
   }, [interviewId])
   
@@ -56,6 +101,21 @@ export default function InterviewRoom({}: InterviewRoomProps) {
     switch (data.type) {
       case 'connection_established':
         console.log('Connection confirmed:', data.message)
+        if (lastSeqRef.current === 0 && seenSeqsRef.current.size === 0) {
+          setLastSeq(data.last_seq || 0)
+        }
+        break
+      
+      case 'replay_gap':
+        // Too much was missed to replay; history must be refetched over REST
+        console.warn('Missed messages could not be replayed:', data)
+        // The server's numbering may have restarted below ours, so seqs seen
+        // before now mean nothing; start over from its current seq
+        seenSeqsRef.current.clear()
+        setLastSeq(data.current_seq)
+        break
+      
+      case 'replay_complete':
         break
       
       case 'interview_started':
@@ -71,6 +131,17 @@ export default function InterviewRoom({}: InterviewRoomProps) {
         }
         break
       
+      case 'message_delta':
+        appendDelta(data.stream_id, data.sender, data.delta)
+        break
+      
+      case 'message_commit':
+        commitStream(data.stream_id, data.sender, data.content)
+        if (data.sender === 'ai') {
+          setCurrentQuestion(data.content)
+        }
+        break
+      
       case 'interview_ended':
         setInterviewStarted(false)
         addMessage('System', 'Interview has ended. Thank you!')
@@ -85,6 +156,30 @@ export default function InterviewRoom({}: InterviewRoomProps) {
     setMessages(prev => [...prev, { sender, text, timestamp: new Date() }])
   }
   
+  const appendDelta = (streamId: string, sender: string, delta: string) => {
+    setMessages(prev => {
+      const index = prev.findIndex(m => m.streamId === streamId)
+      if (index === -1) {
+        return [...prev, { sender, text: delta, timestamp: new Date(), streamId }]
+      }
+      const next = [...prev]
+      next[index] = { ...next[index], text: next[index].text + delta }
+      return next
+    })
+  }
+  
+  const commitStream = (streamId: string, sender: string, content: string) => {
+    setMessages(prev => {
+      const index = prev.findIndex(m => m.streamId === streamId)
+      if (index === -1) {
+        return [...prev, { sender, text: content, timestamp: new Date(), streamId }]
+      }
+      const next = [...prev]
+      next[index] = { ...next[index], text: content }
+      return next
+    })
+  }
+  
   const startInterview = () => {
     if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
       wsRef.current.send(JSON.stringify({
@@ -105,6 +200,17 @@ export default function InterviewRoom({}: InterviewRoomProps) {
     setInputMessage('')
   }
   
+  // Interim answer text lets the server start drafting the follow-up early
+  const updateAnswer = (text: string) => {
+    setInputMessage(text)
+    if (text.trim() && wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+      wsRef.current.send(JSON.stringify({
+        type: 'interim_transcript',
+        content: text
+      }))
+    }
+  }
+  
   const endInterview = () => {
     if (wsRef.current) {
       wsRef.current.send(JSON.stringify({
@@ -256,7 +362,7 @@ export default function InterviewRoom({}: InterviewRoomProps) {
               <input
                 type="text"
                 value={inputMessage}
-                onChange={(e) => setInputMessage(e.target.value)}
+                onChange={(e) => updateAnswer(e.target.value)}
                 onKeyPress={(e) => e.key === 'Enter' && sendMessage()}
                 placeholder="Type your answer..."
                 className="flex-1 px-4 py-2 bg-gray-700 text-white rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500"